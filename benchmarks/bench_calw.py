@@ -0,0 +1,82 @@
+"""Benchmark drawing calw grids with many events and CJK titles.
+
+Run from the repository root:
+
+    python benchmarks/bench_calw.py [weeks] [events_per_day]
+"""
+
+import os
+import random
+import sys
+import timeit
+from datetime import timedelta
+
+from gcalcli.argparsers import (get_cal_query_parser, get_color_parser,
+                                get_output_parser)
+from gcalcli.gcal import GoogleCalendarInterface
+from gcalcli.printer import Printer
+
+CAL = {'id': 'cal1', 'summary': 'Calendar', 'accessRole': 'owner'}
+WORDS = ['Standup', 'Review', '会議', 'プロジェクト', '打ち合わせ', 'Lunch',
+         'Planning', '週次', 'レビュー', 'with', 'team', '東京オフィス']
+
+
+def synthetic_events(start, weeks, per_day, seed=0):
+    rng = random.Random(seed)
+    events = []
+    for day in range(weeks * 7):
+        for _ in range(per_day):
+            s = start + timedelta(days=day, minutes=rng.randrange(24 * 60))
+            if rng.random() < 0.05:
+                # all-day events, some spanning several days
+                s = s.replace(hour=0, minute=0)
+                e = s + timedelta(days=rng.randint(1, 4))
+            else:
+                e = s + timedelta(minutes=rng.choice((30, 60, 90)))
+            title = ' '.join(rng.choice(WORDS)
+                             for _ in range(rng.randint(1, 6)))
+            events.append({'s': s, 'e': e, 'summary': title,
+                           'gcalcli_cal': CAL})
+    events.sort(key=lambda event: event['s'])
+    return events
+
+
+def make_interface():
+    options = vars(get_color_parser().parse_args([]))
+    options.update(vars(get_cal_query_parser().parse_args([])))
+    options.update(vars(get_output_parser().parse_args([])))
+    options.update(width=120, ignore_calendars=[])
+    gcal = GoogleCalendarInterface(
+        printer=Printer(art_style='unicode'), do_eager_init=False, **options)
+    gcal.cals = [CAL]
+    return gcal
+
+
+def main():
+    weeks = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    per_day = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    gcal = make_interface()
+    start = gcal.now.replace(hour=0, minute=0, second=0, microsecond=0)
+    start -= timedelta(days=gcal._cal_weekday_num(start))
+    events = synthetic_events(start - timedelta(days=7), weeks + 1, per_day)
+    gcal._search_for_events = lambda *args, **kwargs: events
+
+    def draw():
+        # Printer writes to the real stdout, so silence it at the fd level.
+        sys.stdout.flush()
+        saved = os.dup(1)
+        with open(os.devnull, 'w') as devnull:
+            os.dup2(devnull.fileno(), 1)
+            try:
+                gcal.CalQuery('calw', count=weeks)
+                sys.stdout.flush()
+            finally:
+                os.dup2(saved, 1)
+                os.close(saved)
+
+    best = min(timeit.repeat(draw, number=1, repeat=5))
+    print(f'calw, {weeks} weeks, {len(events)} events: {best * 1000:.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""Benchmark conflict detection on synthetic calendars.
+
+Compares the sweep line in gcalcli.conflicts with the previous approach of
+re-filtering the list of active events for every event.
+
+Run from the repository root:
+
+    python benchmarks/bench_conflicts.py [number_of_events]
+"""
+
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from gcalcli.conflicts import find_conflicts, ShowConflicts
+
+
+def synthetic_events(count, seed=0):
+    """Mostly short meetings, with some all-day and multi-day events."""
+    rng = random.Random(seed)
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    span = timedelta(days=365)
+    events = []
+    for i in range(count):
+        start = base + rng.random() * span
+        kind = rng.random()
+        if kind < 0.90:
+            length = timedelta(minutes=rng.choice((15, 30, 45, 60, 90)))
+        elif kind < 0.99:
+            length = timedelta(days=1)
+        else:
+            length = timedelta(days=rng.randint(2, 14))
+        events.append({'id': str(i), 's': start, 'e': start + length})
+    events.sort(key=lambda e: e['s'])
+    return events
+
+
+def filter_per_event(events):
+    """The old algorithm: rebuild the active list for every event."""
+    pairs = 0
+    active = []
+    for latest in events:
+        start = latest['s']
+        for event in active:
+            if event['e'] > start:
+                pairs += 1
+        active = list(filter(lambda e: e['e'] > start, active))
+        active.append(latest)
+    return pairs
+
+
+def show_conflicts(events):
+    pairs = 0
+
+    def count(event):
+        nonlocal pairs
+        pairs += 1
+
+    shower = ShowConflicts(count)
+    for event in events:
+        shower.show_conflicts(event)
+    return pairs
+
+
+def clusters(events):
+    return sum(len(c.pairs) for c in find_conflicts(events))
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    events = synthetic_events(count)
+    print(f'{count} events')
+
+    results = set()
+    for name, func in (('filter per event', filter_per_event),
+                       ('ShowConflicts', show_conflicts),
+                       ('find_conflicts', clusters)):
+        t0 = time.perf_counter()
+        pairs = func(events)
+        elapsed = time.perf_counter() - t0
+        results.add(pairs)
+        print(f'{name:>17}: {elapsed:7.2f} s, {pairs} overlapping pairs')
+    assert len(results) == 1
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""Compare decoding API event times with dateutil vs utils.parse_api_time.
+
+Run from the repository root:
+
+    python benchmarks/bench_decode.py [number_of_events]
+"""
+
+import sys
+import timeit
+from datetime import datetime, timedelta, timezone
+
+from dateutil.parser import parse
+
+from gcalcli import utils
+
+
+def api_times(count):
+    start = datetime(2024, 1, 1, 9, tzinfo=timezone(timedelta(hours=-5)))
+    times = []
+    for i in range(count):
+        dt = start + timedelta(minutes=37 * i)
+        if i % 10 == 0:
+            times.append(dt.date().isoformat())
+        elif i % 10 == 1:
+            times.append(
+                dt.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'))
+        else:
+            times.append(dt.isoformat())
+    return times
+
+
+def decode_dateutil(times):
+    return [utils.localize_datetime(parse(t)) for t in times]
+
+
+def decode_fast(times):
+    return [utils.parse_api_time(t) for t in times]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    times = api_times(count)
+    assert decode_dateutil(times) == decode_fast(times)
+
+    for name, func in (('dateutil', decode_dateutil),
+                       ('parse_api_time', decode_fast)):
+        best = min(timeit.repeat(lambda: func(times), number=1, repeat=5))
+        print(f'{name:>15}: {best * 1000:8.1f} ms for {count} times '
+              f'({best / count * 1e6:.2f} us each)')
+
+
+if __name__ == '__main__':
+    main()
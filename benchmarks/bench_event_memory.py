@@ -0,0 +1,83 @@
+"""Compare memory held by raw API event dicts vs Event records.
+
+Run from the repository root:
+
+    python benchmarks/bench_event_memory.py [number_of_events]
+"""
+
+import copy
+import sys
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+from gcalcli._types import Event
+
+CAL = {'id': 'cal@example.com', 'summary': 'Calendar',
+       'accessRole': 'owner'}
+
+
+def api_event(i):
+    start = datetime(2024, 1, 1, 9, tzinfo=timezone.utc) + timedelta(hours=i)
+    return {
+        'kind': 'calendar#event',
+        'etag': f'"{3400000000000000 + i}"',
+        'id': f'event{i:08d}',
+        'status': 'confirmed',
+        'htmlLink': f'https://www.google.com/calendar/event?eid=event{i}',
+        'created': '2023-12-01T10:00:00.000Z',
+        'updated': '2023-12-02T10:00:00.000Z',
+        'summary': f'Meeting number {i}',
+        'description': 'Agenda:\n' + '\n'.join(
+            f'{n}. Discuss item {n} in some detail' for n in range(8)),
+        'location': 'Conference room 4B, Main building',
+        'creator': {'email': 'organizer@example.com'},
+        'organizer': {'email': 'organizer@example.com', 'self': True},
+        'start': {'dateTime': start.isoformat(), 'timeZone': 'UTC'},
+        'end': {'dateTime': (start + timedelta(hours=1)).isoformat(),
+                'timeZone': 'UTC'},
+        'iCalUID': f'event{i:08d}@google.com',
+        'sequence': 0,
+        'attendees': [
+            {'email': f'person{n}@example.com', 'responseStatus': 'accepted'}
+            for n in range(6)],
+        'reminders': {'useDefault': True},
+        'eventType': 'default',
+    }
+
+
+def measure(build, count):
+    items = [api_event(i) for i in range(count)]
+    tracemalloc.start()
+    events = [build(item) for item in items]
+    del items
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del events
+    return current
+
+
+def as_dict(item):
+    event = copy.deepcopy(item)
+    event['gcalcli_cal'] = CAL
+    event['s'] = datetime.fromisoformat(item['start']['dateTime'])
+    event['e'] = datetime.fromisoformat(item['end']['dateTime'])
+    return event
+
+
+def as_record(item):
+    item = copy.deepcopy(item)
+    return Event(item, gcalcli_cal=CAL,
+                 s=datetime.fromisoformat(item['start']['dateTime']),
+                 e=datetime.fromisoformat(item['end']['dateTime']))
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    for name, build in (('dict', as_dict), ('Event', as_record)):
+        size = measure(build, count)
+        print(f'{name:>6}: {size / 1024:9.1f} KiB for {count} events '
+              f'({size / count:.0f} bytes each)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""Time searches of the local event store with many events.
+
+Run from the repository root:
+
+    python benchmarks/bench_search.py [number_of_events]
+"""
+
+import random
+import sys
+import tempfile
+import timeit
+from datetime import datetime, timedelta, timezone
+import pathlib
+
+from gcalcli.eventstore import EventStore
+
+WORDS = ['standup', 'review', 'planning', 'lunch', 'retro', 'design', 'sync',
+         'interview', 'demo', 'budget', 'hiring', 'roadmap', 'offsite']
+PEOPLE = ['alice', 'bob', 'carol', 'dave', 'erin', 'frank']
+
+
+def synthetic_items(count, seed=0):
+    rng = random.Random(seed)
+    start = datetime(2020, 1, 1, 9, tzinfo=timezone.utc)
+    for i in range(count):
+        s = start + timedelta(minutes=47 * i)
+        yield {
+            'id': f'event{i}',
+            'summary': ' '.join(rng.choices(WORDS, k=rng.randint(1, 3))),
+            'description': ' '.join(f'word{rng.randrange(5000)}'
+                                    for _ in range(rng.randint(0, 20))),
+            'location': f'Room {rng.randint(1, 50)}',
+            'attendees': [{'email': f'{p}@example.com'}
+                          for p in rng.sample(PEOPLE, rng.randint(0, 4))],
+            'start': {'dateTime': s.isoformat()},
+            'end': {'dateTime': (s + timedelta(minutes=30)).isoformat()},
+        }
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    with tempfile.TemporaryDirectory() as tmp:
+        store = EventStore(pathlib.Path(tmp, 'events'))
+        store.apply('cal', synthetic_items(count), 'token')
+
+        for text, regex in (('word42', False),
+                            ('title:offsite attendee:alice', False),
+                            ('word123*', False),
+                            ('title:^offsite room\\s4\\d$', True)):
+            found = sum(1 for _ in store.events('cal', text=text, regex=regex))
+            best = min(timeit.repeat(
+                lambda: list(store.events('cal', text=text, regex=regex)),
+                number=1, repeat=5))
+            kind = 'regex' if regex else 'fts'
+            print(f'{kind:>5} {text!r:>36}: {best * 1000:7.1f} ms '
+                  f'({found} of {count} events)')
+        store.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""Compare TSV export via handler.get() per row with the compiled formatter.
+
+Run from the repository root:
+
+    python benchmarks/bench_tsv.py [number_of_events]
+"""
+
+import contextlib
+import io
+import random
+import sys
+import timeit
+from datetime import timedelta
+from itertools import chain
+
+from gcalcli.argparsers import get_color_parser, get_output_parser
+from gcalcli.details import DETAILS_DEFAULT, FMT_DATE, FMT_TIME, HANDLERS, Time
+from gcalcli.gcal import GoogleCalendarInterface
+from gcalcli.printer import Printer
+from gcalcli.utils import is_all_day
+
+CAL = {'id': 'cal1', 'summary': 'Calendar', 'accessRole': 'owner'}
+DETAILS = {'id': True, 'length': True, 'location': True, 'calendar': True,
+           'email': True}
+
+
+def synthetic_events(start, count, seed=0):
+    rng = random.Random(seed)
+    events = []
+    for i in range(count):
+        s = start + timedelta(minutes=17 * i)
+        if rng.random() < 0.05:
+            s = s.replace(hour=0, minute=0)
+            e = s + timedelta(days=1)
+        else:
+            e = s + timedelta(minutes=rng.choice((30, 60, 90)))
+        events.append({
+            'id': f'event{i}',
+            's': s,
+            'e': e,
+            'summary': f'Event {i}',
+            'location': 'Room 1\nBuilding 2' if i % 3 == 0 else '',
+            'organizer': {'email': 'someone@example.com'},
+            'gcalcli_cal': CAL,
+        })
+    return events
+
+
+def time_get_strftime(event):
+    """Time.get() as it was, with four strftime calls per event."""
+    all_day = is_all_day(event)
+    fields = []
+    for instant in (event['s'], event['e']):
+        fields.append(instant.strftime(FMT_DATE))
+        fields.append('' if all_day else instant.strftime(FMT_TIME))
+    return fields
+
+
+def tsv_handler_get(events):
+    """The previous _tsv loop."""
+    keys = set(DETAILS)
+    keys.update(DETAILS_DEFAULT)
+    handlers = [handler for key, handler in HANDLERS.items() if key in keys]
+    print(*chain.from_iterable(handler.fieldnames for handler in handlers),
+          sep='\t')
+    for event in events:
+        row = []
+        for handler in handlers:
+            if handler is Time:
+                row.extend(time_get_strftime(event))
+            else:
+                row.extend(handler.get(event))
+        print(('\t'.join(row)).replace('\n', r'\n'))
+
+
+def make_interface():
+    options = vars(get_color_parser().parse_args([]))
+    options.update(vars(get_output_parser().parse_args([])))
+    options.update(ignore_calendars=[], details=DETAILS)
+    gcal = GoogleCalendarInterface(
+        printer=Printer(), do_eager_init=False, **options)
+    gcal.cals = [CAL]
+    return gcal
+
+
+def capture(func, *args):
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        func(*args)
+    return out.getvalue()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    gcal = make_interface()
+    events = synthetic_events(gcal.now, count)
+    assert (capture(tsv_handler_get, events)
+            == capture(gcal._tsv, None, events))
+
+    for name, func, args in (('handler.get', tsv_handler_get, (events,)),
+                             ('tsv_formatter', gcal._tsv, (None, events))):
+        best = min(timeit.repeat(lambda: capture(func, *args),
+                                 number=1, repeat=5))
+        print(f'{name:>15}: {best * 1000:8.1f} ms for {count} rows '
+              f'({best / count * 1e6:.2f} us each)')
+
+
+if __name__ == '__main__':
+    main()
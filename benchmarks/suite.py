@@ -0,0 +1,308 @@
+"""Time gcalcli's hot paths on synthetic calendars and record the results.
+
+Events are fetched through a stand-in transport replaying canned API pages
+(see synthetic.py), so everything from building requests to decoding events
+runs as it does against Google Calendar, just without the network.
+
+Run from the repository root:
+
+    python benchmarks/suite.py --json results.json
+    python benchmarks/suite.py --compare results.json
+
+--json writes the timings, along with the versions and sizes used, to a
+file, which can be kept e.g. per release. --compare reports benchmarks that
+got slower than in such a file by more than --threshold, and exits with
+status 1 if there are any. Compare runs of the same sizes on the same
+machine, since absolute timings vary a lot between machines.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import pathlib
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import timeit
+from datetime import timedelta
+from typing import Callable
+
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+
+import gcalcli
+from gcalcli import cli, ics
+from gcalcli.argparsers import (get_cal_query_parser, get_color_parser,
+                                get_output_parser)
+from gcalcli.conflicts import ShowConflicts
+from gcalcli.gcal import GoogleCalendarInterface
+from gcalcli.printer import Printer
+
+from synthetic import (PAGE_SIZE, ReplayHttp, synthetic_calendars,
+                       synthetic_ics, synthetic_items)
+
+DETAILS = {'id': True, 'length': True, 'location': True, 'description': True,
+           'calendar': True, 'email': True, 'attendees': True}
+RESULTS_VERSION = 1
+
+# Benchmark name -> setup function, taking the sizes to use and returning
+# the function to time.
+BENCHMARKS: dict[str, Callable[[argparse.Namespace], Callable]] = {}
+
+
+def benchmark(setup):
+    BENCHMARKS[setup.__name__] = setup
+    return setup
+
+
+class Fixture:
+    """Synthetic calendars and events for one set of sizes."""
+
+    def __init__(self, sizes: argparse.Namespace):
+        self.sizes = sizes
+        self.calendars = synthetic_calendars(sizes.calendars)
+        now = GoogleCalendarInterface.now
+        # Start on a Monday, so calw weeks line up with the events.
+        self.start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        self.start -= timedelta(days=self.start.weekday())
+        self.end = self.start + timedelta(weeks=sizes.weeks)
+        self.items = {
+            cal['id']: synthetic_items(cal['id'], self.start,
+                                       sizes.weeks * 7, sizes.events)
+            for cal in self.calendars}
+
+    def transport(self) -> ReplayHttp:
+        return ReplayHttp(self.calendars, self.items, self.sizes.page_size)
+
+    def interface(self, **options) -> GoogleCalendarInterface:
+        """Return an interface fetching through the stand-in transport."""
+        all_options = vars(get_color_parser().parse_args([]))
+        all_options.update(vars(get_cal_query_parser().parse_args([])))
+        all_options.update(vars(get_output_parser().parse_args([])))
+        all_options.update(width=120, ignore_calendars=[], details=DETAILS,
+                           use_cache=False, max_concurrency=1)
+        all_options.update(options)
+        gcal = GoogleCalendarInterface(
+            printer=Printer(art_style='unicode'), do_eager_init=False,
+            **all_options)
+        gcal.http = self.transport()
+        gcal.cal_service = build_from_document(
+            json.loads(get_static_doc('calendar', 'v3')), http=gcal.http)
+        gcal.all_cals = gcal.cals = list(self.calendars)
+        return gcal
+
+    def events(self, gcal: GoogleCalendarInterface) -> list:
+        return gcal._search_for_events(self.start, self.end, None)
+
+
+_fixtures: dict[tuple, Fixture] = {}
+
+
+def fixture(sizes: argparse.Namespace) -> Fixture:
+    key = tuple(sorted(vars(sizes).items()))
+    if key not in _fixtures:
+        _fixtures[key] = Fixture(sizes)
+    return _fixtures[key]
+
+
+def silenced(func, *args):
+    """Return a function calling func with stdout discarded."""
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            func(*args)
+    return run
+
+
+@benchmark
+def get_all_events(sizes):
+    f = fixture(sizes)
+    gcal = f.interface()
+    cal = gcal.cals[0]
+    return lambda: list(gcal._GetAllEvents(cal, f.start, f.end, None))
+
+
+@benchmark
+def search_for_events(sizes):
+    f = fixture(sizes)
+    gcal = f.interface(max_concurrency=4)
+    return lambda: f.events(gcal)
+
+
+@benchmark
+def graph_events(sizes):
+    f = fixture(sizes)
+    gcal = f.interface()
+    events = f.events(gcal)
+    return silenced(gcal._GraphEvents, 'calw', f.start, sizes.weeks, events)
+
+
+@benchmark
+def tsv(sizes):
+    f = fixture(sizes)
+    gcal = f.interface()
+    return silenced(gcal._tsv, f.start, f.events(gcal))
+
+
+@benchmark
+def json_output(sizes):
+    f = fixture(sizes)
+    gcal = f.interface()
+    return silenced(gcal._json, f.start, f.events(gcal))
+
+
+@benchmark
+def show_conflicts(sizes):
+    f = fixture(sizes)
+    events = f.events(f.interface())
+
+    def run():
+        conflicts = []
+        show = ShowConflicts(conflicts.append)
+        for event in events:
+            show.show_conflicts(event)
+        return conflicts
+    return run
+
+
+@benchmark
+def get_ics_data(sizes):
+    f = fixture(sizes)
+    text = synthetic_ics(f.start, sizes.ics_events)
+    printer = Printer()
+
+    def run():
+        data = ics.get_ics_data(io.StringIO(text), verbose=False,
+                                default_tz='UTC', printer=printer)
+        return list(data.events)
+    return run
+
+
+@benchmark
+def cli_agenda(sizes):
+    """A whole `gcalcli agenda --tsv` run, minus interpreter startup."""
+    f = fixture(sizes)
+    data_dir = tempfile.mkdtemp(prefix='gcalcli-bench-')
+    # Keep any real config and data files out of it.
+    os.environ['GCALCLI_CONFIG'] = data_dir
+
+    class ReplayInterface(GoogleCalendarInterface):
+        def data_file_path(self, name):
+            return pathlib.Path(data_dir, name)
+
+        def _get_http(self):
+            if self.http is None:
+                self.http = f.transport()
+            return self.http
+
+    argv = ['--noincluderc', '--nocache', 'agenda', '--tsv',
+            f.start.isoformat(), f.end.isoformat()]
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            cli.main(argv, calendar_interface=ReplayInterface)
+    return run
+
+
+@benchmark
+def cli_startup(sizes):
+    """Starting a new process and parsing arguments, for `--version`."""
+    env = dict(os.environ, HOME=tempfile.mkdtemp(prefix='gcalcli-bench-'))
+    command = [sys.executable, '-c', 'from gcalcli.cli import main; main()',
+               '--noincluderc', '--version']
+    return lambda: subprocess.run(command, env=env, check=True,
+                                  stdout=subprocess.DEVNULL)
+
+
+def run_benchmarks(names, sizes, repeat):
+    results = {}
+    for name in names:
+        func = BENCHMARKS[name](sizes)
+        func()  # warm up caches and lazy imports
+        times = timeit.repeat(func, number=1, repeat=repeat)
+        results[name] = {'best': min(times),
+                         'median': statistics.median(times),
+                         'repeat': repeat}
+        print(f'{name:>18}: {min(times) * 1000:9.2f} ms '
+              f'(median {statistics.median(times) * 1000:.2f} ms)',
+              flush=True)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Print benchmarks slower than in baseline, returning how many."""
+    slower = 0
+    for name, result in results.items():
+        before = baseline['results'].get(name)
+        if not before:
+            continue
+        ratio = result['best'] / before['best']
+        if ratio > threshold:
+            slower += 1
+            print(f'{name}: {before["best"] * 1000:.2f} ms -> '
+                  f'{result["best"] * 1000:.2f} ms ({ratio:.2f}x)')
+    return slower
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Time gcalcli on synthetic calendars.')
+    parser.add_argument('names', nargs='*', metavar='name',
+                        help='benchmarks to run (default: all of '
+                        + ', '.join(BENCHMARKS) + ')')
+    sizes = parser.add_argument_group('sizes')
+    sizes.add_argument('--calendars', type=int, default=4)
+    sizes.add_argument('--events', type=int, default=2000,
+                       help='events per calendar')
+    sizes.add_argument('--weeks', type=int, default=8,
+                       help='weeks the events are spread over')
+    sizes.add_argument('--page-size', type=int, default=PAGE_SIZE)
+    sizes.add_argument('--ics-events', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', metavar='FILE',
+                        help='write the results to FILE')
+    parser.add_argument('--compare', metavar='FILE',
+                        help='compare with results written by --json')
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help='slowdown reported by --compare (default: '
+                        '%(default)s times)')
+    args = parser.parse_args()
+    unknown = set(args.names) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f'unknown benchmarks: {", ".join(sorted(unknown))}')
+    size_args = argparse.Namespace(
+        calendars=args.calendars, events=args.events, weeks=args.weeks,
+        page_size=args.page_size, ics_events=args.ics_events)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        if baseline['sizes'] != vars(size_args):
+            print(f'Warning: {args.compare} was run with different sizes '
+                  f'{baseline["sizes"]}', file=sys.stderr)
+
+    results = run_benchmarks(args.names or list(BENCHMARKS), size_args,
+                             args.repeat)
+
+    if args.json:
+        with open(args.json, 'w') as results_file:
+            json.dump({
+                'version': RESULTS_VERSION,
+                'gcalcli': gcalcli.__version__,
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'sizes': vars(size_args),
+                'results': results,
+            }, results_file, indent=2)
+            results_file.write('\n')
+
+    if baseline is not None and compare(results, baseline, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,189 @@
+"""Synthetic calendars, API responses and ICS files for the benchmarks.
+
+ReplayHttp stands in for the HTTP transport (see gcalcli.transport), so the
+real googleapiclient request building and response parsing run against
+canned calendarList and events.list pages without any network access.
+"""
+
+import json
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import httplib2
+
+WORDS = ['Standup', 'Review', 'Planning', 'Lunch', 'with', 'team', 'Budget',
+         '1:1', 'Retro', 'Interview', 'Sync', 'Design', 'Offsite', '会議',
+         'プロジェクト', 'Q3', 'roadmap', 'customer', 'call', 'Demo']
+ACCESS_ROLES = ['owner', 'writer', 'reader', 'freeBusyReader']
+# Default and maximum page size of events.list.
+PAGE_SIZE = 250
+
+
+def synthetic_calendars(count: int) -> list[dict]:
+    """calendarList entries, as returned by the API."""
+    return [{
+        'kind': 'calendar#calendarListEntry',
+        'etag': f'"{1700000000000 + i}"',
+        'id': f'cal{i}@group.calendar.google.com',
+        'summary': f'Calendar {i}',
+        'timeZone': 'UTC',
+        'colorId': str(i % 24 + 1),
+        'backgroundColor': '#9fc6e7',
+        'foregroundColor': '#000000',
+        'selected': True,
+        'accessRole': ACCESS_ROLES[0] if i == 0 else ACCESS_ROLES[i % 4],
+        'defaultReminders': [],
+    } for i in range(count)]
+
+
+def synthetic_items(cal_id: str, start: datetime, days: int, count: int,
+                    seed: int = 0) -> list[dict]:
+    """Raw events.list items spread over days from start, in random order.
+
+    Mostly timed meetings in a few timezones, with some all-day events and
+    optional descriptions, locations and attendees.
+    """
+    rng = random.Random(f'{cal_id}:{seed}')
+    offsets = [timezone(timedelta(hours=h)) for h in (-8, -5, 0, 1, 9)]
+    items = []
+    for i in range(count):
+        s = start + timedelta(minutes=rng.randrange(days * 24 * 60))
+        summary = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(1, 5)))
+        item = {
+            'kind': 'calendar#event',
+            'etag': f'"{3400000000000000 + i}"',
+            'id': f'{cal_id.split("@")[0]}event{i}',
+            'status': 'confirmed',
+            'htmlLink': f'https://www.google.com/calendar/event?eid={i}',
+            'created': '2024-01-01T09:00:00.000Z',
+            'updated': '2024-01-02T09:00:00.000Z',
+            'summary': summary,
+            'creator': {'email': 'someone@example.com'},
+            'organizer': {'email': cal_id, 'self': True},
+            'iCalUID': f'{cal_id}-{i}@google.com',
+            'sequence': 0,
+            'reminders': {'useDefault': True},
+            'eventType': 'default',
+        }
+        if rng.random() < 0.05:
+            day = s.date()
+            item['start'] = {'date': day.isoformat()}
+            item['end'] = {'date': (day + timedelta(
+                days=rng.randint(1, 3))).isoformat()}
+        else:
+            tz = rng.choice(offsets)
+            local = s.astimezone(tz)
+            length = timedelta(minutes=rng.choice((15, 30, 45, 60, 90)))
+            item['start'] = {'dateTime': local.isoformat(),
+                             'timeZone': 'UTC'}
+            item['end'] = {'dateTime': (local + length).isoformat(),
+                           'timeZone': 'UTC'}
+        if rng.random() < 0.3:
+            item['description'] = '\n'.join(
+                ' '.join(rng.choice(WORDS) for _ in range(12))
+                for _ in range(rng.randint(1, 4)))
+        if rng.random() < 0.3:
+            item['location'] = f'Room {rng.randint(1, 40)}, Building 2'
+        if rng.random() < 0.4:
+            item['attendees'] = [
+                {'email': f'person{rng.randrange(200)}@example.com',
+                 'responseStatus': rng.choice(
+                     ('accepted', 'declined', 'tentative', 'needsAction'))}
+                for _ in range(rng.randint(1, 8))]
+        items.append(item)
+    return items
+
+
+def _pages(items: list, page_size: int, **fields) -> list[bytes]:
+    """Serialized list responses for items, linked by page tokens."""
+    chunks = [items[i:i + page_size]
+              for i in range(0, len(items), page_size)] or [[]]
+    pages = []
+    for number, chunk in enumerate(chunks):
+        page = dict(fields, items=chunk)
+        if number + 1 < len(chunks):
+            page['nextPageToken'] = str(number + 1)
+        pages.append(json.dumps(page).encode())
+    return pages
+
+
+class ReplayHttp:
+    """httplib2.Http-compatible transport answering from canned pages.
+
+    Query parameters other than pageToken (time range, fields, ...) are
+    ignored, so every listing returns all of a calendar's events.
+    """
+
+    def __init__(self, calendars: list[dict],
+                 items_by_calendar: dict[str, list[dict]],
+                 page_size: int = PAGE_SIZE):
+        self.calendar_pages = _pages(
+            calendars, page_size, kind='calendar#calendarList',
+            etag='"calendar-list"')
+        self.event_pages = {
+            cal_id: _pages(items, page_size, kind='calendar#events',
+                           summary=cal_id, timeZone='UTC')
+            for cal_id, items in items_by_calendar.items()}
+        self.requests = 0
+
+    def _page(self, pages: Optional[list[bytes]],
+              token: Optional[str]) -> Optional[bytes]:
+        if pages is None:
+            return None
+        number = int(token) if token else 0
+        return pages[number] if number < len(pages) else None
+
+    def request(self, uri, method='GET', body=None, headers=None,
+                redirections=httplib2.DEFAULT_MAX_REDIRECTS,
+                connection_type=None):
+        self.requests += 1
+        url = urlsplit(uri)
+        token = parse_qs(url.query).get('pageToken', [None])[0]
+        path = url.path.split('/calendar/v3/', 1)[-1]
+        content = None
+        if path == 'users/me/calendarList':
+            content = self._page(self.calendar_pages, token)
+        elif path.startswith('calendars/') and path.endswith('/events'):
+            cal_id = unquote(path[len('calendars/'):-len('/events')])
+            content = self._page(self.event_pages.get(cal_id), token)
+        if content is None:
+            return httplib2.Response({'status': '404'}), b'{}'
+        return (httplib2.Response({'status': '200',
+                                   'content-type': 'application/json'}),
+                content)
+
+
+def synthetic_ics(start: datetime, count: int, seed: int = 0) -> str:
+    """An ICS file with count events, some recurring or with attendees."""
+    rng = random.Random(seed)
+    lines = ['BEGIN:VCALENDAR', 'VERSION:2.0',
+             'PRODID:-//gcalcli//benchmarks//EN']
+    for i in range(count):
+        s = start + timedelta(minutes=rng.randrange(90 * 24 * 60))
+        lines.extend(['BEGIN:VEVENT', f'UID:bench-{i}@example.com',
+                      'DTSTAMP:20240101T090000Z'])
+        if rng.random() < 0.05:
+            lines.append(f"DTSTART;VALUE=DATE:{s:%Y%m%d}")
+            lines.append(
+                f"DTEND;VALUE=DATE:{s + timedelta(days=1):%Y%m%d}")
+        else:
+            e = s + timedelta(minutes=rng.choice((30, 60, 90)))
+            lines.append(f'DTSTART:{s:%Y%m%dT%H%M%SZ}')
+            lines.append(f'DTEND:{e:%Y%m%dT%H%M%SZ}')
+        lines.append('SUMMARY:' + ' '.join(
+            rng.choice(WORDS) for _ in range(rng.randint(1, 5))))
+        if rng.random() < 0.3:
+            lines.append(f'LOCATION:Room {rng.randint(1, 40)}')
+        if rng.random() < 0.3:
+            lines.append('DESCRIPTION:' + ' '.join(
+                rng.choice(WORDS) for _ in range(20)))
+        if rng.random() < 0.1:
+            lines.append('RRULE:FREQ=WEEKLY;COUNT=10')
+        for _ in range(rng.randint(0, 3) if rng.random() < 0.4 else 0):
+            lines.append('ATTENDEE;PARTSTAT=ACCEPTED:mailto:'
+                         f'person{rng.randrange(200)}@example.com')
+        lines.append('END:VEVENT')
+    lines.append('END:VCALENDAR')
+    return '\r\n'.join(lines) + '\r\n'
@@ -3,27 +3,103 @@
 
 # must have underscore so as not to shadow stdlib types.py
 
-from datetime import datetime
-from typing import Any, TYPE_CHECKING, TypedDict
+from collections.abc import Iterator, MutableMapping
+from enum import Enum
+import json
+from typing import Any, Optional, TYPE_CHECKING, TypedDict
+
+
+class WeekStart(str, Enum):
+    SUNDAY = "sunday"
+    MONDAY = "monday"
+
 
 if TYPE_CHECKING:
     from googleapiclient._apis.calendar.v3.schemas import (  # type: ignore
         CalendarListEntry,
-        Event as GoogleEvent
     )
 
-    class Event(GoogleEvent):
-        """GoogleEvent, extended with some convenience attributes."""
-
-        gcalcli_cal: CalendarListEntry
-        s: datetime
-        e: datetime
-
     # XXX: having all_cals available as an invariant would be better than
     # setting total=False
     class Cache(TypedDict, total=False):
         all_cals: list[CalendarListEntry]
 else:
     CalendarListEntry = dict[str, Any]
-    Event = dict[str, Any]
     Cache = dict[str, Any]
+
+_UNSET: Any = object()
+
+
+class Event(MutableMapping[str, Any]):
+    """Calendar event from the API, extended with some convenience fields.
+
+    `s` and `e` (start and end as local datetimes), `gcalcli_cal` (the
+    calendar the event belongs to) and the fields needed to list an event
+    are held directly. All other API fields are kept as the compact JSON
+    they arrived in and only decoded the first time one of them is used, so
+    long listings don't keep every description and attendee list alive.
+    """
+
+    # Fields held directly rather than in the encoded remainder.
+    EAGER_FIELDS = ('s', 'e', 'gcalcli_cal', 'id', 'status', 'summary',
+                    'colorId')
+
+    __slots__ = EAGER_FIELDS + ('_raw', '_fields')
+
+    def __init__(self, item: dict[str, Any], **fields: Any):
+        """Wrap a raw API event; item is consumed and shouldn't be reused."""
+        for key in self.EAGER_FIELDS:
+            value = fields.get(key, _UNSET)
+            if value is _UNSET:
+                value = item.pop(key, _UNSET)
+            if value is not _UNSET:
+                setattr(self, key, value)
+        self._raw: Optional[bytes] = json.dumps(
+            item, ensure_ascii=False, separators=(',', ':')).encode()
+        self._fields: Optional[dict[str, Any]] = None
+
+    def _decoded(self) -> dict[str, Any]:
+        if self._fields is None:
+            assert self._raw is not None
+            self._fields = json.loads(self._raw)
+            self._raw = None
+        return self._fields
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self.EAGER_FIELDS:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        return self._decoded()[key]
+
+    def __setitem__(self, key: str, value: Any):
+        if key in self.EAGER_FIELDS:
+            setattr(self, key, value)
+        else:
+            self._decoded()[key] = value
+
+    def __delitem__(self, key: str):
+        if key in self.EAGER_FIELDS:
+            if not hasattr(self, key):
+                raise KeyError(key)
+            delattr(self, key)
+        else:
+            del self._decoded()[key]
+
+    def __contains__(self, key: object) -> bool:
+        if isinstance(key, str) and key in self.EAGER_FIELDS:
+            return hasattr(self, key)
+        return key in self._decoded()
+
+    def __iter__(self) -> Iterator[str]:
+        for key in self.EAGER_FIELDS:
+            if hasattr(self, key):
+                yield key
+        yield from self._decoded()
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({dict(self)!r})'
@@ -1,4 +1,8 @@
-"""Handlers for specific agendaupdate actions."""
+"""Handlers for specific agendaupdate actions.
+
+Each handler returns the API request implementing the action (or None if
+there's nothing to send), so the caller can execute them in batches.
+"""
 
 from .details import FIELD_HANDLERS, FIELDNAMES_READONLY
 from .exceptions import ReadonlyError
@@ -57,14 +61,11 @@ def patch(row, cal, interface):
         else:
             handler.patch(cal, mod_event, fieldname, value)
 
-    interface._retry_with_backoff(
-        interface.get_events()
-        .patch(
-            calendarId=cal_id,
-            eventId=event_id,
-            conferenceDataVersion=CONFERENCE_DATA_VERSION,
-            body=mod_event
-        )
+    return interface.get_events().patch(
+        calendarId=cal_id,
+        eventId=event_id,
+        conferenceDataVersion=CONFERENCE_DATA_VERSION,
+        body=mod_event
     )
 
 
@@ -81,13 +82,10 @@ def insert(row, cal, interface):
 
         handler.patch(cal, event, fieldname, value)
 
-    interface._retry_with_backoff(
-        interface.get_events()
-        .insert(
-            calendarId=cal_id,
-            conferenceDataVersion=CONFERENCE_DATA_VERSION,
-            body=event
-        )
+    return interface.get_events().insert(
+        calendarId=cal_id,
+        conferenceDataVersion=CONFERENCE_DATA_VERSION,
+        body=event
     )
 
 
@@ -96,7 +94,7 @@ def delete(row, cal, interface):
     cal_id = cal['id']
     event_id = row['id']
 
-    interface.delete(cal_id, event_id)
+    return interface.get_events().delete(calendarId=cal_id, eventId=event_id)
 
 
 def ignore(*args, **kwargs):
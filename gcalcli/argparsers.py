@@ -12,7 +12,8 @@ import argcomplete  # type: ignore
 
 import gcalcli
 
-from . import config, env, utils
+from . import env, utils
+from ._types import WeekStart
 from .deprecations import DeprecatedStoreTrue, parser_allow_deprecated
 from .details import DETAILS
 from .printer import valid_color_name
@@ -74,6 +75,34 @@ PROGRAM_OPTIONS = {
         'default': True,
         'help': 'Execute command without using cache',
     },
+    '--sync': {
+        'action': 'store_true',
+        'dest': 'sync_events',
+        'default': False,
+        'help': 'Keep a local store of events incrementally in sync with '
+        'Google Calendar and answer queries from it instead of re-listing all '
+        'events every time',
+    },
+    '--max-staleness': {
+        'default': None,
+        'type': int,
+        'dest': 'max_staleness',
+        'metavar': 'SECONDS',
+        'help': 'Answer queries from the local event store (see --sync), '
+        'only syncing calendars last synced more than SECONDS ago',
+    },
+    '--offline': {
+        'action': 'store_true',
+        'default': False,
+        'help': 'Answer queries only from the local event store and cached '
+        'calendar list, without contacting Google Calendar',
+    },
+    '--max-concurrency': {
+        'default': 4,
+        'type': int,
+        'dest': 'max_concurrency',
+        'help': 'Maximum number of calendars to fetch events from in parallel',
+    },
     '--conky': {
         'action': 'store_true',
         'default': False,
@@ -198,6 +227,14 @@ def get_output_parser(parents=[]):
         default=False,
         help='Use JSON output',
     )
+    output_parser.add_argument(
+        '--ndjson',
+        action='store_true',
+        dest='ndjson',
+        default=False,
+        help='Use newline-delimited JSON output, one event per line, '
+        'printed as events are fetched',
+    )
     output_parser.add_argument(
         '--nostarted',
         action='store_true',
@@ -299,7 +336,7 @@ def get_cal_query_parser():
     cal_query_parser.add_argument(
         '--monday',
         action='store_const',
-        const=config.WeekStart.MONDAY,
+        const=WeekStart.MONDAY,
         dest='week_start',
         # Note defaults to SUNDAY via config.OutputSection (not explicitly set
         # here because that would override value from config).
@@ -317,11 +354,21 @@ def get_cal_query_parser():
 
 def get_updates_parser():
     updates_parser = argparse.ArgumentParser(add_help=False)
-    updates_parser.add_argument('since', type=utils.get_time_from_str)
+    # Optional with --since-last-run, where the arguments are [start] [end].
+    updates_parser.add_argument(
+        'since', type=utils.get_time_from_str, nargs='?'
+    )
     updates_parser.add_argument(
         'start', type=utils.get_time_from_str, nargs='?'
     )
     updates_parser.add_argument('end', type=utils.get_time_from_str, nargs='?')
+    updates_parser.add_argument(
+        '--since-last-run',
+        action='store_true',
+        default=False,
+        help='Show updates since the last run with this option instead of '
+        'since a given datetime, e.g. to poll from a monitoring job',
+    )
     return updates_parser
 
 
@@ -335,6 +382,14 @@ def get_conflicts_parser():
     conflicts_parser.add_argument(
         'end', type=utils.get_time_from_str, nargs='?'
     )
+    conflicts_parser.add_argument(
+        '--freebusy',
+        action='store_true',
+        default=False,
+        help='Compare only the busy times of calendars instead of fetching '
+        'their events. Faster, but finds overlaps between calendars only, '
+        'and takes no search text',
+    )
     return conflicts_parser
 
 
@@ -470,7 +525,7 @@ def get_argument_parser():
         description='List available calendars.',
     )
 
-    sub.add_parser(
+    search = sub.add_parser(
         'search',
         parents=[
             calendars_parser,
@@ -479,7 +534,22 @@ def get_argument_parser():
             search_parser,
         ],
         help='search for events within an optional time period',
-        description='Provides case insensitive search for calendar ' 'events.',
+        description='Provides case insensitive search for calendar events. '
+        'Search text like "title:standup" (or location:, description:, '
+        'attendee:) only matches in that field, and is answered from the '
+        'local event store (see --sync), like --regex and --rank.',
+    )
+    search.add_argument(
+        '--regex',
+        action='store_true',
+        default=False,
+        help='Match each word of the search text as a regular expression',
+    )
+    search.add_argument(
+        '--rank',
+        action='store_true',
+        default=False,
+        help='List events by relevance instead of by date',
     )
     sub.add_parser(
         'edit',
@@ -541,7 +611,10 @@ def get_argument_parser():
         help='get updates since a datetime for a time period '
         '(defaults to through end of current month)',
         description='Get updates since a datetime for a time period '
-        '(default to through end of current month).',
+        '(default to through end of current month), including deleted '
+        'events.',
+        usage='%(prog)s [options] since [start] [end]\n'
+        '       %(prog)s [options] --since-last-run [start] [end]',
     )
 
     sub.add_parser(
@@ -555,6 +628,32 @@ def get_argument_parser():
         help='find event conflicts',
         description='Find conflicts between events matching search term '
         '(default from now through 30 days into futures)',
+        usage='%(prog)s [options] [text] [start] [end]\n'
+        '       %(prog)s [options] --freebusy [start] [end]',
+    )
+
+    freebusy = sub.add_parser(
+        'freebusy',
+        parents=[calendars_parser, output_parser, start_end_parser],
+        help='show busy or free time across calendars',
+        description='Show when any of the calendars is busy (default from '
+        'now through 7 days ahead), using only their free/busy '
+        'information.',
+    )
+    freebusy_mode = freebusy.add_mutually_exclusive_group()
+    freebusy_mode.add_argument(
+        '--free',
+        action='store_true',
+        default=False,
+        help='Show the times when all calendars are free instead',
+    )
+    freebusy_mode.add_argument(
+        '--slot',
+        metavar='MINUTES',
+        type=int,
+        default=None,
+        help='Show the first time when all calendars are free for this '
+        'many minutes',
     )
 
     calw = sub.add_parser(
@@ -707,6 +806,45 @@ def get_argument_parser():
         '--use_reminders', action=DeprecatedStoreTrue, help=argparse.SUPPRESS
     )
 
+    remind.add_argument(
+        '--daemon',
+        action='store_true',
+        help='Keep running and execute <cmd> when each reminder is due, '
+        'instead of checking once (e.g. from cron)',
+    )
+
+    remind.add_argument(
+        '--refresh-interval',
+        type=int,
+        default=5,
+        metavar='MINUTES',
+        help='How often --daemon refreshes events from Google Calendar',
+    )
+
+    serve = sub.add_parser(
+        'serve',
+        help='serve queries for gcalcli-client from a warm process',
+        description='Keep running, answering agenda, calendar and search '
+        'queries sent by gcalcli-client over a Unix socket. Reuses the API '
+        'connection and recently fetched events, which makes frequent '
+        'queries (e.g. from status bars) much cheaper. Output is the same as '
+        'running the query with gcalcli directly.',
+    )
+    serve.add_argument(
+        '--socket',
+        type=pathlib.Path,
+        default=None,
+        help='Path of the Unix socket to listen on (default: '
+        '$GCALCLI_SOCKET or a socket in the user runtime directory)',
+    )
+    serve.add_argument(
+        '--max-age',
+        type=int,
+        default=60,
+        metavar='SECONDS',
+        help='How long fetched events are reused for repeated queries',
+    )
+
     config = sub.add_parser(
         'config',
         help='utility commands to work with configuration',
@@ -0,0 +1,133 @@
+"""Helpers for grouping API mutations into batched HTTP requests."""
+
+from concurrent import futures
+from concurrent.futures import Future, ThreadPoolExecutor
+import json
+import random
+import threading
+import time
+from typing import Any, Callable, NamedTuple, Optional
+
+from googleapiclient.errors import HttpError
+
+# Google recommends against large batches for the Calendar API since they're
+# more likely to trip rate limits, and each sub-request still counts as one
+# request against quota.
+MAX_BATCH_SIZE = 50
+
+RATE_LIMIT_REASONS = ('rateLimitExceeded', 'userRateLimitExceeded')
+
+
+def is_rate_limit_error(e: HttpError) -> bool:
+    """Whether an API error means the request should be retried later."""
+    try:
+        error = json.loads(e.content).get('error', {})
+        reason = error.get('errors')[0].get('reason')
+    except (ValueError, TypeError, AttributeError, IndexError):
+        return False
+    return (int(error.get('code', 0)) in (403, 429)
+            and reason in RATE_LIMIT_REASONS)
+
+
+class BatchResult(NamedTuple):
+    key: Any
+    response: Optional[dict[str, Any]]
+    error: Optional[HttpError]
+
+
+class BatchQueue:
+    """Queue of API requests executed in batches of up to batch_size.
+
+    Requests are sent as soon as a full batch is queued, and any remainder on
+    flush(). Sub-requests that fail with rate limit errors are retried with
+    backoff on their own, without resending the rest of their batch. The
+    result of every request is reported as a BatchResult tagged with the key
+    it was queued with, either collected in results or passed to on_result.
+
+    With max_workers > 1, up to that many batches are sent concurrently from
+    worker threads, and add() blocks while that many are in flight.
+    """
+
+    def __init__(
+        self,
+        interface,
+        batch_size: int = MAX_BATCH_SIZE,
+        max_workers: int = 1,
+        on_result: Optional[Callable[[BatchResult], None]] = None,
+    ):
+        self.interface = interface
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.on_result = on_result
+        self.pending: list[tuple[Any, Any]] = []
+        self.results: list[BatchResult] = []
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._in_flight: set[Future] = set()
+
+    def add(self, request, key=None):
+        self.pending.append((key, request))
+        if len(self.pending) >= self.batch_size:
+            self._execute_pending()
+
+    def flush(self) -> list[BatchResult]:
+        """Execute any queued requests and return all results so far."""
+        if self.pending:
+            self._execute_pending()
+        if self._executor is not None:
+            try:
+                for future in self._in_flight:
+                    future.result()
+            finally:
+                self._in_flight = set()
+                self._executor.shutdown()
+                self._executor = None
+        return self.results
+
+    def _execute_pending(self):
+        pending, self.pending = self.pending, []
+        if self.max_workers <= 1:
+            self._execute(pending)
+            return
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        while len(self._in_flight) >= self.max_workers:
+            done, self._in_flight = futures.wait(
+                self._in_flight, return_when=futures.FIRST_COMPLETED)
+            for future in done:
+                future.result()
+        self._in_flight.add(self._executor.submit(self._execute, pending))
+
+    def _record(self, result: BatchResult):
+        with self._lock:
+            if self.on_result:
+                self.on_result(result)
+            else:
+                self.results.append(result)
+
+    def _execute(self, pending):
+        for n in range(self.interface.max_retries):
+            responses: dict[str, tuple[Any, Optional[HttpError]]] = {}
+
+            def callback(request_id, response, exception):
+                responses[request_id] = (response, exception)
+
+            batch = self.interface.new_batch_http_request(callback)
+            for i, (_, request) in enumerate(pending):
+                batch.add(request, request_id=str(i))
+            self.interface._execute_batch(batch)
+
+            retry = []
+            is_last_try = n == self.interface.max_retries - 1
+            for i, (key, request) in enumerate(pending):
+                response, error = responses[str(i)]
+                if (error is not None and not is_last_try
+                        and is_rate_limit_error(error)):
+                    retry.append((key, request))
+                else:
+                    self._record(BatchResult(key, response, error))
+            if not retry:
+                return
+            pending = retry
+            time.sleep((2 ** n) + random.random())
@@ -0,0 +1,103 @@
+"""Versioned on-disk cache of API data with per-entry expiry.
+
+Entries are stored together with the time they were fetched, how long they
+stay fresh, and the etag the API returned for them, so stale entries can be
+revalidated cheaply with a conditional request. The file starts with a
+header holding the cache format version and a checksum of the payload, and
+is discarded (treated as empty) if either doesn't match.
+"""
+
+import hashlib
+import os
+import pathlib
+import pickle
+import struct
+import threading
+import time
+from typing import Any, NamedTuple, Optional
+
+CACHE_VERSION = 1
+
+_MAGIC = b'GCALCLI-CACHE'
+# Magic, format version, SHA-256 digest of the payload.
+_HEADER = struct.Struct(f'>{len(_MAGIC)}sH32s')
+
+
+class CacheEntry(NamedTuple):
+    value: Any
+    fetched_at: float
+    ttl: float
+    etag: Optional[str] = None
+
+    def is_stale(self, now: Optional[float] = None) -> bool:
+        if now is None:
+            now = time.time()
+        return now - self.fetched_at > self.ttl
+
+
+class CacheStore:
+    """Cache entries by key, persisted to a file on save().
+
+    A None path gives a store that is never read from or written to disk.
+    """
+
+    def __init__(self, path: Optional[pathlib.Path]):
+        self.path = path
+        self._entries: dict[str, CacheEntry] = {}
+        self._lock = threading.Lock()
+        if path is not None:
+            self._entries = self._load(path)
+
+    @staticmethod
+    def _load(path: pathlib.Path) -> dict[str, CacheEntry]:
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return {}
+        if len(data) < _HEADER.size:
+            return {}
+        magic, version, checksum = _HEADER.unpack_from(data)
+        payload = data[_HEADER.size:]
+        if (magic != _MAGIC or version != CACHE_VERSION
+                or hashlib.sha256(payload).digest() != checksum):
+            return {}
+        try:
+            entries = pickle.loads(payload)
+        except (pickle.UnpicklingError, EOFError, ValueError, TypeError,
+                AttributeError, ImportError):
+            return {}
+        return {key: CacheEntry(*entry) for key, entry in entries.items()}
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            return self._entries.get(key)
+
+    def put(self, key: str, value: Any, ttl: float,
+            etag: Optional[str] = None):
+        with self._lock:
+            self._entries[key] = CacheEntry(value, time.time(), ttl, etag)
+
+    def touch(self, key: str):
+        """Mark an entry as freshly fetched, e.g. after a 304 response."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries[key] = entry._replace(fetched_at=time.time())
+
+    def save(self):
+        if self.path is None:
+            return
+        with self._lock:
+            payload = pickle.dumps(
+                {key: tuple(entry) for key, entry in self._entries.items()},
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        header = _HEADER.pack(
+            _MAGIC, CACHE_VERSION, hashlib.sha256(payload).digest())
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so concurrent gcalcli processes
+        # (or threads) never read a partially written cache.
+        tmp_path = self.path.with_name(
+            f'{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+        tmp_path.write_bytes(header + payload)
+        tmp_path.replace(self.path)
@@ -23,14 +23,6 @@
 # ######################################################################### #
 
 
-# Import trusted certificate store to enable SSL, e.g., behind firewalls.
-# Must be called as early as possible to avoid bugs.
-# fmt: off
-import truststore; truststore.inject_into_ssl()  # noqa: I001,E702
-# fmt: on
-# ruff: noqa: E402
-
-
 import json
 import os
 import pathlib
@@ -39,11 +31,11 @@ import signal
 import sys
 from argparse import ArgumentTypeError
 from collections import namedtuple
+from itertools import chain
 
-from . import config, env, utils
+from . import env, utils
 from .argparsers import get_argument_parser, handle_unparsed
 from .exceptions import GcalcliError
-from .gcal import GoogleCalendarInterface
 from .printer import Printer, valid_color_name
 from .validators import (
     DATE_INPUT_DESCRIPTION,
@@ -152,9 +144,35 @@ def run_add_prompt(parsed_args, printer):
             parsed_args.reminders.append(str(n) + ' ' + m)
 
 
-def main():
+def load_calendar_interface():
+    """Import and return the GoogleCalendarInterface class.
+
+    The Google API client libraries are slow to import, so this is deferred
+    until a command actually needs to talk to the API.
+    """
+    # Import trusted certificate store to enable SSL, e.g., behind firewalls.
+    # Must be injected before the HTTP client libraries are first imported to
+    # avoid bugs.
+    import truststore
+
+    truststore.inject_into_ssl()
+
+    from .gcal import GoogleCalendarInterface
+
+    return GoogleCalendarInterface
+
+
+def main(argv=None, calendar_interface=None):
+    """Run gcalcli with the given arguments (default: sys.argv[1:]).
+
+    calendar_interface, if given, is used in place of
+    GoogleCalendarInterface, e.g. by `gcalcli serve` to keep state warm
+    between queries.
+    """
     parser = get_argument_parser()
-    argv = sys.argv[1:]
+    if argv is None:
+        argv = sys.argv[1:]
+    argv = list(argv)
 
     rc_paths = [
         pathlib.Path('~/.gcalclirc').expanduser(),
@@ -185,6 +203,10 @@ def main():
     ]
     fromfile_args = [f'@{rc}' for rc in rc_paths if rc and rc.exists()]
 
+    # Deferred until after the initial parse so --help and tab completion
+    # don't pay for loading pydantic.
+    from . import config
+
     config_filepath = env.config_file()
     if config_filepath.exists():
         with config_filepath.open('rb') as config_file:
@@ -229,10 +251,12 @@ def main():
     cal_names = set_resolved_calendars(parsed_args, printer=printer)
 
     userless_mode = bool(os.environ.get('GCALCLI_USERLESS_MODE'))
-    if parsed_args.command in ('config', 'util'):
+    if parsed_args.command in ('config', 'util', 'serve'):
         gcal = None
     else:
-        gcal = GoogleCalendarInterface(
+        if calendar_interface is None:
+            calendar_interface = load_calendar_interface()
+        gcal = calendar_interface(
             cal_names=cal_names,
             printer=printer,
             userless_mode=userless_mode,
@@ -255,16 +279,46 @@ def main():
             gcal.AgendaUpdate(parsed_args.file)
 
         elif parsed_args.command == 'updates':
-            gcal.UpdatesQuery(
-                    last_updated_datetime=parsed_args.since,
-                    start=parsed_args.start,
-                    end=parsed_args.end)
+            if parsed_args.since_last_run:
+                # There's no since argument, so the others shift over.
+                if parsed_args.end:
+                    parser.error('too many arguments for --since-last-run')
+                gcal.UpdatesQuery(
+                        start=parsed_args.since, end=parsed_args.start,
+                        since_last_run=True)
+            else:
+                if not parsed_args.since:
+                    parser.error('updates: since is required')
+                gcal.UpdatesQuery(
+                        last_updated_datetime=parsed_args.since,
+                        start=parsed_args.start,
+                        end=parsed_args.end)
 
         elif parsed_args.command == 'conflicts':
-            gcal.ConflictsQuery(
-                    search_text=parsed_args.text,
+            if parsed_args.freebusy and parsed_args.text:
+                # There's no search text, so the others shift over.
+                if parsed_args.end:
+                    parser.error('too many arguments for --freebusy')
+                try:
+                    start = utils.get_time_from_str(parsed_args.text)
+                except ValueError as exc:
+                    parser.error(str(exc))
+                gcal.ConflictsQuery(
+                        start=start, end=parsed_args.start,
+                        use_freebusy=True)
+            else:
+                gcal.ConflictsQuery(
+                        search_text=parsed_args.text,
+                        start=parsed_args.start,
+                        end=parsed_args.end,
+                        use_freebusy=parsed_args.freebusy)
+
+        elif parsed_args.command == 'freebusy':
+            gcal.FreeBusyQuery(
                     start=parsed_args.start,
-                    end=parsed_args.end)
+                    end=parsed_args.end,
+                    free=parsed_args.free,
+                    slot=parsed_args.slot)
 
         elif parsed_args.command == 'calw':
             gcal.CalQuery(
@@ -326,10 +380,17 @@ def main():
             )
 
         elif parsed_args.command == 'remind':
-            gcal.Remind(
-                    parsed_args.minutes, parsed_args.cmd,
-                    use_reminders=parsed_args.use_reminders
-            )
+            if parsed_args.daemon:
+                gcal.RemindDaemon(
+                        parsed_args.minutes, parsed_args.cmd,
+                        use_reminders=parsed_args.use_reminders,
+                        refresh_minutes=parsed_args.refresh_interval
+                )
+            else:
+                gcal.Remind(
+                        parsed_args.minutes, parsed_args.cmd,
+                        use_reminders=parsed_args.use_reminders
+                )
 
         elif parsed_args.command == 'import':
             gcal.ImportICS(
@@ -337,6 +398,11 @@ def main():
                     parsed_args.reminders, parsed_args.file
             )
 
+        elif parsed_args.command == 'serve':
+            from .server import serve
+
+            serve(parsed_args.socket, max_age=parsed_args.max_age)
+
         elif parsed_args.command == 'config':
             if parsed_args.subcommand == 'edit':
                 printer.msg(
@@ -360,8 +426,9 @@ def main():
                 print(json.dumps(schema, indent=2))
             elif parsed_args.subcommand == 'reset-cache':
                 deleted_something = False
-                for (cache_filepath, _) in env.data_file_paths(
-                    'cache', parsed_args.config_folder
+                for (cache_filepath, _) in chain.from_iterable(
+                    env.data_file_paths(name, parsed_args.config_folder)
+                    for name in ('cache', 'events', 'discovery')
                 ):
                     if cache_filepath.exists():
                         printer.msg(
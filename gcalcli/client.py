@@ -0,0 +1,67 @@
+"""Thin client that runs gcalcli queries on a `gcalcli serve` process.
+
+Usage is the same as gcalcli itself, e.g. `gcalcli-client agenda --conky`.
+Only the standard library is imported up front, so starting the client is
+cheap. If no server is running, or the command isn't one the server answers,
+the query runs in the client instead, like plain gcalcli would.
+"""
+
+import json
+import pathlib
+import shutil
+import socket
+import sys
+from typing import Optional
+
+from . import env
+
+
+def run(argv: list[str],
+        socket_path: Optional[pathlib.Path] = None) -> Optional[int]:
+    """Run a query on the server, writing its output to stdout/stderr.
+
+    Returns the exit code, or None if the query should run locally instead.
+    Raises OSError if the server can't be reached.
+    """
+    if socket_path is None:
+        socket_path = env.server_socket_path()
+    request = {
+        'argv': argv,
+        # Default --width comes from the terminal size, which only the client
+        # knows.
+        'columns': shutil.get_terminal_size().columns,
+    }
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(socket_path))
+        sock.sendall(json.dumps(request).encode() + b'\n')
+        for line in sock.makefile('rb'):
+            message = json.loads(line)
+            if 'out' in message:
+                sys.stdout.write(message['out'])
+            elif 'err' in message:
+                sys.stderr.write(message['err'])
+            elif 'fallback' in message:
+                return None
+            elif 'exit' in message:
+                sys.stdout.flush()
+                return message['exit']
+    sys.stderr.write('gcalcli server closed the connection unexpectedly\n')
+    return 1
+
+
+def main():
+    argv = sys.argv[1:]
+    try:
+        code = run(argv)
+    except OSError:
+        code = None
+    if code is None:
+        from .cli import main as cli_main
+
+        cli_main(argv)
+        return
+    sys.exit(code)
+
+
+if __name__ == '__main__':
+    main()
@@ -2,7 +2,6 @@
 
 import argparse
 from collections import OrderedDict
-from enum import Enum
 import sys
 from typing import Any, List, Mapping, Optional
 
@@ -14,6 +13,8 @@ else:
 from pydantic import BaseModel, ConfigDict, Field
 from pydantic.json_schema import GenerateJsonSchema
 
+from ._types import WeekStart
+
 
 class AuthSection(BaseModel):
     """Configuration for settings like client-id used in auth flow.
@@ -53,11 +54,6 @@ using --calendar) when running commands against all calendars',
     )
 
 
-class WeekStart(str, Enum):
-    SUNDAY = "sunday"
-    MONDAY = "monday"
-
-
 class OutputSection(BaseModel):
     model_config = ConfigDict(
         title='Settings about gcalcli output (formatting, colors, etc)'
@@ -1,24 +1,101 @@
+"""Detect overlapping events with a sweep line over their start times.
+
+Events are visited in start order while a heap keyed by end time tracks the
+ones still in progress, so expiring finished events costs O(log n) each and
+the total work is O(n log n + number of overlapping pairs).
+"""
+
+from datetime import datetime
+import heapq
+from itertools import repeat
+from typing import Iterable, Iterator, NamedTuple
+
 from ._types import Event
 
 
-class ShowConflicts:
-    active_events: list[Event] = []
+class ConflictSweep:
+    """Sweep line over events given in chronological order of start."""
+
+    def __init__(self):
+        # Events still in progress, by position, in the order they started.
+        self.active: dict[int, Event] = {}
+        # (end, position) of the active events, earliest end first.
+        self._ends: list[tuple[datetime, int]] = []
+        # Number of events added so far.
+        self.count = 0
+
+    def advance(self, start: datetime):
+        """Drop active events that end at or before start."""
+        ends = self._ends
+        while ends and ends[0][0] <= start:
+            del self.active[heapq.heappop(ends)[1]]
+
+    def push(self, event: Event) -> int:
+        """Make event active, returning its position in the order added."""
+        position = self.count
+        self.count += 1
+        self.active[position] = event
+        heapq.heappush(self._ends, (event['e'], position))
+        return position
+
+
+class ConflictCluster(NamedTuple):
+    """A maximal run of events connected by overlaps.
 
+    pairs holds every overlapping pair as indexes into events.
+    """
+
+    start: datetime
+    end: datetime
+    events: list[Event]
+    pairs: list[tuple[int, int]]
+
+
+def find_conflicts(events: Iterable[Event]) -> Iterator[ConflictCluster]:
+    """Yield clusters of overlapping events, in chronological order.
+
+    Events must be passed in chronological order of start. Events that
+    don't overlap any other event are not reported.
+    """
+    sweep = ConflictSweep()
+    cluster = None
+    first = 0
+    for event in events:
+        start = event['s']
+        sweep.advance(start)
+        if cluster is None or start >= cluster.end:
+            if cluster is not None and cluster.pairs:
+                yield cluster
+            cluster = ConflictCluster(start, event['e'], [], [])
+            first = sweep.count
+        elif event['e'] > cluster.end:
+            cluster = cluster._replace(end=event['e'])
+
+        index = len(cluster.events)
+        cluster.events.append(event)
+        if sweep.active:
+            cluster.pairs.extend(
+                zip([p - first for p in sweep.active],
+                    repeat(index, len(sweep.active))))
+        sweep.push(event)
+    if cluster is not None and cluster.pairs:
+        yield cluster
+
+
+class ShowConflicts:
     def __init__(self, show):
         if show:
             self.show = show
         else:
             self.show = self._default_show
+        self._sweep = ConflictSweep()
 
     def show_conflicts(self, latest_event):
         """Events must be passed in chronological order"""
-        start = latest_event['s']
-        for event in self.active_events:
-            if (event['e'] > start):
-                self.show(event)
-        self.active_events = list(
-            filter(lambda e: e['e'] > start, self.active_events))
-        self.active_events.append(latest_event)
+        self._sweep.advance(latest_event['s'])
+        for event in list(self._sweep.active.values()):
+            self.show(event)
+        self._sweep.push(latest_event)
 
     def _default_show(self, e):
         print(e)
@@ -1,8 +1,10 @@
 """Handlers for specific details of events."""
 
 from collections import OrderedDict
-from datetime import datetime
+from datetime import date, datetime, time
+import functools
 from itertools import chain
+from typing import Callable
 
 from dateutil.parser import isoparse, parse
 
@@ -21,6 +23,16 @@ ENTRY_POINT_PROPS = OrderedDict([('conference_entry_point_type',
                                  ('conference_uri', 'uri')])
 
 
+@functools.lru_cache(maxsize=4096)
+def _format_date(year, month, day):
+    return date(year, month, day).strftime(FMT_DATE)
+
+
+@functools.lru_cache(maxsize=24 * 60)
+def _format_time(hour, minute):
+    return time(hour, minute).strftime(FMT_TIME)
+
+
 def _valid_title(event):
     if 'summary' in event and event['summary'].strip():
         return event['summary']
@@ -33,12 +45,19 @@ class Handler:
 
     # list of strings for fieldnames provided by this object
     fieldnames: list[str] = []
+    # list of API event fields this object reads
+    api_fields: list[str] = []
 
     @classmethod
     def get(cls, event):
         """Return simple string representation for columnar output."""
         raise NotImplementedError
 
+    @classmethod
+    def tsv(cls, event):
+        """Return the columns from get() as a tab separated string."""
+        return '\t'.join(cls.get(event))
+
     @classmethod
     def data(cls, event):
         """Return plain data for formatted output."""
@@ -57,6 +76,10 @@ class SingleFieldHandler(Handler):
     def get(cls, event):
         return [cls._get(event).strip()]
 
+    @classmethod
+    def tsv(cls, event):
+        return cls._get(event).strip()
+
     @classmethod
     def data(cls, event):
         return cls._get(event).strip()
@@ -82,15 +105,18 @@ class Time(Handler):
     """Handler for dates and times."""
 
     fieldnames = ['start_date', 'start_time', 'end_date', 'end_time']
+    api_fields = ['start', 'end']
 
     @classmethod
     def _datetime_to_fields(cls, instant, all_day):
-        instant_date = instant.strftime(FMT_DATE)
+        # strftime is slow, and exports repeat the same dates and times
+        # over and over.
+        instant_date = _format_date(instant.year, instant.month, instant.day)
 
         if all_day:
             instant_time = ''
         else:
-            instant_time = instant.strftime(FMT_TIME)
+            instant_time = _format_time(instant.hour, instant.minute)
 
         return [instant_date, instant_time]
 
@@ -103,6 +129,16 @@ class Time(Handler):
 
         return start_fields + end_fields
 
+    @classmethod
+    def tsv(cls, event):
+        start, end = event['s'], event['e']
+        start_date = _format_date(start.year, start.month, start.day)
+        end_date = _format_date(end.year, end.month, end.day)
+        if is_all_day(event):
+            return f'{start_date}\t\t{end_date}\t'
+        return (f'{start_date}\t{_format_time(start.hour, start.minute)}\t'
+                f'{end_date}\t{_format_time(end.hour, end.minute)}')
+
     @classmethod
     def data(cls, event):
         return dict(zip(cls.fieldnames, cls.get(event)))
@@ -141,6 +177,7 @@ class Length(Handler):
     """Handler for event duration."""
 
     fieldnames = ['length']
+    api_fields = ['start', 'end']
 
     @classmethod
     def get(cls, event):
@@ -172,6 +209,7 @@ class Url(Handler):
     """Handler for HTML and legacy Hangout links."""
 
     fieldnames = list(URL_PROPS.keys())
+    api_fields = list(URL_PROPS.values())
 
     @classmethod
     def get(cls, event):
@@ -206,6 +244,7 @@ class Conference(Handler):
     """Handler for videoconference and teleconference details."""
 
     fieldnames = list(ENTRY_POINT_PROPS.keys())
+    api_fields = ['conferenceData']
 
     CONFERENCE_PROPS = OrderedDict([('meeting_code', 'meetingCode'),
                                     ('passcode', 'passcode'),
@@ -258,6 +297,7 @@ class Attendees(Handler):
     """Handler for event attendees."""
 
     fieldnames = ['attendees']
+    api_fields = ['attendees', 'organizer']
 
     ATTENDEE_PROPS = \
         OrderedDict([('attendee_email', 'email'),
@@ -297,6 +337,7 @@ class Title(SingleFieldHandler):
     """Handler for title."""
 
     fieldnames = ['title']
+    api_fields = ['summary']
 
     @classmethod
     def _get(cls, event):
@@ -311,12 +352,14 @@ class Location(SimpleSingleFieldHandler):
     """Handler for location."""
 
     fieldnames = ['location']
+    api_fields = ['location']
 
 
 class Description(SimpleSingleFieldHandler):
     """Handler for description."""
 
     fieldnames = ['description']
+    api_fields = ['description']
 
 
 class Calendar(SingleFieldHandler):
@@ -340,6 +383,7 @@ class Email(SingleFieldHandler):
     """Handler for emails."""
 
     fieldnames = ['email']
+    api_fields = ['organizer', 'creator']
 
     @classmethod
     def _get(cls, event):
@@ -354,6 +398,7 @@ class ID(SimpleSingleFieldHandler):
     """Handler for event ID."""
 
     fieldnames = ['id']
+    api_fields = ['id']
 
 
 class Action(SingleFieldHandler):
@@ -365,6 +410,11 @@ class Action(SingleFieldHandler):
     def _get(cls, event):
         return ACTION_DEFAULT
 
+    @classmethod
+    def patch(cls, cal, event, fieldname, value):
+        # Only selects how the row is processed, nothing to patch.
+        pass
+
 
 HANDLERS = OrderedDict([('id', ID),
                         ('time', Time),
@@ -394,3 +444,46 @@ _DETAILS_WITHOUT_HANDLERS = ['reminders', 'attachments', 'end']
 
 DETAILS = list(HANDLERS.keys()) + _DETAILS_WITHOUT_HANDLERS
 DETAILS_DEFAULT = {'time', 'title'}
+
+# API event fields read by every event view, whatever the details.
+_API_FIELDS_ALWAYS = ['id', 'status', 'start', 'end', 'summary', 'colorId']
+_API_FIELDS_WITHOUT_HANDLERS = {'reminders': ['reminders'],
+                                'attachments': ['attachments'],
+                                'end': ['end']}
+
+
+def tsv_formatter(details) -> tuple[str, Callable[..., str]]:
+    """Return the TSV header and a function formatting an event as a row.
+
+    The columns are worked out once from details, so formatting each row
+    is just a call per handler and a join.
+    """
+    handlers = [handler for key, handler in HANDLERS.items()
+                if key in details]
+    header = '\t'.join(chain.from_iterable(handler.fieldnames
+                                           for handler in handlers))
+    columns = [handler.tsv for handler in handlers]
+
+    def format_row(event):
+        return '\t'.join([column(event) for column in columns]).replace(
+            '\n', r'\n')
+
+    return header, format_row
+
+
+def events_list_fields(details, include_attendance=False):
+    """Return a partial response mask for events().list.
+
+    The mask only covers the event fields needed to show the given details,
+    plus the response status of attendees if include_attendance is set (to
+    filter out declined events).
+    """
+    fields = set(_API_FIELDS_ALWAYS)
+    for detail in DETAILS_DEFAULT.union(details):
+        if detail in HANDLERS:
+            fields.update(HANDLERS[detail].api_fields)
+        else:
+            fields.update(_API_FIELDS_WITHOUT_HANDLERS.get(detail, []))
+    if include_attendance and 'attendees' not in fields:
+        fields.add('attendees(email,self,responseStatus)')
+    return f"nextPageToken,items({','.join(sorted(fields))})"
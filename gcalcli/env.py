@@ -37,6 +37,19 @@ def data_file_paths(
     return paths
 
 
+def server_socket_path() -> pathlib.Path:
+    """Unix socket that `gcalcli serve` listens on and gcalcli-client uses."""
+    from_env = os.environ.get('GCALCLI_SOCKET')
+    if from_env:
+        return pathlib.Path(from_env)
+    return platformdirs.user_runtime_path(__program__).joinpath('server.sock')
+
+
+def debug_enabled() -> bool:
+    """Whether $GCALCLI_DEBUG asks for extra diagnostics on stderr."""
+    return bool(os.environ.get('GCALCLI_DEBUG'))
+
+
 def explicit_config_path() -> Optional[pathlib.Path]:
     config_path = os.environ.get('GCALCLI_CONFIG')
     return pathlib.Path(config_path) if config_path else None
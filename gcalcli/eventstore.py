@@ -0,0 +1,270 @@
+"""Persistent local store of calendar events, kept current via sync tokens.
+
+The Calendar API hands out a `nextSyncToken` on the last page of a full
+events().list listing. Passing it back on later requests returns only the
+events that changed since (including cancelled ones), so the store can be
+brought up to date with a single small delta request instead of re-listing
+every event from scratch.
+
+Events are indexed by start, end and last update time, and their title,
+description, location, attendees and organizer (the fields the API's own q=
+search covers) by an FTS5 full-text index (where SQLite has it), so queries
+can be answered from the store without going to the network. See search.py
+for the query syntax.
+"""
+
+from datetime import datetime
+import json
+import pathlib
+import sqlite3
+import threading
+import time
+from typing import Any, Iterable, Iterator, Optional
+
+from . import search, utils
+
+SCHEMA_VERSION = 4
+
+_SCHEMA = """\
+CREATE TABLE IF NOT EXISTS calendars (
+    cal_id TEXT PRIMARY KEY,
+    sync_token TEXT,
+    synced_at REAL
+);
+CREATE TABLE IF NOT EXISTS events (
+    cal_id TEXT NOT NULL,
+    event_id TEXT NOT NULL,
+    starts_at REAL,
+    ends_at REAL,
+    updated_at REAL,
+    summary TEXT NOT NULL,
+    description TEXT NOT NULL,
+    location TEXT NOT NULL,
+    attendees TEXT NOT NULL,
+    body TEXT NOT NULL,
+    PRIMARY KEY (cal_id, event_id)
+);
+CREATE INDEX IF NOT EXISTS events_starts_at ON events (cal_id, starts_at);
+CREATE INDEX IF NOT EXISTS events_ends_at ON events (cal_id, ends_at);
+CREATE INDEX IF NOT EXISTS events_updated_at ON events (cal_id, updated_at);
+"""
+
+# Indexes the text columns of events, without a copy of their contents.
+_FTS_SCHEMA = """\
+CREATE VIRTUAL TABLE IF NOT EXISTS events_fts
+    USING fts5(summary, description, location, attendees,
+               content='events', content_rowid='rowid');
+"""
+_FTS_DELETE = (
+    "INSERT INTO events_fts (events_fts, rowid, summary, description, "
+    "location, attendees) SELECT 'delete', rowid, summary, description, "
+    "location, attendees FROM events ")
+
+# All-day events are stored at midnight in the local timezone of whoever
+# synced them, so range queries are widened enough to cover any timezone
+# change. Callers apply the exact bounds after decoding.
+_ALL_DAY_SLACK = 2 * 24 * 60 * 60
+
+
+def _timestamp(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    return utils.parse_api_time(value).timestamp()
+
+
+def _instant(item: dict[str, Any], name: str) -> Optional[float]:
+    instant = item.get(name) or {}
+    return _timestamp(instant.get('dateTime') or instant.get('date'))
+
+
+def _text_values(item: dict[str, Any]) -> tuple[str, ...]:
+    """Values of the search.COLUMNS columns for an event."""
+    return (
+        item.get('summary', ''),
+        item.get('description', ''),
+        item.get('location', ''),
+        ' '.join(person.get(key, '')
+                 for person in [item.get('organizer', {}),
+                                *item.get('attendees', [])]
+                 for key in ('displayName', 'email')),
+    )
+
+
+class EventStore:
+    """SQLite-backed store of raw API events and sync tokens per calendar."""
+
+    # Whether SQLite supports FTS5, which text search in events() needs.
+    has_fts = False
+
+    def __init__(self, path: Optional[pathlib.Path]):
+        if path is None:
+            database = ':memory:'
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            database = str(path)
+        # All access is serialized through self._lock, so the connection can
+        # be shared with worker threads.
+        self._conn = sqlite3.connect(database, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._init_schema()
+
+    def _init_schema(self):
+        with self._lock, self._conn:
+            (version,) = self._conn.execute('PRAGMA user_version').fetchone()
+            if version != SCHEMA_VERSION:
+                # Contents are only a cache of server data, so an unknown
+                # layout is simply dropped and synced again from scratch.
+                self._conn.executescript(
+                    'DROP TABLE IF EXISTS calendars;'
+                    'DROP TABLE IF EXISTS events;'
+                    'DROP TABLE IF EXISTS events_fts;'
+                )
+            self._conn.executescript(_SCHEMA)
+            try:
+                self._conn.executescript(_FTS_SCHEMA)
+            except sqlite3.OperationalError:
+                pass  # SQLite built without FTS5.
+            else:
+                self.has_fts = True
+            self._conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+
+    def sync_token(self, cal_id: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT sync_token FROM calendars WHERE cal_id = ?', (cal_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def synced_at(self, cal_id: str) -> Optional[float]:
+        """Return when a calendar was last synced, as a Unix timestamp."""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT synced_at FROM calendars WHERE cal_id = ?', (cal_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def reset(self, cal_id: str):
+        """Forget all events and the sync token for a calendar."""
+        with self._lock, self._conn:
+            if self.has_fts:
+                self._conn.execute(
+                    _FTS_DELETE + 'WHERE cal_id = ?', (cal_id,))
+            self._conn.execute(
+                'DELETE FROM events WHERE cal_id = ?', (cal_id,))
+            self._conn.execute(
+                'DELETE FROM calendars WHERE cal_id = ?', (cal_id,))
+
+    def apply(
+        self,
+        cal_id: str,
+        items: Iterable[dict[str, Any]],
+        sync_token: Optional[str],
+    ):
+        """Apply a full or delta listing of events for a calendar.
+
+        Cancelled events are removed from the store, all others are inserted
+        or replaced. The whole change is committed atomically together with
+        the new sync token.
+        """
+        with self._lock, self._conn:
+            for item in items:
+                if self.has_fts:
+                    self._conn.execute(
+                        _FTS_DELETE + 'WHERE cal_id = ? AND event_id = ?',
+                        (cal_id, item['id']),
+                    )
+                if item.get('status') == 'cancelled':
+                    self._conn.execute(
+                        'DELETE FROM events WHERE cal_id = ? AND event_id = ?',
+                        (cal_id, item['id']),
+                    )
+                    continue
+
+                text = _text_values(item)
+                cursor = self._conn.execute(
+                    'INSERT OR REPLACE INTO events (cal_id, event_id, '
+                    'starts_at, ends_at, updated_at, summary, description, '
+                    'location, attendees, body) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    (cal_id, item['id'], _instant(item, 'start'),
+                     _instant(item, 'end'), _timestamp(item.get('updated')),
+                     *text, json.dumps(item)),
+                )
+                if self.has_fts:
+                    self._conn.execute(
+                        'INSERT INTO events_fts (rowid, summary, description, '
+                        'location, attendees) VALUES (?, ?, ?, ?, ?)',
+                        (cursor.lastrowid, *text),
+                    )
+            self._conn.execute(
+                'INSERT OR REPLACE INTO calendars (cal_id, sync_token, '
+                'synced_at) VALUES (?, ?, ?)',
+                (cal_id, sync_token, time.time()),
+            )
+
+    def events(
+        self,
+        cal_id: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        text: Optional[str] = None,
+        regex: bool = False,
+    ) -> Iterator[dict[str, Any]]:
+        """Yield the stored raw API events for a calendar, in start order.
+
+        Like timeMin/timeMax for events().list, start and end select events
+        ending after start and starting before end, though all-day events
+        just outside the range may be included too.
+
+        If text is given, only events matching it as a search query (see
+        search.py) are returned. Unless regex is set, this needs has_fts,
+        and each event then has its relevance as 'gcalcli_rank', lower being
+        more relevant.
+        """
+        where = ['events.cal_id = ?']
+        params: list[Any] = [cal_id]
+        if start is not None:
+            where.append('events.ends_at > ?')
+            params.append(start.timestamp() - _ALL_DAY_SLACK)
+        if end is not None:
+            where.append('events.starts_at < ?')
+            params.append(end.timestamp() + _ALL_DAY_SLACK)
+
+        if text is None:
+            query = 'SELECT body FROM events'
+        elif regex:
+            matches = search.regex_matcher(
+                search.parse_query(text, regex=True))
+            query = 'SELECT body, {} FROM events'.format(
+                ', '.join(search.COLUMNS))
+        elif not self.has_fts:
+            raise sqlite3.NotSupportedError('SQLite was built without FTS5')
+        else:
+            weights = ', '.join(map(str, search.COLUMN_WEIGHTS))
+            # CROSS JOIN makes SQLite look up the matches first, rather
+            # than run the full-text query once per event in range.
+            query = (f'SELECT body, bm25(events_fts, {weights}) '
+                     'FROM events_fts CROSS JOIN events '
+                     'ON events.rowid = events_fts.rowid')
+            where.append('events_fts MATCH ?')
+            params.append(search.fts_query(search.parse_query(text)))
+        query += ' WHERE ' + ' AND '.join(where) + ' ORDER BY events.starts_at'
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        if text is None:
+            for (body,) in rows:
+                yield json.loads(body)
+        elif regex:
+            for body, *columns in rows:
+                if matches(columns):
+                    yield json.loads(body)
+        else:
+            for body, rank in rows:
+                item = json.loads(body)
+                item['gcalcli_rank'] = rank
+                yield item
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,117 @@
+"""Busy and free time from freebusy().query, without fetching any events.
+
+The API answers for up to FREEBUSY_MAX_CALENDARS calendars per request with
+each calendar's busy intervals, already merged, so overlapping events within
+one calendar can't be told apart. Everything here works on those intervals:
+merging them across calendars, finding the gaps between them and finding
+where calendars are busy at the same time.
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Iterable, Iterator, Mapping, NamedTuple, Optional
+
+from . import utils
+
+# Calendars per freebusy().query request (the API's calendarExpansionMax).
+FREEBUSY_MAX_CALENDARS = 50
+# The API rejects long time ranges (timeRangeTooLong), so longer ones are
+# queried in windows of this many days.
+FREEBUSY_MAX_DAYS = 60
+
+Interval = tuple[datetime, datetime]
+
+
+class Overlap(NamedTuple):
+    """A time range during which several calendars are all busy."""
+
+    start: datetime
+    end: datetime
+    calendars: list[str]
+
+
+def query_windows(start: datetime, end: datetime) -> Iterator[Interval]:
+    """Split start..end into ranges short enough for a single query."""
+    step = timedelta(days=FREEBUSY_MAX_DAYS)
+    while start < end:
+        yield start, min(start + step, end)
+        start += step
+
+
+def parse_response(
+        response: dict[str, Any]
+) -> tuple[dict[str, list[Interval]], dict[str, list[str]]]:
+    """Return the busy intervals and errors by calendar id in a response."""
+    busy: dict[str, list[Interval]] = {}
+    errors: dict[str, list[str]] = {}
+    for cal_id, info in response.get('calendars', {}).items():
+        if info.get('errors'):
+            errors[cal_id] = [error.get('reason', 'unknown')
+                              for error in info['errors']]
+            continue
+        busy[cal_id] = [(utils.parse_api_time(period['start']),
+                         utils.parse_api_time(period['end']))
+                        for period in info.get('busy', [])]
+    return busy, errors
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> list[Interval]:
+    """Merge overlapping or touching intervals, in chronological order."""
+    merged: list[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def free_intervals(busy: Iterable[Interval], start: datetime,
+                   end: datetime) -> Iterator[Interval]:
+    """Yield the gaps between busy intervals, within start..end."""
+    for busy_start, busy_end in merge_intervals(busy):
+        if busy_end <= start:
+            continue
+        if busy_start >= end:
+            break
+        if busy_start > start:
+            yield start, busy_start
+        start = max(start, busy_end)
+    if start < end:
+        yield start, end
+
+
+def first_free_slot(busy: Iterable[Interval], start: datetime,
+                    end: datetime, duration: timedelta) -> Optional[Interval]:
+    """Return the earliest free slot of length duration, or None."""
+    for free_start, free_end in free_intervals(busy, start, end):
+        if free_end - free_start >= duration:
+            return free_start, free_start + duration
+    return None
+
+
+def find_overlaps(
+        busy_by_calendar: Mapping[str, Iterable[Interval]]
+) -> Iterator[Overlap]:
+    """Yield the ranges where two or more calendars are busy, in order.
+
+    A new range starts whenever the set of busy calendars changes.
+    """
+    # Ends sort before starts at the same time, so touching intervals of
+    # different calendars don't count as overlapping.
+    boundaries = sorted(
+        (instant, is_start, cal_id)
+        for cal_id, intervals in busy_by_calendar.items()
+        for interval_start, interval_end in merge_intervals(intervals)
+        for instant, is_start in ((interval_start, True),
+                                  (interval_end, False)))
+    active: dict[str, None] = {}
+    since = None
+    for instant, is_start, cal_id in boundaries:
+        if since is not None and instant > since and len(active) > 1:
+            yield Overlap(since, instant, list(active))
+        if is_start:
+            active[cal_id] = None
+        else:
+            del active[cal_id]
+        since = instant
@@ -1,8 +1,12 @@
+from bisect import bisect_left
 from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+import atexit
 from csv import DictReader, excel_tab
 from datetime import date, datetime, timedelta
 import functools
-from itertools import chain
+import heapq
+from itertools import accumulate
 import json
 import os
 import pathlib
@@ -10,26 +14,33 @@ import random
 import re
 import shlex
 import shutil
+import subprocess
 import sys
 import textwrap
+import threading
 import time
-from typing import Any, Iterable
-from unicodedata import east_asian_width
+from typing import Any, Iterable, Iterator, Optional
 
 import googleapiclient.http
 from dateutil.parser import parse
 from dateutil.relativedelta import relativedelta
-from dateutil.tz import tzlocal
 from googleapiclient.discovery import build
+from googleapiclient.discovery import build_from_document  # type: ignore
 from googleapiclient.errors import HttpError
 
-from . import actions, auth, config, env, ics, utils
+from . import (actions, auth, config, env, freebusy, ics, search, transport,
+               utils)
 from ._types import Cache, CalendarListEntry, Event
 from .actions import ACTIONS
-from .conflicts import ShowConflicts
-from .details import _valid_title, ACTION_DEFAULT, DETAILS_DEFAULT, HANDLERS
+from .batch import BatchQueue, BatchResult, is_rate_limit_error
+from .cache import CacheStore
+from .conflicts import find_conflicts, ShowConflicts
+from .details import (_valid_title, ACTION_DEFAULT, DETAILS_DEFAULT,
+                      events_list_fields, HANDLERS, tsv_formatter)
+from .eventstore import EventStore
 from .exceptions import GcalcliError
 from .printer import Printer
+from .remind import ReminderSchedule
 from .utils import days_since_epoch, is_all_day
 from .validators import (get_input, get_override_color_id, PARSABLE_DATE,
                          PARSABLE_DURATION, REMINDER, STR_ALLOW_EMPTY,
@@ -40,22 +51,66 @@ try:
 except Exception:
     import pickle
 
+try:
+    from googleapiclient.discovery_cache import get_static_doc
+    from googleapiclient.version import __version__ as googleapiclient_version
+except ImportError:
+    # google-api-python-client < 2.0 doesn't bundle discovery documents.
+    get_static_doc = None  # type: ignore[assignment]
+
 
 EventTitle = namedtuple('EventTitle', ['title', 'color'])
 
 CONFERENCE_DATA_VERSION = 1
+# How long the cached calendar list is used before revalidating it.
+CALENDAR_LIST_TTL = 24 * 60 * 60
+# How often `remind --daemon` refreshes events, and how far ahead it looks
+# with --use-reminders (the API allows reminders up to four weeks before).
+REMIND_REFRESH_MINUTES = 5
+REMIND_MAX_OVERRIDE_MINUTES = 4 * 7 * 24 * 60
+REMIND_MAX_SLEEP_SECONDS = 60
+# Number of TSV rows written to stdout at a time.
+TSV_WRITE_ROWS = 1000
 PRINTER = Printer()
 
 
+@functools.lru_cache(maxsize=4096)
+def _word_breaks(string):
+    """Measure the places a calendar cell can wrap string between words.
+
+    Returns the words of string and, for each word i:
+      - the width to compare against the day width to tell whether word i
+        still fits on the line,
+      - the width of words[:i + 1] joined by single spaces,
+      - the length of words[:i] joined by single spaces, i.e. where to cut
+        before word i.
+    All of them are nondecreasing, so they can be bisected.
+    """
+    words = tuple(string.split())
+    word_lens = [utils.display_widths(word)[-1] for word in words]
+    line_widths = tuple(
+        accumulate(word_len + (i > 0) for i, word_len in enumerate(word_lens)))
+    fits = tuple(width - (i > 0) for i, width in enumerate(line_widths))
+    cut_idxs = tuple(accumulate(
+        (len(word) + (i > 0) for i, word in enumerate(words[:-1])),
+        initial=0))
+    return words, fits, line_widths, cut_idxs
+
+
 class GoogleCalendarInterface:
     cache: Cache = {}
     all_cals: list[CalendarListEntry] = []
-    now = datetime.now(tzlocal())
+    now = datetime.now(utils.local_tz())
     agenda_length = 5
     conflicts_lookahead_days = 30
+    freebusy_lookahead_days = 7
     max_retries = 5
     credentials: Any = None
     cal_service: Any = None
+    http: Any = None
+    event_store: EventStore | None = None
+    # Background revalidation of a stale cached calendar list, if any.
+    _revalidation: threading.Thread | None = None
     # Special override to bypass all auth and defer the auth-related failures
     # as late as possible, for testing.
     userless_mode: bool = False
@@ -65,7 +120,7 @@ class GoogleCalendarInterface:
     ACCESS_READER = 'reader'
     ACCESS_FREEBUSY = 'freeBusyReader'
 
-    UNIWIDTH = {'W': 2, 'F': 2, 'N': 1, 'Na': 1, 'H': 1, 'A': 1}
+    UNIWIDTH = utils.UNIWIDTH
 
     def __init__(
         self,
@@ -135,19 +190,22 @@ class GoogleCalendarInterface:
     def _retry_with_backoff(self, method: googleapiclient.http.HttpRequest):
         for n in range(self.max_retries):
             try:
-                return method.execute()
+                return method.execute(http=self.http)
             except HttpError as e:
-                error = json.loads(e.content)
-                error = error.get('error')
-                if error.get('code') == '403' and \
-                        error.get('errors')[0].get('reason') \
-                        in ['rateLimitExceeded', 'userRateLimitExceeded']:
+                if is_rate_limit_error(e):
                     time.sleep((2 ** n) + random.random())
                 else:
                     raise
 
         return None
 
+    def new_batch_http_request(self, callback):
+        return self.get_cal_service().new_batch_http_request(
+            callback=callback)
+
+    def _execute_batch(self, batch: googleapiclient.http.BatchHttpRequest):
+        batch.execute(http=self.http)
+
     @functools.cache
     def data_file_path(self, name: str) -> pathlib.Path:
         paths = env.data_file_paths(name, self.options.get('config_folder'))
@@ -244,8 +302,8 @@ class GoogleCalendarInterface:
                             bak=utils.shorten_path(backup_filepath),
                         ))
                     oauth_filepath.rename(backup_filepath)
-                cache_filepath = self.data_file_path('cache')
-                cache_filepath.unlink(missing_ok=True)
+                for name in ('cache', 'events'):
+                    self.data_file_path(name).unlink(missing_ok=True)
                 self.credentials = None
             else:  # n, abort without refreshing
                 self.printer.msg('Aborting, keeping existing credentials...')
@@ -308,58 +366,159 @@ class GoogleCalendarInterface:
 
     def get_cal_service(self):
         if not self.cal_service and not self.userless_mode:
-            self.cal_service = build(
-                serviceName='calendar',
-                version='v3',
-                credentials=self._google_auth(),
-            )
+            document = self._get_discovery_document()
+            if document:
+                self.cal_service = build_from_document(
+                    document, http=self._get_http())
+            else:
+                self.cal_service = build(
+                    serviceName='calendar',
+                    version='v3',
+                    http=self._get_http(),
+                )
 
         return self.cal_service
 
+    def _get_http(self) -> transport.SessionHttp:
+        if self.http is None:
+            self.http = transport.SessionHttp(self._google_auth())
+            if env.debug_enabled():
+                atexit.register(self._report_connection_stats)
+        return self.http
+
+    def _report_connection_stats(self):
+        stats = self.http.connection_stats()
+        if stats.requests:
+            self.printer.debug_msg(
+                f'Sent {stats.requests} HTTP requests over '
+                f'{stats.connections} connections '
+                f'({stats.reused} reused)\n')
+
+    def _get_discovery_document(self) -> dict[str, Any] | None:
+        """Return the parsed Calendar API discovery document, if available.
+
+        The document bundled with googleapiclient is cached pre-parsed in the
+        data dir, keyed on the library version, since unpickling it is about
+        twice as fast as parsing the JSON on every run.
+        """
+        if get_static_doc is None:
+            return None
+
+        cache_path = self.data_file_path('discovery')
+        if cache_path:
+            try:
+                with cache_path.open('rb') as _cache_:
+                    version, document = pickle.load(_cache_)
+                if version == googleapiclient_version:
+                    return document
+            except (OSError, EOFError, ValueError, TypeError,
+                    pickle.UnpicklingError):
+                pass
+
+        document_json = get_static_doc('calendar', 'v3')
+        if document_json is None:
+            return None
+        document = json.loads(document_json)
+
+        if cache_path:
+            # Write to a temporary file first so concurrent gcalcli processes
+            # never read a partially written cache.
+            tmp_path = cache_path.with_name(
+                f'{cache_path.name}.{os.getpid()}.tmp')
+            try:
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                with tmp_path.open('wb') as _cache_:
+                    pickle.dump((googleapiclient_version, document), _cache_)
+                tmp_path.replace(cache_path)
+            except OSError as e:
+                self.printer.debug_msg(
+                    f'Failed to cache discovery document: {e}\n')
+        return document
+
     def get_events(self):
         return self.get_cal_service().events()
 
+    def get_freebusy(self):
+        return self.get_cal_service().freebusy()
+
     def _get_cached(self):
         cache_path = self.data_file_path('cache')
 
         if self.options['refresh_cache']:
             cache_path.unlink(missing_ok=True)
+            self.data_file_path('events').unlink(missing_ok=True)
 
         self.cache = {}
         self.all_cals = []
+        store = CacheStore(cache_path if self.options['use_cache'] else None)
 
-        if self.options['use_cache']:
-            # note that we need to use pickle for cache data since we stuff
-            # various non-JSON data in the runtime storage structures
-            try:
-                with cache_path.open('rb') as _cache_:
-                    self.cache = pickle.load(_cache_)
-                    self.all_cals = self.cache['all_cals']
-                # XXX assuming data is valid, need some verification check here
-                return
-            except IOError:
-                pass
-                # fall through
-
+        entry = store.get('all_cals')
+        if entry is None and self.options.get('offline'):
+            raise GcalcliError(
+                'No cached calendar list, run once without --offline.')
+        if entry is None:
+            self.all_cals, etag = self._list_calendars()
+            store.put('all_cals', self.all_cals, CALENDAR_LIST_TTL, etag=etag)
+            store.save()
+        else:
+            self.all_cals = entry.value
+            if entry.is_stale() and not self.options.get('offline'):
+                # Keep going with the stale list, which is almost always still
+                # right, and pick up any changes on the next run. Exiting
+                # doesn't wait for the request; the cache is written
+                # atomically, so at worst the update is lost.
+                self.get_cal_service()
+                self._revalidation = threading.Thread(
+                    target=self._revalidate_calendar_list,
+                    args=(store, entry.etag),
+                    name='revalidate-calendar-list', daemon=True)
+                self._revalidation.start()
+        self.cache['all_cals'] = self.all_cals
+
+    def _list_calendars(self, etag=None):
+        """Fetch the calendar list, sorted by access role.
+
+        Returns the calendars together with the list's etag, or None if etag
+        was given and the list hasn't changed since.
+        """
+        all_cals = []
+        new_etag = None
         page_token = None
         while True:
-            cal_list = self._retry_with_backoff(
-                self.get_cal_service().calendarList().list(
-                    pageToken=page_token)
-            )
+            request = self.get_cal_service().calendarList().list(
+                pageToken=page_token)
+            if etag and not page_token:
+                request.headers['If-None-Match'] = etag
+            try:
+                cal_list = self._retry_with_backoff(request)
+            except HttpError as e:
+                if e.resp.status == 304:
+                    return None
+                raise
 
-            self.all_cals.extend(cal_list['items'])
+            if not page_token:
+                new_etag = cal_list.get('etag')
+            all_cals.extend(cal_list['items'])
             page_token = cal_list.get('nextPageToken')
             if not page_token:
                 break
 
-        self.all_cals.sort(key=lambda x: x['accessRole'])
+        all_cals.sort(key=lambda x: x['accessRole'])
+        return all_cals, new_etag
 
-        if self.options['use_cache']:
-            self.cache['all_cals'] = self.all_cals
-            cache_path.parent.mkdir(parents=True, exist_ok=True)
-            with cache_path.open('wb') as _cache_:
-                pickle.dump(self.cache, _cache_)
+    def _revalidate_calendar_list(self, store: CacheStore, etag):
+        try:
+            result = self._list_calendars(etag=etag)
+        except Exception as e:
+            self.printer.debug_msg(
+                f'Failed to revalidate cached calendar list: {e}\n')
+            return
+        if result is None:
+            store.touch('all_cals')
+        else:
+            all_cals, new_etag = result
+            store.put('all_cals', all_cals, CALENDAR_LIST_TTL, etag=new_etag)
+        store.save()
 
     def _calendar_color(self, event, override_color=False):
         ansi_codes = {
@@ -432,6 +591,12 @@ class GoogleCalendarInterface:
                                                         'method': m})
         return event
 
+    def _all_day_end(self, event):
+        # NOTE(slwaqo): in allDay events end date is always set as day+1 and
+        # hour 0:00 so to not display it one day more, it's necessary to
+        # lower it by one day
+        return event['e'] - timedelta(days=1)
+
     def _get_week_events(self, start_dt, end_dt, event_list):
         week_events = [[] for _ in range(7)]
 
@@ -446,10 +611,7 @@ class GoogleCalendarInterface:
 
             event_end_date = event['e']
             if event_allday:
-                # NOTE(slwaqo): in allDay events end date is always set as
-                # day+1 and hour 0:00 so to not display it one day more, it's
-                # necessary to lower it by one day
-                event_end_date = event['e'] - timedelta(days=1)
+                event_end_date = self._all_day_end(event)
 
             event_is_today = self._event_time_in_range(
                     event['s'], start_dt, end_dt
@@ -526,37 +688,32 @@ class GoogleCalendarInterface:
         # us the info we want.  Date string were coming in as `str` type
         # so we convert them to unicode and then check their size. Fixes
         # the output issues we were seeing around non-US locale strings
-        return sum(
-                self.UNIWIDTH[east_asian_width(char)] for char in string
-        )
+        return utils.display_widths(string)[-1]
 
     def _word_cut(self, word):
-        stop = 0
-        for i, char in enumerate(word):
-            stop += self._printed_len(char)
-            if stop >= self.width['day']:
-                return stop, i + 1
+        # First prefix of the word at least a day wide.
+        widths = utils.display_widths(word)
+        stop = bisect_left(widths, self.width['day'], lo=1)
+        if stop < len(widths):
+            return widths[stop], stop
 
     def _next_cut(self, string):
-        print_len = 0
+        words, fits, line_widths, cut_idxs = _word_breaks(string)
+        if not words:
+            return (0, 0)
 
-        words = string.split()
-        word_lens = []
-        for i, word in enumerate(words):
-            word_lens.append(self._printed_len(word))
+        # i is the first word that doesn't fit on the line anymore.
+        i = bisect_left(fits, self.width['day'])
+        if i == len(words):
+            # Everything fits, which _get_cut_index rules out.
+            return (line_widths[-1], cut_idxs[-1])
 
-            if (word_lens[-1] + print_len) >= self.width['day']:
-                # this many words is too many, try to cut at the prev word
-                cut_idx = len(' '.join(words[:i]))
+        # first word is too long, we must cut inside it
+        if i == 0:
+            return self._word_cut(words[0])
 
-                # first word is too long, we must cut inside it
-                if cut_idx == 0:
-                    return self._word_cut(word)
-
-                return (print_len, cut_idx)
-            print_len = sum(word_lens) + i  # +i for the space between words
-
-        return (print_len, len(' '.join(words[:i])))
+        # this many words is too many, cut at the prev word
+        return (line_widths[i - 1], cut_idxs[i])
 
     def _get_cut_index(self, event_string):
         print_len = self._printed_len(event_string)
@@ -580,8 +737,12 @@ class GoogleCalendarInterface:
 
         color_border = self.options['color_border']
 
-        while (len(event_list) and event_list[0]['s'] < start_datetime):
-            event_list = event_list[1:]
+        # event_list is sorted by start, so each week's events are a slice
+        # found by bisecting the start times.
+        starts = [event['s'] for event in event_list]
+        week_lo = bisect_left(starts, start_datetime)
+        # All-day events from earlier weeks that may continue into the next.
+        spanning = []
 
         day_width_line = self.width['day'] * self.printer.art['hrz']
         # Get the localized day names... January 1, 2001 was a Monday
@@ -672,9 +833,20 @@ class GoogleCalendarInterface:
             self.printer.art_msg('vrt', color_border)
             self.printer.msg('\n')
 
+            week_hi = bisect_left(starts, end_week_datetime, week_lo)
+            week_list = event_list[week_lo:week_hi]
+            spanning = [
+                event for event in spanning
+                if self._all_day_end(event) >= start_week_datetime]
             week_events = self._get_week_events(
-                    start_week_datetime, end_week_datetime, event_list
+                    start_week_datetime, end_week_datetime,
+                    spanning + week_list
             )
+            spanning.extend(
+                event for event in week_list
+                if is_all_day(event)
+                and self._all_day_end(event) >= end_week_datetime)
+            week_lo = week_hi
 
             # get date range objects for the next week
             start_week_datetime = end_week_datetime
@@ -728,26 +900,25 @@ class GoogleCalendarInterface:
         keys = set(self.details.keys())
         keys.update(DETAILS_DEFAULT)
 
-        handlers = [handler
-                    for key, handler in HANDLERS.items()
-                    if key in keys]
-
-        header_row = chain.from_iterable(handler.fieldnames
-                                         for handler in handlers)
-        print(*header_row, sep='\t')
+        header, format_row = tsv_formatter(keys)
+        write = sys.stdout.write
+        write(header + '\n')
 
+        rows = []
         for event in event_list:
             if self.options['ignore_started'] and (event['s'] < self.now):
                 continue
             if self.options['ignore_declined'] and self._DeclinedEvent(event):
                 continue
 
-            row = []
-            for handler in handlers:
-                row.extend(handler.get(event))
-
-            output = ('\t'.join(row)).replace('\n', r'\n')
-            print(output)
+            rows.append(format_row(event))
+            if len(rows) == TSV_WRITE_ROWS:
+                rows.append('')
+                write('\n'.join(rows))
+                rows = []
+        if rows:
+            rows.append('')
+            write('\n'.join(rows))
 
     def _json(self, start_datetime, event_list):
         keys = set(self.details.keys())
@@ -762,12 +933,7 @@ class GoogleCalendarInterface:
             if self.options['ignore_declined'] and self._DeclinedEvent(event):
                 continue
 
-            row = {}
-            #row['raw'] = event
-
-            for key in keys:
-                if key in HANDLERS:
-                    row[key] = HANDLERS[key].data(event)
+            row = self._json_row(event, keys)
 
             if not first:
                 print(",")
@@ -776,6 +942,57 @@ class GoogleCalendarInterface:
 
         print("]")
 
+    def _ndjson(self, start_datetime, event_list):
+        keys = set(self.details.keys())
+        keys.update(DETAILS_DEFAULT)
+
+        for event in event_list:
+            if self.options['ignore_started'] and (event['s'] < self.now):
+                continue
+            if self.options['ignore_declined'] and self._DeclinedEvent(event):
+                continue
+
+            print(json.dumps(self._json_row(event, keys), default=str))
+
+    def _json_row(self, event, keys):
+        row = {}
+        #row['raw'] = event
+
+        for key in keys:
+            if key in HANDLERS:
+                row[key] = HANDLERS[key].data(event)
+        return row
+
+    def _conflicts_json(self, event_list):
+        keys = set(self.details.keys())
+        keys.update(DETAILS_DEFAULT)
+
+        events = (
+            event for event in event_list
+            if not (self.options['ignore_started'] and event['s'] < self.now)
+            and not (self.options['ignore_declined']
+                     and self._DeclinedEvent(event))
+        )
+
+        print("[")
+
+        first = True
+        for cluster in find_conflicts(events):
+            report = {
+                'start': cluster.start.isoformat(),
+                'end': cluster.end.isoformat(),
+                'events': [self._json_row(event, keys)
+                           for event in cluster.events],
+                'pairs': cluster.pairs,
+            }
+
+            if not first:
+                print(",")
+            first = False
+            print(json.dumps(report, default=str))
+
+        print("]")
+
     def _PrintEvent(self, event, prefix):
 
         def _format_descr(descr, indent, box):
@@ -998,8 +1215,9 @@ class GoogleCalendarInterface:
         event_id = event['id']
 
         if self.expert:
-            self.delete(cal_id, event_id)
-            self.printer.msg('Deleted!\n', 'red')
+            self._mutations.add(
+                self.get_events().delete(calendarId=cal_id, eventId=event_id),
+                key=('Deleted', event))
             return
 
         self.printer.msg('Delete? [N]o [y]es [q]uit: ', 'magenta')
@@ -1068,15 +1286,16 @@ class GoogleCalendarInterface:
                     if k in event:
                         mod_event[k] = event[k]
 
-                self._retry_with_backoff(
+                self._mutations.add(
                     self.get_events()
                         .patch(
                             calendarId=event['gcalcli_cal']['id'],
                             eventId=event['id'],
                             body=mod_event
-                        )
+                        ),
+                    key=('Saved', event)
                 )
-                self.printer.msg('Saved!\n', 'red')
+                self.printer.msg('Queued to save!\n', 'red')
                 return
 
             elif not val or val.lower() == 'q':
@@ -1191,69 +1410,267 @@ class GoogleCalendarInterface:
 
         return selected
 
-    def _GetAllEvents(self, cal, start, end, search_text) -> Iterable[Event]:
+    def _decode_event(self, cal, item, end,
+                      include_deleted=False) -> Optional[Event]:
+        """Wrap a raw API event as an Event, or return None to skip it."""
+        if 'status' in item and item['status'] == 'cancelled':
+            if not include_deleted:
+                return None
+            # Deleted instances of recurring events may only have the start
+            # time they originally had.
+            if 'start' not in item:
+                if 'originalStartTime' not in item:
+                    return None
+                item = dict(item, start=item['originalStartTime'])
+            if 'end' not in item:
+                item = dict(item, end=item['start'])
+
+        if 'dateTime' in item['start']:
+            start = utils.parse_api_time(item['start']['dateTime'])
+        else:
+            # all date events
+            start = utils.parse_api_time(item['start']['date'])
+
+        if 'dateTime' in item['end']:
+            event_end = utils.parse_api_time(item['end']['dateTime'])
+        else:
+            # all date events
+            event_end = utils.parse_api_time(item['end']['date'])
+
+        # For all-day events, Google seems to assume that the event
+        # time is based in the UTC instead of the local timezone.  Here
+        # we filter out those events start beyond a specified end time.
+        if end and (start >= end):
+            return None
+
+        # http://en.wikipedia.org/wiki/Year_2038_problem
+        # Catch the year 2038 problem here as the python dateutil
+        # module can choke throwing a ValueError exception. If either
+        # the start or end time for an event has a year '>= 2038' dump
+        # it.
+        if start.year >= 2038 or event_end.year >= 2038:
+            return None
+
+        return Event(item, s=start, e=event_end, gcalcli_cal=cal)
+
+    def _GetAllEvents(self, cal, start, end, search_text,
+                      fields=None, ordered=False,
+                      updated_min=None) -> Iterable[Event]:
+        """Yield a calendar's events, fetching pages as they're consumed.
+
+        If ordered is set, events are yielded in order of start. If
+        updated_min is set, only events changed since are yielded, including
+        deleted ones (with status 'cancelled').
+        """
+        if updated_min is None and self._use_event_store(search_text):
+            stored = self._GetStoredEvents(cal, start, end, search_text)
+            if ordered:
+                stored = sorted(stored, key=lambda x: x['s'])
+            yield from stored
+            return
+
+        # Whether the server filters by updated_min, see below.
+        server_updated_min = updated_min
         pageToken = None
         while True:
-            events = self._retry_with_backoff(
-                    self.get_events()
-                    .list(
-                        calendarId=cal['id'],
-                        timeMin=start.isoformat() if start else None,
-                        timeMax=end.isoformat() if end else None,
-                        q=search_text if search_text else None,
-                        singleEvents=True,
-                        pageToken=pageToken)
-                    )
-            for event in events.get('items', []):
-
-                event['gcalcli_cal'] = cal
+            try:
+                events = self._retry_with_backoff(
+                        self.get_events()
+                        .list(
+                            calendarId=cal['id'],
+                            timeMin=start.isoformat() if start else None,
+                            timeMax=end.isoformat() if end else None,
+                            q=search_text if search_text else None,
+                            singleEvents=True,
+                            orderBy='startTime' if ordered else None,
+                            updatedMin=(server_updated_min.isoformat()
+                                        if server_updated_min else None),
+                            showDeleted=True if updated_min else None,
+                            fields=fields,
+                            pageToken=pageToken)
+                        )
+            except HttpError as e:
+                if (e.resp.status != 410 or server_updated_min is None
+                        or pageToken):
+                    raise
+                # updatedMinTooLongAgo: list everything and filter here.
+                self.printer.debug_msg(
+                    f"Updates since {updated_min} are too old to filter on "
+                    f"the server for {cal['summary']}, filtering locally...\n"
+                )
+                server_updated_min = None
+                continue
 
-                if 'status' in event and event['status'] == 'cancelled':
+            for item in events.get('items', []):
+                if (updated_min and not server_updated_min
+                        and 'updated' in item
+                        and utils.parse_api_time(item['updated'])
+                        < updated_min):
                     continue
+                event = self._decode_event(
+                    cal, item, end, include_deleted=updated_min is not None)
+                if event is not None:
+                    yield event
 
-                if 'dateTime' in event['start']:
-                    event['s'] = parse(event['start']['dateTime'])
-                else:
-                    # all date events
-                    event['s'] = parse(event['start']['date'])
+            pageToken = events.get('nextPageToken')
+            if not pageToken:
+                break
 
-                event['s'] = utils.localize_datetime(event['s'])
+    def _get_event_store(self) -> EventStore:
+        if self.event_store is None:
+            self.event_store = EventStore(self.data_file_path('events'))
+        return self.event_store
+
+    def _use_event_store(self, search_text=None):
+        """Whether to answer event queries from the local event store."""
+        # Searches the API can't do are always answered locally.
+        local_search = isinstance(search_text, str) and bool(
+            self.options.get('regex') or self.options.get('rank')
+            or search.has_field_filters(search_text))
+        if not (local_search
+                or self.options.get('sync_events')
+                or self.options.get('offline')
+                or self.options.get('max_staleness') is not None):
+            return False
+        if (not search_text or self.options.get('regex')
+                or self._get_event_store().has_fts):
+            return True
+        if local_search or self.options.get('offline'):
+            raise GcalcliError(
+                'Searching the local event store needs SQLite with FTS5 '
+                'support.')
+        return False
+
+    def _sync_due(self, cal) -> bool:
+        """Whether to sync a calendar before reading it from the store."""
+        synced_at = self._get_event_store().synced_at(cal['id'])
+        if self.options.get('offline'):
+            if synced_at is None:
+                raise GcalcliError(
+                    f"No events stored for {cal['summary']}, run once "
+                    'without --offline to sync them.')
+            return False
+        max_staleness = self.options.get('max_staleness')
+        if max_staleness is None or synced_at is None:
+            return True
+        return time.time() - synced_at > max_staleness
 
-                if 'dateTime' in event['end']:
-                    event['e'] = parse(event['end']['dateTime'])
-                else:
-                    # all date events
-                    event['e'] = parse(event['end']['date'])
+    def _sync_events(self, cal):
+        """Bring the local event store for a calendar up to date.
+
+        Uses the calendar's stored sync token to fetch only changes since the
+        last sync, falling back to a full listing on first use or when the
+        server reports the token as expired.
+        """
+        store = self._get_event_store()
+        sync_token = store.sync_token(cal['id'])
+        items: list[dict[str, Any]] = []
+        page_token = None
+        while True:
+            try:
+                events = self._retry_with_backoff(
+                    self.get_events()
+                    .list(
+                        calendarId=cal['id'],
+                        singleEvents=True,
+                        syncToken=sync_token,
+                        pageToken=page_token)
+                )
+            except HttpError as e:
+                if e.resp.status != 410 or sync_token is None:
+                    raise
+                # Sync token expired or invalidated, start over from scratch.
+                self.printer.debug_msg(
+                    f"Sync token expired for {cal['summary']}, running a "
+                    'full sync...\n'
+                )
+                store.reset(cal['id'])
+                sync_token = None
+                items = []
+                page_token = None
+                continue
 
-                event['e'] = utils.localize_datetime(event['e'])
+            items.extend(events.get('items', []))
+            page_token = events.get('nextPageToken')
+            if not page_token:
+                break
 
-                # For all-day events, Google seems to assume that the event
-                # time is based in the UTC instead of the local timezone.  Here
-                # we filter out those events start beyond a specified end time.
-                if end and (event['s'] >= end):
-                    continue
+        if sync_token is None:
+            # Full listing, drop anything left over from a partial store.
+            store.reset(cal['id'])
+        store.apply(cal['id'], items, events.get('nextSyncToken'))
+
+    def _GetStoredEvents(self, cal, start, end,
+                         search_text=None) -> Iterable[Event]:
+        if self._sync_due(cal):
+            self._sync_events(cal)
+        for item in self._get_event_store().events(
+                cal['id'], start=start, end=end, text=search_text or None,
+                regex=bool(self.options.get('regex'))):
+            event = self._decode_event(cal, item, end)
+            if event is None:
+                continue
+            # Apply the same range semantics as timeMin/timeMax on the server.
+            if start and event['e'] <= start:
+                continue
+            yield event
 
-                # http://en.wikipedia.org/wiki/Year_2038_problem
-                # Catch the year 2038 problem here as the python dateutil
-                # module can choke throwing a ValueError exception. If either
-                # the start or end time for an event has a year '>= 2038' dump
-                # it.
-                if event['s'].year >= 2038 or event['e'].year >= 2038:
-                    continue
+    def _get_sorted_events(self, cal, start, end, search_text,
+                           fields=None, updated_min=None) -> list[Event]:
+        return sorted(
+            self._GetAllEvents(cal, start, end, search_text=search_text,
+                               fields=fields, updated_min=updated_min),
+            key=lambda x: x['s'])
 
-                yield event
+    def _search_for_events(self, start, end, search_text, fields=None,
+                           updated_min=None):
+        """Return events from all selected calendars, sorted by start.
 
-            pageToken = events.get('nextPageToken')
-            if not pageToken:
-                break
+        If given, fields is a partial response mask for events().list (see
+        _display_fields), which is only safe when the events are just
+        printed and not modified.
 
-    def _search_for_events(self, start, end, search_text):
-        event_list = []
-        for cal in self.cals:
-            event_list.extend(
-                self._GetAllEvents(cal, start, end, search_text=search_text))
-        event_list.sort(key=lambda x: x['s'])
-        return event_list
+        If given, updated_min maps calendar ids to the time since which to
+        return changed events (see _GetAllEvents).
+        """
+        def get_sorted_events(cal):
+            return self._get_sorted_events(
+                cal, start, end, search_text, fields,
+                updated_min=updated_min and updated_min[cal['id']])
+
+        max_workers = min(self.options.get('max_concurrency') or 1,
+                          len(self.cals))
+        if max_workers <= 1:
+            streams = [get_sorted_events(cal) for cal in self.cals]
+        else:
+            # Set up shared state up front instead of racing in the workers.
+            if not self.options.get('offline'):
+                self.get_cal_service()
+            if not updated_min and self._use_event_store(search_text):
+                self._get_event_store()
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                streams = list(executor.map(get_sorted_events, self.cals))
+        return list(heapq.merge(*streams, key=lambda x: x['s']))
+
+    def _stream_events(self, start, end, search_text,
+                       fields=None) -> Iterator[Event]:
+        """Yield events from all selected calendars as they're fetched.
+
+        Like _search_for_events, but the server sorts each calendar's events
+        so they can be merged lazily, one page per calendar at a time,
+        instead of collecting every event first.
+        """
+        return heapq.merge(
+            *(self._GetAllEvents(cal, start, end, search_text,
+                                 fields=fields, ordered=True)
+              for cal in self.cals),
+            key=lambda x: x['s'])
+
+    def _display_fields(self):
+        """Partial response mask covering the event details shown."""
+        return events_list_fields(
+            self.details,
+            include_attendance=self.options.get('ignore_declined', False))
 
     def _DeclinedEvent(self, event):
         return any(a['responseStatus'] == 'declined'
@@ -1284,50 +1701,238 @@ class GoogleCalendarInterface:
             )
 
     def _display_queried_events(self, start, end, search=None,
-                                year_date=False):
-        event_list = self._search_for_events(start, end, search)
+                                year_date=False, rank=False):
+        if self.options.get('ndjson') and not rank:
+            return self._ndjson(start, self._stream_events(
+                start, end, search, fields=self._display_fields()))
+
+        event_list = self._search_for_events(
+            start, end, search, fields=self._display_fields())
+        if rank:
+            event_list.sort(key=lambda x: x['gcalcli_rank'])
 
         if self.options.get('tsv'):
             return self._tsv(start, event_list)
         elif self.options.get('json'):
             return self._json(start, event_list)
+        elif self.options.get('ndjson'):
+            return self._ndjson(start, event_list)
         else:
-            return self._iterate_events(start, event_list, year_date=year_date)
+            with self.printer.buffered():
+                return self._iterate_events(
+                    start, event_list, year_date=year_date)
 
     def TextQuery(self, search_text='', start=None, end=None):
         if not search_text:
             # the empty string would get *ALL* events...
             raise GcalcliError('Search text is required.')
 
-        return self._display_queried_events(start, end, search_text, True)
+        rank = bool(self.options.get('rank'))
+        if rank and self.options.get('regex'):
+            raise GcalcliError('--rank cannot be combined with --regex.')
+
+        return self._display_queried_events(
+            start, end, search_text, True, rank=rank)
 
-    def UpdatesQuery(self, last_updated_datetime, start=None, end=None):
+    def _updates_watermarks(self) -> CacheStore:
+        """Store of when `updates --since-last-run` last ran, by calendar."""
+        return CacheStore(self.data_file_path('updates'))
+
+    def UpdatesQuery(self, last_updated_datetime=None, start=None, end=None,
+                     since_last_run=False):
+        """Show events changed or deleted since last_updated_datetime.
+
+        With since_last_run, changes since the previous such run are shown
+        instead, tracked separately for each calendar.
+        """
         if not start:
             start = self.now.replace(hour=0, minute=0, second=0, microsecond=0)
 
         if not end:
             end = (start + relativedelta(months=+1)).replace(day=1)
 
-        event_list = self._search_for_events(start, end, None)
-        event_list = [e for e in event_list
-                      if (utils.get_time_from_str(e['updated']) >=
-                          last_updated_datetime)]
+        run_started = datetime.now(utils.local_tz())
+        watermarks = self._updates_watermarks() if since_last_run else None
+        since = {}
+        for cal in self.cals:
+            if watermarks is None:
+                since[cal['id']] = utils.localize_datetime(
+                    last_updated_datetime)
+                continue
+            entry = watermarks.get(f"since:{cal['id']}")
+            # The first run only records where to start from.
+            since[cal['id']] = (datetime.fromisoformat(entry.value)
+                                if entry else run_started)
+
+        event_list = self._search_for_events(
+            start, end, None, updated_min=since)
+        for event in event_list:
+            if event.get('status') == 'cancelled':
+                event['summary'] = f'(deleted) {_valid_title(event)}'
+
+        if watermarks is not None:
+            for cal in self.cals:
+                watermarks.put(f"since:{cal['id']}", run_started.isoformat(),
+                               float('inf'))
+            watermarks.save()
+
         print('Updates since:',
-              last_updated_datetime,
+              min(since.values(), default=run_started),
               'events starting',
               start,
               'until',
               end)
         return self._iterate_events(start, event_list, year_date=False)
 
-    def ConflictsQuery(self, search_text='', start=None, end=None):
+    def _query_freebusy(self, start,
+                        end) -> dict[str, list[freebusy.Interval]]:
+        """Return the merged busy intervals of each selected calendar.
+
+        Calendars the API has no free/busy information for are reported and
+        left out.
+        """
+        if self.options.get('offline'):
+            raise GcalcliError('Free/busy queries need the API, they '
+                               'can\'t be run --offline.')
+
+        busy: dict[str, list[freebusy.Interval]] = {
+            cal['id']: [] for cal in self.cals}
+        errors: dict[str, list[str]] = {}
+        cal_ids = list(busy)
+        for window_start, window_end in freebusy.query_windows(start, end):
+            for i in range(0, len(cal_ids), freebusy.FREEBUSY_MAX_CALENDARS):
+                batch = cal_ids[i:i + freebusy.FREEBUSY_MAX_CALENDARS]
+                response = self._retry_with_backoff(
+                    self.get_freebusy().query(body={
+                        'timeMin': window_start.isoformat(),
+                        'timeMax': window_end.isoformat(),
+                        'items': [{'id': cal_id} for cal_id in batch],
+                    }))
+                window_busy, window_errors = freebusy.parse_response(
+                    response or {})
+                for cal_id, intervals in window_busy.items():
+                    busy.setdefault(cal_id, []).extend(intervals)
+                errors.update(window_errors)
+
+        names = {cal['id']: cal['summary'] for cal in self.cals}
+        for cal_id, reasons in errors.items():
+            busy.pop(cal_id, None)
+            self.printer.err_msg(
+                'No free/busy information for {}: {}\n'.format(
+                    names.get(cal_id, cal_id), ', '.join(reasons)))
+        return {cal_id: freebusy.merge_intervals(intervals)
+                for cal_id, intervals in busy.items()}
+
+    def _print_intervals(self, intervals, empty_msg, calendars=None):
+        """Print time intervals, with the calendars involved if given."""
+        if self.options.get('tsv'):
+            print('start_date', 'start_time', 'end_date', 'end_time',
+                  *(['calendars'] if calendars else []), sep='\t')
+            for i, (start, end) in enumerate(intervals):
+                print(start.strftime('%Y-%m-%d\t%H:%M'),
+                      end.strftime('%Y-%m-%d\t%H:%M'),
+                      *([', '.join(calendars[i])] if calendars else []),
+                      sep='\t')
+            return
+
+        rows = []
+        for i, (start, end) in enumerate(intervals):
+            row = {'start': start.isoformat(), 'end': end.isoformat()}
+            if calendars:
+                row['calendars'] = calendars[i]
+            rows.append(row)
+        if self.options.get('json'):
+            print(json.dumps(rows, indent=2))
+            return
+        if self.options.get('ndjson'):
+            for row in rows:
+                print(json.dumps(row))
+            return
+
+        if not intervals:
+            self.printer.msg(f'\n{empty_msg}\n', 'yellow')
+            return
+
+        military = self.options.get('military')
+        with self.printer.buffered():
+            for i, (start, end) in enumerate(intervals):
+                self.printer.msg(start.strftime('%a %b %d'),
+                                 self.options['color_date'])
+                end_text = utils.agenda_time_fmt(end, military)
+                if end.date() != start.date():
+                    end_text = f"{end.strftime('%a %b %d')} {end_text}"
+                line = '  {:>7} - {}'.format(
+                    utils.agenda_time_fmt(start, military), end_text)
+                if calendars:
+                    line += '  ' + ', '.join(calendars[i])
+                self.printer.msg(line + '\n')
+
+    def FreeBusyQuery(self, start=None, end=None, free=False, slot=None):
+        """Show busy or free time across the selected calendars.
+
+        With slot, only the first time at which all calendars are free for
+        that many minutes is shown.
+        """
+        if not start:
+            start = self.now.replace(second=0, microsecond=0)
+
+        if not end:
+            end = start + timedelta(days=self.freebusy_lookahead_days)
+
+        busy = freebusy.merge_intervals(
+            interval for intervals in self._query_freebusy(start, end).values()
+            for interval in intervals)
+
+        if slot:
+            found = freebusy.first_free_slot(
+                busy, start, end, timedelta(minutes=slot))
+            if found is None:
+                raise GcalcliError(
+                    f'No free slot of {slot} minutes between {start} and '
+                    f'{end}.')
+            return self._print_intervals([found], '')
+
+        if free:
+            return self._print_intervals(
+                list(freebusy.free_intervals(busy, start, end)),
+                'No Free Time Found...')
+        return self._print_intervals(busy, 'No Busy Time Found...')
+
+    def _freebusy_conflicts(self, start, end):
+        """Show when several selected calendars are busy at once."""
+        names = {cal['id']: cal['summary'] for cal in self.cals}
+        overlaps = list(freebusy.find_overlaps(
+            self._query_freebusy(start, end)))
+        return self._print_intervals(
+            [(overlap.start, overlap.end) for overlap in overlaps],
+            'No Conflicts Found...',
+            calendars=[[names[cal_id] for cal_id in overlap.calendars]
+                       for overlap in overlaps])
+
+    def ConflictsQuery(self, search_text='', start=None, end=None,
+                       use_freebusy=False):
+        """Show overlapping events.
+
+        With use_freebusy, only busy times are fetched and compared, which
+        finds overlaps between calendars but not within a single one.
+        """
         if not start:
             start = self.now.replace(hour=0, minute=0, second=0, microsecond=0)
 
         if not end:
             end = (start + timedelta(days=self.conflicts_lookahead_days))
 
-        event_list = self._search_for_events(start, end, search_text)
+        if use_freebusy:
+            if search_text:
+                raise GcalcliError(
+                    'Search text cannot be combined with --freebusy.')
+            return self._freebusy_conflicts(start, end)
+
+        event_list = self._search_for_events(
+            start, end, search_text, fields=self._display_fields())
+        if self.options.get('json'):
+            return self._conflicts_json(event_list)
+
         show_conflicts = ShowConflicts(
                             lambda e: self._PrintEvent(e, '\t !!! Conflict: '))
 
@@ -1352,13 +1957,29 @@ class GoogleCalendarInterface:
             raise GcalcliError('Must specify a single calendar.')
 
         cal = self.cals[0]
+        queue = BatchQueue(self)
 
-        for row in reader:
+        for row_num, row in enumerate(reader, start=1):
             action = row.get('action', ACTION_DEFAULT)
             if action not in ACTIONS:
                 raise GcalcliError('Action "{}" not supported.'.format(action))
 
-            getattr(actions, action)(row, cal, self)
+            request = getattr(actions, action)(row, cal, self)
+            if request is not None:
+                queue.add(request, key=(row_num, action))
+
+        results = queue.flush()
+        failed_cnt = 0
+        for (row_num, action), _, error in results:
+            if error is not None:
+                failed_cnt += 1
+                self.printer.err_msg(
+                    f'Row {row_num}: {action} failed: {error}\n')
+        self.printer.msg(
+            f'Applied {len(results) - failed_cnt} of {len(results)} '
+            'changes\n')
+        if failed_cnt:
+            raise GcalcliError(f'Failed to apply {failed_cnt} changes.')
 
     def CalQuery(self, cmd, start_text='', count=1):
         if not start_text:
@@ -1401,9 +2022,11 @@ class GoogleCalendarInterface:
             if total_days % 7:
                 count += 1
 
-        event_list = self._search_for_events(start, end, None)
+        event_list = self._search_for_events(
+            start, end, None, fields=self._display_fields())
 
-        self._GraphEvents(cmd, start, count, event_list)
+        with self.printer.buffered():
+            self._GraphEvents(cmd, start, count, event_list)
 
     def _prompt_for_calendar(self, cals):
         if not cals:
@@ -1509,8 +2132,23 @@ class GoogleCalendarInterface:
 
         event_list = self._search_for_events(start, end, search_text)
         self.expert = expert
-        return self._iterate_events(
-                self.now, event_list, year_date=True, work=work)
+        # Deletes and saves are sent in batches as events are processed, and
+        # the rest are flushed even if the user quits early.
+        self._mutations = BatchQueue(self)
+        try:
+            return self._iterate_events(
+                    self.now, event_list, year_date=True, work=work)
+        finally:
+            self._report_mutations(self._mutations.flush())
+
+    def _report_mutations(self, results: list[BatchResult]):
+        for (verb, event), _, error in results:
+            title = _valid_title(event).strip()
+            if error is None:
+                self.printer.msg(f'{verb} "{title}"!\n', 'red')
+            else:
+                self.printer.err_msg(
+                    f'Failed to update event "{title}": {error}\n')
 
     def Remind(self, minutes, command, use_reminders=False):
         """
@@ -1542,28 +2180,101 @@ class GoogleCalendarInterface:
                     # don't remind if all reminders haven't arrived yet
                     continue
 
-            if self.options.get('military'):
-                tmp_time_str = event['s'].strftime('%H:%M')
-            else:
-                tmp_time_str = \
-                    event['s'].strftime('%I:%M').lstrip('0') + \
-                    event['s'].strftime('%p').lower()
-
-            message += '%s  %s\n' % \
-                       (tmp_time_str, _valid_title(event).strip())
+            message += self._remind_line(event)
 
         if not message:
             return
 
+        cmd = self._remind_command(command, message)
+
+        pid = os.fork()
+        if not pid:
+            os.execvp(cmd[0], cmd)
+
+    def _remind_line(self, event, late=False):
+        if self.options.get('military'):
+            tmp_time_str = event['s'].strftime('%H:%M')
+        else:
+            tmp_time_str = \
+                event['s'].strftime('%I:%M').lstrip('0') + \
+                event['s'].strftime('%p').lower()
+
+        return '%s  %s%s\n' % (tmp_time_str, _valid_title(event).strip(),
+                               ' (already started)' if late else '')
+
+    def _remind_command(self, command, message):
         cmd = shlex.split(command)
 
         for i, a in zip(range(len(cmd)), cmd):
             if a == '%s':
                 cmd[i] = message
+        return cmd
 
-        pid = os.fork()
-        if not pid:
-            os.execvp(cmd[0], cmd)
+    def RemindDaemon(self, minutes, command, use_reminders=False,
+                     refresh_minutes=REMIND_REFRESH_MINUTES):
+        """Keep running, executing command whenever reminders are due.
+
+        Unlike Remind, which is meant to be run from cron, this keeps the
+        API connection and a schedule of upcoming reminders in memory. The
+        events are refreshed every refresh_minutes using the local event
+        store, so each refresh is a small delta request, and each reminder is
+        sent once, at the time it's due.
+        """
+        # Sync tokens make refreshes incremental (see _sync_events).
+        self.options['sync_events'] = True
+        schedule = ReminderSchedule(minutes, use_reminders)
+        refresh_interval = timedelta(minutes=refresh_minutes)
+        # Look far enough ahead for events whose reminder is due before the
+        # next refresh.
+        lookahead = timedelta(minutes=minutes) + refresh_interval
+        if use_reminders:
+            lookahead = max(
+                lookahead,
+                timedelta(minutes=REMIND_MAX_OVERRIDE_MINUTES)
+                + refresh_interval)
+
+        next_refresh = None
+        try:
+            while True:
+                now = datetime.now(utils.local_tz())
+                # Reminders that came due while asleep (or suspended) go out
+                # before the refresh, which drops events that have started.
+                events = schedule.pop_due(now)
+                if next_refresh is None or now >= next_refresh:
+                    try:
+                        schedule.update(
+                            self._search_for_events(
+                                now, now + lookahead, None),
+                            now)
+                    except Exception as e:
+                        # Keep reminding from the previous schedule, and try
+                        # again at the next refresh.
+                        self.printer.err_msg(
+                            f'Failed to refresh events: {e}\n')
+                    next_refresh = now + refresh_interval
+
+                events += schedule.pop_due(now)
+                if events:
+                    message = ''.join(
+                        self._remind_line(event, late=event['s'] < now)
+                        for event in events)
+                    try:
+                        subprocess.Popen(
+                            self._remind_command(command, message))
+                    except OSError as e:
+                        self.printer.err_msg(
+                            f'Failed to run reminder command: {e}\n')
+
+                wake = next_refresh
+                next_due = schedule.next_due()
+                if next_due is not None and next_due < wake:
+                    wake = next_due
+                # Sleep in bounded steps so suspend or clock changes don't
+                # delay reminders by much.
+                time.sleep(min(max((wake - now).total_seconds(), 0),
+                               REMIND_MAX_SLEEP_SECONDS))
+        except KeyboardInterrupt:
+            return
 
     def _event_should_use_new_import_api(
             self, event: Event, cal: CalendarListEntry
@@ -1619,21 +2330,50 @@ class GoogleCalendarInterface:
             verbose=verbose,
             default_tz=self.cals[0]['timeZone'],
             printer=self.printer)
-        if not dump and any(
-                self._event_should_use_new_import_api(event.body, self.cals[0])
-                for event in ical_data.events):
-            self.printer.msg(
-                '\n'
-                'NOTE: This import will use a new graceful import feature in '
-                'gcalcli to avoid creating duplicate events (see '
-                'https://github.com/insanum/gcalcli/issues/492).\n'
-                'If you see any issues, you can cancel and retry with '
-                '--use-legacy-import to restore the old behavior.\n\n')
-            time.sleep(1)
 
         cal = self.cals[0]
         imported_cnt = 0
         failed_events = []
+
+        def report_result(result):
+            nonlocal imported_cnt
+            event, new_event, e = result
+            if e is None:
+                imported_cnt += 1
+                hlink = new_event.get('htmlLink')
+                self.printer.msg(f'New event added: {hlink}\n', 'green')
+                return
+
+            failed_events.append(event)
+            try:
+                is_skipped_dupe = any(detail.get('reason') == 'duplicate'
+                                      for detail in e.error_details)
+            except Exception:
+                # Fail gracefully so weird error responses don't blow up.
+                is_skipped_dupe = False
+            event_label = event.label_str()
+            if is_skipped_dupe:
+                # TODO: #492 - Offer to force import dupe anyway?
+                self.printer.msg(
+                    f'Skipped duplicate event {event_label}.\n')
+            else:
+                self.printer.err_msg(
+                    f'Failed to import event {event_label}.\n')
+                self.printer.msg(f'Event details: {event.body}\n')
+                self.printer.debug_msg(f'Error details: {e}\n')
+
+        if verbose:
+            # Import each event right after prompting for it.
+            imports = BatchQueue(self, batch_size=1, on_result=report_result)
+        else:
+            # Nothing to wait on between events, so send them in batches,
+            # several at a time.
+            imports = BatchQueue(
+                self,
+                max_workers=self.options.get('max_concurrency') or 1,
+                on_result=report_result)
+
+        shown_import_note = False
         for event in ical_data.events:
             if not event.body:
                 continue
@@ -1641,6 +2381,19 @@ class GoogleCalendarInterface:
             if dump:
                 continue
 
+            use_import_api = self._event_should_use_new_import_api(
+                event.body, cal)
+            if use_import_api and not shown_import_note:
+                self.printer.msg(
+                    '\n'
+                    'NOTE: This import will use a new graceful import feature '
+                    'in gcalcli to avoid creating duplicate events (see '
+                    'https://github.com/insanum/gcalcli/issues/492).\n'
+                    'If you see any issues, you can cancel and retry with '
+                    '--use-legacy-import to restore the old behavior.\n\n')
+                time.sleep(1)
+                shown_import_note = True
+
             self._add_reminders(event.body, reminders)
 
             if not verbose:
@@ -1663,34 +2416,12 @@ class GoogleCalendarInterface:
 
             # Import event
             import_method = (
-                self.get_events().import_ if (
-                    self._event_should_use_new_import_api(event.body, cal))
+                self.get_events().import_ if use_import_api
                 else self.get_events().insert)
-            try:
-                new_event = self._retry_with_backoff(
-                    import_method(calendarId=cal['id'], body=event.body))
-            except HttpError as e:
-                failed_events.append(event)
-                try:
-                    is_skipped_dupe = any(detail.get('reason') == 'duplicate'
-                                          for detail in e.error_details)
-                except Exception:
-                    # Fail gracefully so weird error responses don't blow up.
-                    is_skipped_dupe = False
-                event_label = event.label_str()
-                if is_skipped_dupe:
-                    # TODO: #492 - Offer to force import dupe anyway?
-                    self.printer.msg(
-                        f'Skipped duplicate event {event_label}.\n')
-                else:
-                    self.printer.err_msg(
-                        f'Failed to import event {event_label}.\n')
-                    self.printer.msg(f'Event details: {event.body}\n')
-                    self.printer.debug_msg(f'Error details: {e}\n')
-            else:
-                imported_cnt += 1
-                hlink = new_event.get('htmlLink')
-                self.printer.msg(f'New event added: {hlink}\n', 'green')
+            imports.add(
+                import_method(calendarId=cal['id'], body=event.body),
+                key=event)
+        imports.flush()
 
         self.printer.msg(
             f"Added {imported_cnt} events to calendar {cal['id']}\n"
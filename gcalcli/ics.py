@@ -5,8 +5,9 @@ import importlib.util
 import io
 from datetime import datetime, timedelta
 import pathlib
+import re
 import tempfile
-from typing import Any, NamedTuple, Optional
+from typing import Any, Iterable, Iterator, NamedTuple, Optional
 
 from gcalcli.printer import Printer
 from gcalcli.utils import localize_datetime
@@ -27,7 +28,13 @@ class EventData:
 
 
 class IcalData(NamedTuple):
-    events: list[EventData]
+    """Events parsed lazily from an ics stream.
+
+    raw_components collects the non-event components (e.g. VTIMEZONE) of the
+    calendar as events are consumed, and is only complete once the events
+    iterator has been exhausted.
+    """
+    events: Iterator[EventData]
     raw_components: list[Any]
 
 
@@ -38,27 +45,122 @@ def has_vobject_support() -> bool:
 def get_ics_data(
     ics: io.TextIOBase, verbose: bool, default_tz: str, printer: Printer
 ) -> IcalData:
-    import vobject
-
-    events: list[EventData] = []
     raw_components: list[Any] = []
-    for v in vobject.readComponents(ics):
-        if v.name == 'VCALENDAR' and hasattr(v, 'components'):
-            raw_components.extend(
-                c for c in v.components() if c.name != 'VEVENT'
-            )
-        # Strangely, in empty calendar cases vobject sometimes returns
-        # Components with no vevent_list attribute at all.
-        vevents = getattr(v, 'vevent_list', [])
-        events.extend(
-            CreateEventFromVOBJ(
-                ve, verbose=verbose, default_tz=default_tz, printer=printer
-            )
-            for ve in vevents
-        )
+    events = _iter_events(
+        ics,
+        raw_components,
+        verbose=verbose,
+        default_tz=default_tz,
+        printer=printer,
+    )
     return IcalData(events, raw_components)
 
 
+# TZID parameters of properties, e.g. DTSTART;TZID="Custom/Zone":...
+_TZID_PARAM = re.compile(r';TZID=(?:"([^"]*)"|([^;:]*))', re.IGNORECASE)
+
+
+def _unfold(text: str) -> str:
+    return re.sub(r'\r?\n[ \t]', '', text)
+
+
+def _tzid_refs(text: str) -> set[str]:
+    return {quoted or bare
+            for quoted, bare in _TZID_PARAM.findall(_unfold(text))}
+
+
+def _iter_events(
+    ics: io.TextIOBase,
+    raw_components: list[Any],
+    verbose: bool,
+    default_tz: str,
+    printer: Printer,
+) -> Iterator[EventData]:
+    import vobject
+
+    def parse(text):
+        return next(next(vobject.readComponents(text)).components())
+
+    def create(text):
+        return CreateEventFromVOBJ(
+            parse(text), verbose=verbose, default_tz=default_tz,
+            printer=printer)
+
+    # Each component is parsed wrapped in its own calendar, so only one is
+    # held in memory at a time. vobject resolves TZIDs against the
+    # VTIMEZONEs parsed so far, and RFC 5545 lets a VTIMEZONE follow the
+    # events using it, so events referring to TZIDs not defined yet are
+    # held back until they are (or the input ends, since TZIDs like
+    # "America/New_York" resolve without a VTIMEZONE).
+    defined_tzids: set[str] = set()
+    held: list[tuple[str, set[str]]] = []
+    for name, text in _split_calendar_components(ics):
+        if name == 'VEVENT':
+            missing = _tzid_refs(text) - defined_tzids
+            if missing:
+                held.append((text, missing))
+            else:
+                yield create(text)
+            continue
+
+        component = parse(text)
+        raw_components.append(component)
+        if name != 'VTIMEZONE' or not hasattr(component, 'tzid'):
+            continue
+        defined_tzids.add(component.tzid.value)
+        ready = [text for text, missing in held
+                 if not missing - defined_tzids]
+        held = [(text, missing) for text, missing in held
+                if missing - defined_tzids]
+        for text in ready:
+            yield create(text)
+    for text, _ in held:
+        yield create(text)
+
+
+def _split_calendar_components(
+    lines: Iterable[str],
+) -> Iterator[tuple[str, str]]:
+    """Yield (name, text) for each component directly inside a VCALENDAR.
+
+    The text is the component wrapped in a VCALENDAR with the calendar's own
+    properties seen so far (VERSION, PRODID, etc). Components nested deeper,
+    like VALARMs, stay part of their parent. Anything outside a VCALENDAR is
+    ignored.
+    """
+    header: list[str] = []
+    component: list[str] = []
+    component_name = None
+    depth = 0
+    for line in lines:
+        line = line.rstrip('\r\n')
+        # Folded continuation lines start with whitespace, so can never be
+        # mistaken for BEGIN/END lines here.
+        name, _, value = line.partition(':')
+        name = name.rstrip().upper()
+        if name == 'BEGIN':
+            depth += 1
+            if depth == 1:
+                header = [line]
+                continue
+            if depth == 2:
+                component_name = value.strip().upper()
+        if depth == 1 and name != 'END':
+            header.append(line)
+        elif depth >= 2:
+            component.append(line)
+        if name == 'END' and depth > 0:
+            depth -= 1
+            if (depth == 1 and component_name
+                    and header[0].partition(':')[2].strip().upper()
+                    == 'VCALENDAR'):
+                yield component_name, '\r\n'.join(
+                    header + component + ['END:VCALENDAR', ''])
+            if depth <= 1:
+                component = []
+                component_name = None
+
+
 def CreateEventFromVOBJ(
     ve, verbose: bool, default_tz: str, printer: Printer
 ) -> EventData:
@@ -188,7 +290,7 @@ def CreateEventFromVOBJ(
 
 
 def dump_partial_ical(
-    events: list[EventData], raw_components: list[Any]
+    events: Iterable[EventData], raw_components: list[Any]
 ) -> pathlib.Path:
     import vobject
 
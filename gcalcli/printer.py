@@ -1,4 +1,5 @@
 import argparse
+from contextlib import contextmanager
 import sys
 
 COLOR_NAMES = set(('default', 'black', 'red', 'green', 'yellow', 'blue',
@@ -82,10 +83,58 @@ class Printer(object):
         self.art_style = art_style
         self.art = ART_CHARS[self.art_style]
 
+        # Output collected by buffered(), see there.
+        self._buffer = None
+        self._buffer_file = None
+        self._buffer_color = None
+
     def get_colorcode(self, colorname):
         return self.colors.get(colorname, '')
 
-    def msg(self, msg, colorname='default', file=sys.stdout):
+    @contextmanager
+    def buffered(self, file=None):
+        """Collect messages to file and write them out in one go on exit.
+
+        Drawing a calendar takes thousands of tiny messages, each wrapped in
+        its own color codes. While buffering, consecutive messages in the
+        same color share a single pair of color codes and everything is
+        written with one call, which is much faster on slow terminals and
+        over SSH. Messages to other files are written immediately.
+        """
+        if self._buffer is not None:
+            # Already buffering, the outermost call writes everything.
+            yield
+            return
+
+        if file is None:
+            file = sys.stdout
+        self._buffer = []
+        self._buffer_file = file
+        self._buffer_color = None
+        try:
+            yield
+        finally:
+            if self._buffer_color is not None:
+                self._buffer.append(self.colors['default'])
+            output = ''.join(self._buffer)
+            self._buffer = self._buffer_file = self._buffer_color = None
+            file.write(output)
+            file.flush()
+
+    def msg(self, msg, colorname='default', file=None):
+        # Look up sys.stdout on each call rather than binding it as the
+        # default, so redirecting it (e.g. by `gcalcli serve`) also redirects
+        # messages.
+        if file is None:
+            file = sys.stdout
+        if self._buffer is not None and file is self._buffer_file:
+            if self.use_color and colorname != self._buffer_color:
+                if self._buffer_color is not None:
+                    self._buffer.append(self.colors['default'])
+                self._buffer.append(self.colors[colorname])
+                self._buffer_color = colorname
+            self._buffer.append(msg)
+            return
         if self.use_color:
             msg = self.colors[colorname] + msg + self.colors['default']
         file.write(msg)
@@ -96,6 +145,6 @@ class Printer(object):
     def debug_msg(self, msg):
         self.msg(msg, 'yellow', file=sys.stderr)
 
-    def art_msg(self, arttag, colorname, file=sys.stdout):
+    def art_msg(self, arttag, colorname, file=None):
         """Wrapper for easy emission of the calendar borders"""
         self.msg(self.art[arttag], colorname, file=file)
@@ -0,0 +1,114 @@
+"""In-memory schedule of reminders for `remind --daemon`.
+
+The cron-driven `remind` command looks for events starting within a window
+on every run, so reminders near the window edges can be sent twice or not
+at all. The daemon instead keeps every upcoming reminder in a heap ordered
+by the time it's due, and remembers which ones it already sent.
+"""
+
+from datetime import datetime, timedelta
+import heapq
+from typing import Iterable, NamedTuple, Optional
+
+from ._types import Event
+
+
+class Reminder(NamedTuple):
+    due: datetime
+    seq: int
+    event: Event
+
+    @property
+    def key(self):
+        event = self.event
+        return (event['gcalcli_cal']['id'], event.get('id'), event['s'],
+                self.due)
+
+
+def reminder_times(event: Event, minutes: int,
+                   use_reminders: bool = False) -> list[datetime]:
+    """Times at which to remind about an event.
+
+    With use_reminders, the event's own reminder overrides are used where it
+    has any. Otherwise the reminder is due the given minutes before start.
+    """
+    if use_reminders:
+        overrides = event.get('reminders', {}).get('overrides')
+        if overrides:
+            return sorted({event['s'] - timedelta(minutes=r['minutes'])
+                           for r in overrides})
+    return [event['s'] - timedelta(minutes=minutes)]
+
+
+class ReminderSchedule:
+    """Upcoming reminders, earliest first."""
+
+    def __init__(self, minutes: int, use_reminders: bool = False):
+        self.minutes = minutes
+        self.use_reminders = use_reminders
+        self._heap: list[Reminder] = []
+        # Keys of reminders already sent, with when their event ends. They
+        # are remembered until then, so refreshes don't send them again.
+        self._sent: dict[tuple, datetime] = {}
+        # Keys of all reminders in the last update, and when it was.
+        self._known: set[tuple] = set()
+        self._updated_at: Optional[datetime] = None
+        self._seq = 0
+
+    def update(self, events: Iterable[Event], now: datetime):
+        """Replace the schedule with reminders for a fresh list of events.
+
+        Reminders that are already due are kept (and returned by the next
+        pop_due()) if they came due since the last update, or if their
+        event is new or was moved since, so events added or moved at short
+        notice are still reminded about. On the first update, that's those
+        that came due within the last `minutes`, like `remind` would send.
+        Reminders that were due earlier than that are never sent.
+        """
+        self._sent = {key: ends for key, ends in self._sent.items()
+                      if ends > now}
+        if self._updated_at is None:
+            since = now - timedelta(minutes=self.minutes)
+        else:
+            since = self._updated_at
+        heap = []
+        known = set()
+        for event in events:
+            if event['s'] < now:
+                continue
+            for due in reminder_times(
+                    event, self.minutes, self.use_reminders):
+                reminder = Reminder(due, self._seq, event)
+                self._seq += 1
+                known.add(reminder.key)
+                if reminder.key in self._sent:
+                    continue
+                if due <= since and (self._updated_at is None
+                                     or reminder.key in self._known):
+                    continue
+                heap.append(reminder)
+        heapq.heapify(heap)
+        self._heap = heap
+        self._known = known
+        self._updated_at = now
+
+    def next_due(self) -> Optional[datetime]:
+        return self._heap[0].due if self._heap else None
+
+    def pop_due(self, now: datetime) -> list[Event]:
+        """Remove and return the events with reminders due by now.
+
+        Reminders that came due while the daemon wasn't running (e.g. while
+        the machine was suspended) are still returned as long as their event
+        hasn't ended, even if it has started. Those for events that are over
+        are dropped.
+        """
+        events: list[Event] = []
+        while self._heap and self._heap[0].due <= now:
+            reminder = heapq.heappop(self._heap)
+            event = reminder.event
+            self._sent[reminder.key] = event.get('e', event['s'])
+            if (event['s'] >= now or event.get('e', event['s']) > now) and all(
+                    e is not event for e in events):
+                events.append(event)
+        return events
@@ -0,0 +1,108 @@
+"""Search queries over the full-text index of the local event store.
+
+A query is a list of whitespace separated terms, all of which must match:
+
+    stand             word, or start of a word ("standup" matches), in
+                      the title, location, description, attendees or
+                      organizer, like the API's own search
+    title:stand       the same in the title only (or location:,
+                      description:, attendee: for attendees and organizer)
+    "stand up"        phrase (whose last word may be the start of a word)
+
+With regex set, each term is instead a case-insensitive regular expression
+that must match somewhere in the field(s), and quotes have no special
+meaning (use \\s to match spaces).
+"""
+
+import re
+import shlex
+from typing import Callable, NamedTuple, Optional, Sequence
+
+from .exceptions import GcalcliError
+
+# Field names in queries -> text columns of the event store.
+FIELDS = {
+    'title': 'summary',
+    'location': 'location',
+    'description': 'description',
+    'attendee': 'attendees',
+    'attendees': 'attendees',
+}
+COLUMNS = ('summary', 'description', 'location', 'attendees')
+# bm25() weights of COLUMNS, so title matches rank highest.
+COLUMN_WEIGHTS = (10.0, 1.0, 2.0, 2.0)
+
+
+class Term(NamedTuple):
+    # Column of the full-text index to match in, or None for any.
+    column: Optional[str]
+    text: str
+
+
+def _split_field(word: str) -> Term:
+    field, sep, text = word.partition(':')
+    if sep and text and field.lower() in FIELDS:
+        return Term(FIELDS[field.lower()], text)
+    return Term(None, word)
+
+
+def parse_query(text: str, regex: bool = False) -> list[Term]:
+    if regex:
+        words = text.split()
+    else:
+        try:
+            words = shlex.split(text)
+        except ValueError as exc:
+            raise GcalcliError(f'Invalid search {text!r}: {exc}')
+    terms = [_split_field(word) for word in words]
+    if not terms:
+        raise GcalcliError('Search text is required.')
+    return terms
+
+
+def has_field_filters(text: str) -> bool:
+    try:
+        return any(term.column for term in parse_query(text))
+    except GcalcliError:
+        # Leave reporting the invalid or empty query to the search itself.
+        return False
+
+
+def fts_query(terms: list[Term]) -> str:
+    """Return an FTS5 query matching all the terms.
+
+    Each term is quoted, so characters with a meaning in FTS5 query syntax
+    are matched literally, and matches word prefixes like the API's q=
+    search does. A trailing * is accepted but redundant.
+    """
+    parts = []
+    for term in terms:
+        text = term.text
+        if text.strip('*'):
+            text = text.rstrip('*')
+        phrase = '"{}"*'.format(text.replace('"', '""'))
+        parts.append(f'{term.column} : {phrase}' if term.column else phrase)
+    return ' AND '.join(parts)
+
+
+def regex_matcher(
+        terms: list[Term]) -> Callable[[Sequence[str]], bool]:
+    """Return a function checking whether a row matches all terms.
+
+    Rows are the values of COLUMNS, in order.
+    """
+    try:
+        patterns = [(None if term.column is None
+                     else COLUMNS.index(term.column),
+                     re.compile(term.text, re.IGNORECASE))
+                    for term in terms]
+    except re.error as exc:
+        raise GcalcliError(f'Invalid regular expression: {exc}')
+
+    def matches(row):
+        return all(
+            pattern.search(row[index]) if index is not None else
+            any(pattern.search(value) for value in row)
+            for index, pattern in patterns)
+
+    return matches
@@ -0,0 +1,220 @@
+"""Answer gcalcli queries from a long-running process over a Unix socket.
+
+Status bars (conky, tmux, polybar...) run queries like `gcalcli agenda`
+every few seconds, paying for interpreter startup, imports, loading
+credentials and fetching events every time. `gcalcli serve` keeps all of that
+warm in one process, and gcalcli-client (see client.py) forwards its
+arguments to it and prints the output, which is the same as running gcalcli
+directly.
+
+The client sends one JSON line: {"argv": [...], "columns": N}. The server
+answers with JSON lines {"out": text} and {"err": text} as output is
+produced, ending with {"exit": code}. If the command isn't one the server
+answers, it only sends {"fallback": true} and the client runs it itself.
+"""
+
+import contextlib
+from datetime import datetime
+import io
+import json
+import os
+import pathlib
+import socket
+import socketserver
+import sys
+import time
+import traceback
+from typing import Optional
+
+from . import env, utils
+from .exceptions import GcalcliError
+
+# Read-only, non-interactive commands, which are safe to run on the server.
+SERVED_COMMANDS = frozenset(
+    ('agenda', 'calm', 'calw', 'conflicts', 'freebusy', 'list', 'search',
+     'updates'))
+
+DEFAULT_MAX_AGE = 60
+
+
+def warm_calendar_interface(max_age: float = DEFAULT_MAX_AGE):
+    """Return a GoogleCalendarInterface subclass that keeps state warm.
+
+    Instances share the authorized API service and connection pool, and
+    reuse events fetched for the same query within the last max_age seconds.
+    """
+    from .cli import load_calendar_interface
+
+    # Sets up SSL before importing gcal.
+    load_calendar_interface()
+    from .gcal import GoogleCalendarInterface
+
+    class WarmCalendarInterface(GoogleCalendarInterface):
+        # (calendar ids, start, end, search text, fields, options affecting
+        # results) -> (fetched at, events)
+        events_cache: dict[tuple, tuple[float, list]] = {}
+
+        def __init__(self, *args, **kwargs):
+            # The class attribute is set once, when gcal is imported.
+            self.now = datetime.now(utils.local_tz())
+            super().__init__(*args, **kwargs)
+
+        def get_cal_service(self):
+            service = super().get_cal_service()
+            cls = WarmCalendarInterface
+            cls.cal_service = service
+            cls.credentials = self.credentials
+            cls.http = self.http
+            return service
+
+        def _search_for_events(self, start, end, search_text, fields=None,
+                               updated_min=None):
+            if updated_min:
+                # Changes since a point in time are never worth reusing.
+                return super()._search_for_events(
+                    start, end, search_text, fields=fields,
+                    updated_min=updated_min)
+            cache = self.events_cache
+            key = (tuple(cal['id'] for cal in self.cals), start, end,
+                   search_text, fields,
+                   *(bool(self.options.get(option)) for option in
+                     ('sync_events', 'regex', 'rank')))
+            now = time.monotonic()
+            if self.options.get('refresh_cache'):
+                # --refresh asks for current data, so drop everything kept.
+                cache.clear()
+            cached = cache.get(key)
+            if cached and now - cached[0] < max_age:
+                return cached[1]
+            events = super()._search_for_events(
+                start, end, search_text, fields=fields)
+            for stale in [k for k, (fetched_at, _) in cache.items()
+                          if now - fetched_at >= max_age]:
+                del cache[stale]
+            cache[key] = (now, events)
+            return events
+
+    return WarmCalendarInterface
+
+
+class _MessageWriter(io.TextIOBase):
+    """Text stream that forwards writes to the client as JSON lines."""
+
+    def __init__(self, wfile, kind):
+        self._wfile = wfile
+        self._kind = kind
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        if text:
+            _send(self._wfile, **{self._kind: text})
+        return len(text)
+
+
+def _send(wfile, **message):
+    wfile.write(json.dumps(message).encode() + b'\n')
+    wfile.flush()
+
+
+def _command(argv) -> Optional[str]:
+    from .argparsers import get_argument_parser
+
+    with contextlib.redirect_stderr(io.StringIO()):
+        try:
+            parsed_args, _ = get_argument_parser().parse_known_args(argv)
+        except SystemExit:
+            return None
+    return parsed_args.command
+
+
+class _QueryHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline())
+            argv = list(request['argv'])
+        except (ValueError, KeyError, TypeError):
+            return
+
+        command = _command(argv)
+        if command is not None and command not in SERVED_COMMANDS:
+            _send(self.wfile, fallback=True)
+            return
+
+        _send(self.wfile, exit=self._run(argv, request.get('columns')))
+
+    def _run(self, argv, columns):
+        from .cli import main
+
+        saved = (sys.stdin, sys.stdout, sys.stderr)
+        saved_columns = os.environ.get('COLUMNS')
+        sys.stdin = io.StringIO()
+        sys.stdout = _MessageWriter(self.wfile, 'out')
+        sys.stderr = _MessageWriter(self.wfile, 'err')
+        if columns:
+            # Default --width comes from the terminal size.
+            os.environ['COLUMNS'] = str(columns)
+        try:
+            main(argv, calendar_interface=self.server.calendar_interface)
+        except SystemExit as exc:
+            if exc.code is None or isinstance(exc.code, int):
+                return exc.code or 0
+            sys.stderr.write(f'{exc.code}\n')
+            return 1
+        except Exception:
+            traceback.print_exc()
+            return 1
+        finally:
+            sys.stdin, sys.stdout, sys.stderr = saved
+            if saved_columns is None:
+                os.environ.pop('COLUMNS', None)
+            else:
+                os.environ['COLUMNS'] = saved_columns
+        return 0
+
+
+class QueryServer(socketserver.UnixStreamServer):
+    """Serve one query at a time, since each one redirects sys.stdout."""
+
+    def __init__(self, socket_path: pathlib.Path, calendar_interface):
+        self.calendar_interface = calendar_interface
+        # Only the current user may connect.
+        old_umask = os.umask(0o177)
+        try:
+            super().__init__(str(socket_path), _QueryHandler)
+        finally:
+            os.umask(old_umask)
+
+    def handle_error(self, request, client_address):
+        # The client hung up early, or similar. Keep serving.
+        pass
+
+
+def _is_serving(socket_path: pathlib.Path) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(socket_path))
+        except OSError:
+            return False
+    return True
+
+
+def serve(socket_path: Optional[pathlib.Path] = None,
+          max_age: float = DEFAULT_MAX_AGE):
+    if socket_path is None:
+        socket_path = env.server_socket_path()
+    socket_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    if socket_path.exists():
+        if _is_serving(socket_path):
+            raise GcalcliError(f'Already serving on {socket_path}')
+        # Left behind by a server that didn't shut down cleanly.
+        socket_path.unlink()
+
+    server = QueryServer(socket_path, warm_calendar_interface(max_age))
+    sys.stderr.write(f'Serving on {socket_path}\n')
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        socket_path.unlink(missing_ok=True)
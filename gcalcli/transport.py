@@ -0,0 +1,98 @@
+"""HTTP transport for Google API requests, backed by a pooled requests session.
+
+googleapiclient sends requests through an httplib2.Http-like object, which
+keeps a single connection per host and isn't safe to share across threads.
+SessionHttp offers the same `request()` interface on top of google-auth's
+AuthorizedSession, so every request (paged listings, batches, calls from
+worker threads) goes over one thread-safe pool of keep-alive connections.
+
+Note that requests/urllib3 only speak HTTP/1.1, so reuse comes from
+keep-alive rather than HTTP/2 multiplexing.
+"""
+
+from typing import NamedTuple, Optional
+
+from google.auth.transport.requests import AuthorizedSession
+import httplib2
+from requests.adapters import HTTPAdapter
+
+# Same default as googleapiclient.http.build_http().
+DEFAULT_TIMEOUT_SEC = 60
+# Enough connections for the default --max-concurrency worker threads, with
+# headroom for batch requests sent alongside them.
+DEFAULT_POOL_SIZE = 10
+
+
+class ConnectionStats(NamedTuple):
+    requests: int
+    connections: int
+
+    @property
+    def reused(self) -> int:
+        return self.requests - self.connections
+
+
+class _PoolTrackingAdapter(HTTPAdapter):
+    """HTTPAdapter that remembers the connection pools it creates."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.pools = []
+        new_pool = self.poolmanager._new_pool
+
+        def track_new_pool(*args, **kwargs):
+            pool = new_pool(*args, **kwargs)
+            self.pools.append(pool)
+            return pool
+
+        self.poolmanager._new_pool = track_new_pool
+
+
+class SessionHttp:
+    """httplib2.Http-compatible adapter over a pooled AuthorizedSession."""
+
+    def __init__(
+        self,
+        credentials,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        timeout: float = DEFAULT_TIMEOUT_SEC,
+    ):
+        # googleapiclient looks for credentials on the http object to refresh
+        # them before sending batch requests.
+        self.credentials = credentials
+        self.timeout = timeout
+        self.session = AuthorizedSession(credentials)
+        self._adapter = _PoolTrackingAdapter(
+            pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', self._adapter)
+        self.session.mount('http://', self._adapter)
+
+    def request(
+        self,
+        uri: str,
+        method: str = 'GET',
+        body: Optional[bytes] = None,
+        headers: Optional[dict] = None,
+        redirections: int = httplib2.DEFAULT_MAX_REDIRECTS,
+        connection_type=None,
+    ) -> tuple[httplib2.Response, bytes]:
+        response = self.session.request(
+            method, uri, data=body, headers=headers, timeout=self.timeout)
+        info = {k.lower(): v for k, v in response.headers.items()}
+        info['status'] = str(response.status_code)
+        # Like httplib2, hand over content already decompressed.
+        info.pop('content-encoding', None)
+        info['content-length'] = str(len(response.content))
+        resp = httplib2.Response(info)
+        resp.reason = response.reason
+        return resp, response.content
+
+    def connection_stats(self) -> ConnectionStats:
+        pools = getattr(self._adapter, 'pools', [])
+        return ConnectionStats(
+            requests=sum(pool.num_requests for pool in pools),
+            connections=sum(pool.num_connections for pool in pools),
+        )
+
+    def close(self):
+        self.session.close()
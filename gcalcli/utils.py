@@ -1,5 +1,6 @@
 import calendar
 from collections import OrderedDict
+import functools
 import json
 import locale
 import os
@@ -9,18 +10,33 @@ import re
 import subprocess
 import time
 from datetime import datetime, timedelta
+from itertools import accumulate
 from typing import Any, Tuple
+from unicodedata import east_asian_width
 
-import babel
 from dateutil.parser import parse as dateutil_parse
 from dateutil.tz import tzlocal
-from parsedatetime.parsedatetime import Calendar
 
-from . import auth, env
+from . import env
 
 locale.setlocale(locale.LC_ALL, '')
-fuzzy_date_parse = Calendar().parse
-fuzzy_datetime_parse = Calendar().parseDT
+
+
+@functools.cache
+def _fuzzy_calendar():
+    # Imported on first use since it's slow to load and most commands never
+    # need to parse fuzzy dates.
+    from parsedatetime.parsedatetime import Calendar
+
+    return Calendar()
+
+
+def fuzzy_date_parse(*args, **kwargs):
+    return _fuzzy_calendar().parse(*args, **kwargs)
+
+
+def fuzzy_datetime_parse(*args, **kwargs):
+    return _fuzzy_calendar().parseDT(*args, **kwargs)
 
 
 REMINDER_REGEX = r'^(\d+)([wdhm]?)(?:\s+(popup|email|sms))?$'
@@ -104,6 +120,8 @@ def _is_dayfirst_locale():
     Pattern syntax is documented at
     https://babel.pocoo.org/en/latest/dates.html#pattern-syntax.
     """
+    import babel
+
     try:
         locale = babel.Locale(babel.default_locale('LC_TIME'))
     except babel.UnknownLocaleError:
@@ -117,7 +135,7 @@ def get_time_from_str(when):
     """Convert a string to a time: first uses the dateutil parser, falls back
     on fuzzy matching with parsedatetime
     """
-    zero_oclock_today = datetime.now(tzlocal()).replace(
+    zero_oclock_today = datetime.now(local_tz()).replace(
         hour=0, minute=0, second=0, microsecond=0
     )
 
@@ -134,7 +152,7 @@ def get_time_from_str(when):
         struct, result = fuzzy_date_parse(when)
         if not result:
             raise ValueError('Date and time is invalid: %s' % (when))
-        event_time = datetime.fromtimestamp(time.mktime(struct), tzlocal())
+        event_time = datetime.fromtimestamp(time.mktime(struct), local_tz())
 
     return event_time
 
@@ -198,13 +216,52 @@ def is_all_day(event):
     )
 
 
+# Terminal columns taken by characters of each East Asian Width class.
+UNIWIDTH = {'W': 2, 'F': 2, 'N': 1, 'Na': 1, 'H': 1, 'A': 1}
+
+
+@functools.lru_cache(maxsize=4096)
+def display_widths(string: str) -> Tuple[int, ...]:
+    """Prefix sums of the display width of the characters in string.
+
+    widths[i] is the number of terminal columns taken by string[:i], so the
+    last entry is the width of the whole string. Results are cached, since
+    the same titles are measured over and over while drawing a calendar.
+    """
+    return tuple(accumulate(
+        (UNIWIDTH[east_asian_width(char)] for char in string), initial=0))
+
+
+@functools.cache
+def local_tz():
+    """Return the local timezone, shared rather than created per call."""
+    return tzlocal()
+
+
 def localize_datetime(dt):
     if not hasattr(dt, 'tzinfo'):  # Why are we skipping these?
         return dt
     if dt.tzinfo is None:
-        return dt.replace(tzinfo=tzlocal())
+        return dt.replace(tzinfo=local_tz())
     else:
-        return dt.astimezone(tzlocal())
+        return dt.astimezone(local_tz())
+
+
+def parse_api_time(value: str) -> datetime:
+    """Parse a date or RFC 3339 date-time from the API as local time.
+
+    The API always sends ISO 8601 strings, which datetime.fromisoformat
+    handles many times faster than dateutil. The dateutil parser is only
+    used as a fallback for anything fromisoformat rejects.
+    """
+    if value.endswith('Z'):
+        # fromisoformat only accepts a "Z" suffix from python 3.11.
+        value = value[:-1] + '+00:00'
+    try:
+        dt = datetime.fromisoformat(value)
+    except ValueError:
+        dt = dateutil_parse(value)
+    return localize_datetime(dt)
 
 
 def launch_editor(path: str | os.PathLike):
@@ -240,6 +297,8 @@ def shorten_path(path: pathlib.Path) -> pathlib.Path:
 
 
 def inspect_auth() -> dict[str, Any]:
+    from . import auth
+
     auth_data: dict[str, Any] = OrderedDict()
     auth_path = None
     for (path, _) in env.data_file_paths('oauth', env.config_dir()):
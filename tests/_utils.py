@@ -1,7 +1,10 @@
 """Testing utilities for gcalcli tests."""
 
 import io
-from typing import Dict, Any, Set, Optional, List, Tuple, Protocol
+from typing import (Any, Callable, Dict, List, Optional, Protocol, Set,
+                    Tuple)
+
+from googleapiclient.errors import HttpError
 
 
 class MockGoogleApiRequest(Protocol):
@@ -197,3 +200,67 @@ class APICallTracker:
             call.method_name for call in expected_calls
         }
         self.verify_only_mutating_calls(expected_mutating_methods)
+
+
+class MockBatchHttpRequest:
+    """Mimics BatchHttpRequest by executing queued requests one by one."""
+
+    def __init__(self, callback):
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, callback=None, request_id=None):
+        self.requests.append((request_id, request))
+
+    def execute(self, http=None):
+        for request_id, request in self.requests:
+            try:
+                response = request.execute(http=http)
+            except HttpError as e:
+                self.callback(request_id, None, e)
+            else:
+                self.callback(request_id, response, None)
+
+
+class MockApiRequest:
+    """Mimics an API request answering with respond() when executed.
+
+    A response that is an exception (e.g. an HttpError) is raised instead.
+    Like real requests, it has headers that can be set before executing.
+    """
+
+    def __init__(self, respond: Callable[[], Any]):
+        self.respond = respond
+        self.headers: Dict[str, str] = {}
+
+    def execute(self, http=None):
+        response = self.respond()
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+class MockListResource:
+    """Mimics a listable API resource such as events() or calendarList().
+
+    Each list(**kwargs) call is recorded in calls, and returns a request
+    answering with respond(**kwargs), which are recorded in requests. Use it
+    for events with e.g. `gcal.get_events = lambda: resource`.
+    """
+
+    def __init__(self, respond: Callable[..., Any]):
+        self.respond = respond
+        self.calls: List[Dict[str, Any]] = []
+        self.requests: List[MockApiRequest] = []
+
+    def list(self, **kwargs) -> MockApiRequest:
+        self.calls.append(kwargs)
+        request = MockApiRequest(lambda: self.respond(**kwargs))
+        self.requests.append(request)
+        return request
+
+    @classmethod
+    def from_pages(cls, pages_by_token: Dict[Optional[str], Any],
+                   token_arg: str = 'syncToken') -> 'MockListResource':
+        """Resource answering with pages_by_token[kwargs[token_arg]]."""
+        return cls(lambda **kwargs: pages_by_token[kwargs.get(token_arg)])
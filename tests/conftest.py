@@ -12,7 +12,7 @@ from gcalcli.argparsers import (get_cal_query_parser, get_color_parser,
                                 get_output_parser)
 from gcalcli.gcal import GoogleCalendarInterface
 from gcalcli.printer import Printer
-from tests._utils import APICallTracker
+from tests._utils import APICallTracker, MockBatchHttpRequest
 
 TEST_DATA_DIR = os.path.dirname(os.path.abspath(__file__)) + '/data'
 
@@ -64,7 +64,7 @@ def default_options():
 
 @pytest.fixture
 def PatchedGCalIForEvents(PatchedGCalI, monkeypatch):
-    def mocked_search_for_events(self, start, end, search_text):
+    def mocked_search_for_events(self, start, end, search_text, fields=None):
         return mock_event
 
     monkeypatch.setattr(
@@ -114,6 +114,7 @@ def PatchedGCalI(gcali_patches, monkeypatch):
 
         # Replace the real events resource with our mock
         gc.get_events = lambda: mock_events_resource()
+        gc.new_batch_http_request = MockBatchHttpRequest
 
         return gc
 
@@ -143,7 +144,7 @@ def gcali_patches(monkeypatch):
             )
         return self.cal_service
 
-    def mocked_msg(self, msg, colorname='default', file=sys.stdout):
+    def mocked_msg(self, msg, colorname='default', file=None):
         # ignores file and always writes to stdout
         if self.use_color:
             msg = self.colors[colorname] + msg + self.colors['default']
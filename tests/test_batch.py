@@ -0,0 +1,118 @@
+import json
+import threading
+from types import SimpleNamespace
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from gcalcli import batch
+from gcalcli.batch import BatchQueue, is_rate_limit_error
+from tests._utils import MockBatchHttpRequest
+
+
+def _http_error(status, reason):
+    content = {'error': {'code': status, 'errors': [{'reason': reason}],
+                         'message': reason}}
+    return HttpError(httplib2.Response({'status': status}),
+                     json.dumps(content).encode())
+
+
+class FakeInterface:
+    max_retries = 3
+
+    def __init__(self):
+        self.batches = []
+        self.threads = set()
+
+    def new_batch_http_request(self, callback):
+        self.threads.add(threading.get_ident())
+        self.batches.append(MockBatchHttpRequest(callback))
+        return self.batches[-1]
+
+    def _execute_batch(self, batch):
+        batch.execute()
+
+
+class FakeRequest:
+    def __init__(self, name, errors=()):
+        self.name = name
+        self.errors = list(errors)
+        self.executions = 0
+
+    def execute(self, http=None):
+        self.executions += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return {'id': self.name}
+
+
+def test_is_rate_limit_error():
+    assert is_rate_limit_error(_http_error(403, 'rateLimitExceeded'))
+    assert is_rate_limit_error(_http_error(429, 'userRateLimitExceeded'))
+    assert not is_rate_limit_error(_http_error(403, 'forbidden'))
+    assert not is_rate_limit_error(
+        HttpError(httplib2.Response({'status': 500}), b'not json'))
+
+
+def test_batches_requests_by_size():
+    interface = FakeInterface()
+    queue = BatchQueue(interface, batch_size=2)
+    for i in range(5):
+        queue.add(FakeRequest(f'event{i}'), key=i)
+    # Two full batches are sent as soon as they're queued.
+    assert len(interface.batches) == 2
+
+    results = queue.flush()
+
+    assert len(interface.batches) == 3
+    assert [len(b.requests) for b in interface.batches] == [2, 2, 1]
+    assert [(r.key, r.response, r.error) for r in results] == [
+        (i, {'id': f'event{i}'}, None) for i in range(5)]
+
+
+def test_retries_only_rate_limited_requests(monkeypatch):
+    monkeypatch.setattr(batch, 'time', SimpleNamespace(sleep=lambda _: None))
+    interface = FakeInterface()
+    queue = BatchQueue(interface)
+    ok = FakeRequest('ok')
+    limited = FakeRequest(
+        'limited', errors=[_http_error(403, 'rateLimitExceeded')])
+    broken = FakeRequest('broken', errors=[_http_error(404, 'notFound')])
+    for request in (ok, limited, broken):
+        queue.add(request, key=request.name)
+
+    results = {r.key: r for r in queue.flush()}
+
+    assert (ok.executions, limited.executions, broken.executions) == (1, 2, 1)
+    assert [len(b.requests) for b in interface.batches] == [3, 1]
+    assert results['limited'].response == {'id': 'limited'}
+    assert results['broken'].error.resp.status == 404
+
+
+def test_gives_up_after_max_retries(monkeypatch):
+    monkeypatch.setattr(batch, 'time', SimpleNamespace(sleep=lambda _: None))
+    interface = FakeInterface()
+    queue = BatchQueue(interface)
+    limited = FakeRequest(
+        'limited', errors=[_http_error(403, 'rateLimitExceeded')] * 5)
+    queue.add(limited)
+
+    (result,) = queue.flush()
+
+    assert limited.executions == interface.max_retries
+    assert is_rate_limit_error(result.error)
+
+
+def test_parallel_batches_report_every_result():
+    interface = FakeInterface()
+    reported = []
+    queue = BatchQueue(interface, batch_size=2, max_workers=3,
+                       on_result=reported.append)
+    for i in range(9):
+        queue.add(FakeRequest(f'event{i}'), key=i)
+
+    assert queue.flush() == []
+    assert len(interface.batches) == 5
+    assert threading.get_ident() not in interface.threads
+    assert sorted((r.key, r.response['id']) for r in reported) == [
+        (i, f'event{i}') for i in range(9)]
@@ -0,0 +1,136 @@
+import threading
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from gcalcli import cache
+from gcalcli.cache import CacheStore
+from gcalcli.gcal import GoogleCalendarInterface
+from tests._utils import MockListResource
+
+# Grab the real implementation before fixtures stub it out.
+get_cached = GoogleCalendarInterface._get_cached
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path.joinpath('cache')
+    store = CacheStore(path)
+    store.put('all_cals', [{'id': 'cal1'}], ttl=60, etag='"etag1"')
+    store.save()
+
+    entry = CacheStore(path).get('all_cals')
+    assert entry.value == [{'id': 'cal1'}]
+    assert entry.etag == '"etag1"'
+    assert not entry.is_stale()
+    assert entry.is_stale(now=entry.fetched_at + 61)
+
+
+def test_discards_corrupt_or_outdated_files(tmp_path, monkeypatch):
+    path = tmp_path.joinpath('cache')
+    store = CacheStore(path)
+    store.put('all_cals', [], ttl=60)
+    store.save()
+
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xFF
+    path.write_bytes(bytes(data))
+    assert CacheStore(path).get('all_cals') is None
+
+    store.save()
+    monkeypatch.setattr(cache, 'CACHE_VERSION', cache.CACHE_VERSION + 1)
+    assert CacheStore(path).get('all_cals') is None
+
+    # Legacy cache files were a bare pickled dict.
+    path.write_bytes(b'\x80\x04}\x94.')
+    assert CacheStore(path).get('all_cals') is None
+
+
+def test_store_without_path_is_memory_only():
+    store = CacheStore(None)
+    store.put('all_cals', [], ttl=60)
+    store.save()
+    assert store.get('all_cals').value == []
+
+
+def _patched_gcal(PatchedGCalI, tmp_path, responses):
+    def respond(**kwargs):
+        response = responses.pop(0)
+        return response() if callable(response) else response
+
+    gcal = PatchedGCalI(data_path=tmp_path, refresh_cache=False)
+    gcal.options['use_cache'] = True
+    resource = MockListResource(respond)
+    gcal.get_cal_service = lambda: type(
+        'Service', (), {'calendarList': lambda self: resource})()
+    return gcal, resource
+
+
+def _cal(cal_id, role='owner'):
+    return {'id': cal_id, 'summary': cal_id, 'accessRole': role}
+
+
+def test_stale_calendar_list_revalidated_in_background(
+        PatchedGCalI, tmp_path):
+    gcal, resource = _patched_gcal(PatchedGCalI, tmp_path, [
+        {'items': [_cal('b', 'reader'), _cal('a')], 'etag': '"v1"'},
+    ])
+    get_cached(gcal)
+    assert [c['id'] for c in gcal.all_cals] == ['a', 'b']
+    assert [r.headers for r in resource.requests] == [{}]
+
+    # Fresh entries are used without any request.
+    gcal, resource = _patched_gcal(PatchedGCalI, tmp_path, [])
+    get_cached(gcal)
+    assert [c['id'] for c in gcal.all_cals] == ['a', 'b']
+    assert gcal._revalidation is None
+
+    # Stale and unchanged: served from cache, revalidated with the etag.
+    not_modified = HttpError(httplib2.Response({'status': 304}), b'')
+    gcal, resource = _patched_gcal(PatchedGCalI, tmp_path, [not_modified])
+    store = CacheStore(tmp_path.joinpath('cache'))
+    store.put('all_cals', store.get('all_cals').value, ttl=-1, etag='"v1"')
+    store.save()
+    get_cached(gcal)
+    gcal._revalidation.join()
+    assert [c['id'] for c in gcal.all_cals] == ['a', 'b']
+    assert [r.headers for r in resource.requests] == [
+        {'If-None-Match': '"v1"'}]
+
+    # Stale and changed: the current run still uses the cached list, the
+    # next one picks up the change.
+    gcal, resource = _patched_gcal(PatchedGCalI, tmp_path, [
+        {'items': [_cal('c')], 'etag': '"v2"'},
+    ])
+    get_cached(gcal)
+    gcal._revalidation.join()
+    assert [c['id'] for c in gcal.all_cals] == ['a', 'b']
+    entry = CacheStore(tmp_path.joinpath('cache')).get('all_cals')
+    assert [c['id'] for c in entry.value] == ['c']
+    assert entry.etag == '"v2"'
+
+
+def test_revalidation_does_not_block_exit(PatchedGCalI, tmp_path):
+    store = CacheStore(tmp_path.joinpath('cache'))
+    store.put('all_cals', [_cal('a')], ttl=-1, etag='"v1"')
+    store.save()
+
+    release = threading.Event()
+
+    def slow_response():
+        release.wait(timeout=10)
+        return {'items': [_cal('b')], 'etag': '"v2"'}
+
+    gcal, resource = _patched_gcal(PatchedGCalI, tmp_path, [slow_response])
+    get_cached(gcal)
+    assert [c['id'] for c in gcal.all_cals] == ['a']
+    # The interpreter won't wait for the pending request at exit.
+    assert gcal._revalidation.daemon
+    assert gcal._revalidation.is_alive()
+    entry = CacheStore(tmp_path.joinpath('cache')).get('all_cals')
+    assert [c['id'] for c in entry.value] == ['a']
+
+    release.set()
+    gcal._revalidation.join()
+    entry = CacheStore(tmp_path.joinpath('cache')).get('all_cals')
+    assert [c['id'] for c in entry.value] == ['b']
+    assert list(tmp_path.glob('*.tmp')) == []
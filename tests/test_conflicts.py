@@ -2,7 +2,7 @@ from datetime import datetime
 
 from dateutil.tz import tzlocal
 
-from gcalcli.conflicts import ShowConflicts
+from gcalcli.conflicts import find_conflicts, ShowConflicts
 
 minimal_event = {
                     'e': datetime(2019, 1, 8, 15, 15, tzinfo=tzlocal()),
@@ -43,3 +43,61 @@ def test_does_not_find_conflict_for_second_non_overlapping_event():
     show_conflicts.show_conflicts(minimal_event)
     show_conflicts.show_conflicts(minimal_event_nonoverlapping)
     assert conflicts == []
+
+
+def test_instances_do_not_share_active_events():
+    first = ShowConflicts([].append)
+    first.show_conflicts(minimal_event)
+
+    conflicts = []
+    second = ShowConflicts(conflicts.append)
+    second.show_conflicts(minimal_event_overlapping)
+    assert conflicts == []
+
+
+def _event(event_id, start_hour, end_hour):
+    return {
+        'id': event_id,
+        's': datetime(2019, 1, 8, start_hour, tzinfo=tzlocal()),
+        'e': datetime(2019, 1, 8, end_hour, tzinfo=tzlocal()),
+    }
+
+
+def test_find_conflicts_reports_clusters_and_pairs():
+    events = [
+        _event('long', 9, 13),
+        _event('a', 10, 11),
+        _event('b', 11, 12),
+        _event('c', 11, 14),
+        _event('alone', 14, 15),
+        _event('d', 16, 18),
+        _event('e', 17, 18),
+    ]
+
+    clusters = list(find_conflicts(events))
+
+    assert [[e['id'] for e in c.events] for c in clusters] == [
+        ['long', 'a', 'b', 'c'],
+        ['d', 'e'],
+    ]
+    assert clusters[0].pairs == [(0, 1), (0, 2), (0, 3), (2, 3)]
+    assert clusters[0].start == events[0]['s']
+    assert clusters[0].end == events[3]['e']
+    assert clusters[1].pairs == [(0, 1)]
+
+
+def test_find_conflicts_pairs_match_brute_force():
+    events = sorted(
+        (_event(str(i), i % 20, i % 20 + 1 + i % 3) for i in range(60)),
+        key=lambda e: e['s'])
+
+    expected = {
+        (a['id'], b['id'])
+        for i, a in enumerate(events) for b in events[i + 1:]
+        if b['s'] < a['e']
+    }
+    found = {
+        (c.events[i]['id'], c.events[j]['id'])
+        for c in find_conflicts(events) for i, j in c.pairs
+    }
+    assert found == expected
@@ -0,0 +1,144 @@
+from datetime import datetime, timedelta, timezone
+import sqlite3
+
+from gcalcli.eventstore import SCHEMA_VERSION, EventStore
+
+DAY = datetime(2024, 5, 15, tzinfo=timezone.utc)
+
+
+def _event(event_id, summary='Test Event', status='confirmed', hour=9,
+           **fields):
+    start = DAY + timedelta(hours=hour)
+    return {'id': event_id, 'summary': summary, 'status': status,
+            'start': {'dateTime': start.isoformat()},
+            'end': {'dateTime': (start + timedelta(hours=1)).isoformat()},
+            **fields}
+
+
+def test_apply_full_sync(tmp_path):
+    store = EventStore(tmp_path.joinpath('events'))
+    store.apply('cal', [_event('a'), _event('b')], 'token1')
+
+    assert store.sync_token('cal') == 'token1'
+    assert sorted(e['id'] for e in store.events('cal')) == ['a', 'b']
+    assert list(store.events('other_cal')) == []
+
+
+def test_apply_delta_updates_and_removes_cancelled(tmp_path):
+    store = EventStore(tmp_path.joinpath('events'))
+    store.apply('cal', [_event('a'), _event('b')], 'token1')
+    store.apply(
+        'cal',
+        [_event('a', summary='Renamed'), _event('b', status='cancelled')],
+        'token2',
+    )
+
+    assert store.sync_token('cal') == 'token2'
+    assert list(store.events('cal')) == [_event('a', summary='Renamed')]
+
+
+def test_persists_across_instances(tmp_path):
+    path = tmp_path.joinpath('events')
+    store = EventStore(path)
+    store.apply('cal', [_event('a')], 'token1')
+    store.close()
+
+    store = EventStore(path)
+    assert store.sync_token('cal') == 'token1'
+    assert [e['id'] for e in store.events('cal')] == ['a']
+
+
+def test_reset(tmp_path):
+    store = EventStore(tmp_path.joinpath('events'))
+    store.apply('cal', [_event('a')], 'token1')
+    store.reset('cal')
+
+    assert store.sync_token('cal') is None
+    assert list(store.events('cal')) == []
+
+
+def test_drops_data_from_other_schema_version(tmp_path):
+    path = tmp_path.joinpath('events')
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE events (junk TEXT)')
+    conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION + 1}')
+    conn.commit()
+    conn.close()
+
+    store = EventStore(path)
+    assert store.sync_token('cal') is None
+    store.apply('cal', [_event('a')], 'token1')
+    assert [e['id'] for e in store.events('cal')] == ['a']
+
+
+def test_events_in_range_in_start_order(tmp_path):
+    store = EventStore(tmp_path.joinpath('events'))
+    store.apply('cal', [_event('late', hour=15), _event('early', hour=9),
+                        _event('next_week', hour=7 * 24)], 'token1')
+
+    assert [e['id'] for e in store.events('cal')] == [
+        'early', 'late', 'next_week']
+    assert [e['id'] for e in store.events(
+        'cal', end=DAY + timedelta(days=1))] == ['early', 'late']
+    assert [e['id'] for e in store.events(
+        'cal', start=DAY + timedelta(days=3))] == ['next_week']
+    assert store.synced_at('cal') is not None
+    assert store.synced_at('other_cal') is None
+
+
+def test_events_full_text_search(tmp_path):
+    store = EventStore(tmp_path.joinpath('events'))
+    assert store.has_fts
+    store.apply('cal', [
+        _event('a', summary='Team standup', location='Room "1"'),
+        _event('b', summary='Lunch', description='Pizza with the team'),
+    ], 'token1')
+
+    def search(text):
+        return sorted(e['id'] for e in store.events('cal', text=text))
+
+    assert search('team') == ['a', 'b']
+    assert search('TEAM pizza') == ['b']
+    assert search('room "1"') == ['a']
+    assert search('dinner') == []
+
+    store.apply('cal', [_event('a', summary='Retro'),
+                        _event('b', status='cancelled')], 'token2')
+    assert search('team') == []
+    assert search('retro') == ['a']
+
+    store.reset('cal')
+    assert search('retro') == []
+
+
+def test_events_search_fields_regex_and_rank(tmp_path):
+    store = EventStore(tmp_path.joinpath('events'))
+    store.apply('cal', [
+        _event('a', summary='Planning', hour=9,
+               description='Standup notes', attendees=[
+                   {'email': 'alice@example.com', 'displayName': 'Alice'}]),
+        _event('b', summary='Standup', hour=10),
+        _event('c', summary='Lunch', hour=11, location='Cafe 42',
+               organizer={'email': 'organizer@example.com'}),
+    ], 'token1')
+
+    def search(text, **kwargs):
+        return [e['id'] for e in store.events('cal', text=text, **kwargs)]
+
+    assert search('standup') == ['a', 'b']
+    assert search('title:standup') == ['b']
+    assert search('attendee:alice') == ['a']
+    assert search('stand*') == ['a', 'b']
+    # Plain words match prefixes, and names, like the API's q= search.
+    assert search('stand') == ['a', 'b']
+    assert search('title:plan') == ['a']
+    assert search('attendee:ali') == ['a']
+    assert search('Alice') == ['a']
+    assert search('organizer') == ['c']
+    assert search(r'location:^cafe\s\d+$', regex=True) == ['c']
+    assert search('s.*up', regex=True) == ['a', 'b']
+
+    ranked = sorted(store.events('cal', text='standup'),
+                    key=lambda e: e['gcalcli_rank'])
+    # Title matches rank above description matches.
+    assert [e['id'] for e in ranked] == ['b', 'a']
@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta
+
+from dateutil.tz import tzlocal, tzutc
+
+from gcalcli.freebusy import (find_overlaps, first_free_slot, free_intervals,
+                              FREEBUSY_MAX_DAYS, merge_intervals,
+                              parse_response, query_windows)
+
+
+def at(hour, minute=0, day=8):
+    return datetime(2019, 1, day, hour, minute, tzinfo=tzlocal())
+
+
+def test_merge_intervals():
+    assert merge_intervals([(at(13), at(14)), (at(9), at(10)),
+                            (at(9, 30), at(11)), (at(11), at(12)),
+                            (at(9, 45), at(10))]) == [
+        (at(9), at(12)), (at(13), at(14))]
+    assert merge_intervals([]) == []
+
+
+def test_free_intervals_within_range():
+    busy = [(at(8), at(9, 30)), (at(11), at(12)), (at(16), at(18))]
+    assert list(free_intervals(busy, at(9), at(17))) == [
+        (at(9, 30), at(11)), (at(12), at(16))]
+    assert list(free_intervals([], at(9), at(17))) == [(at(9), at(17))]
+    assert list(free_intervals([(at(8), at(18))], at(9), at(17))) == []
+
+
+def test_first_free_slot():
+    busy = [(at(9), at(10)), (at(10, 30), at(12))]
+    assert first_free_slot(busy, at(9), at(17), timedelta(minutes=30)) == (
+        at(10), at(10, 30))
+    assert first_free_slot(busy, at(9), at(17), timedelta(minutes=45)) == (
+        at(12), at(12, 45))
+    assert first_free_slot(busy, at(9), at(12, 30),
+                           timedelta(minutes=45)) is None
+
+
+def test_find_overlaps_between_calendars():
+    overlaps = list(find_overlaps({
+        'a': [(at(9), at(11)), (at(14), at(15))],
+        'b': [(at(10), at(12)), (at(15), at(16))],
+        'c': [(at(10, 30), at(10, 45))],
+    }))
+    assert overlaps == [
+        (at(10), at(10, 30), ['a', 'b']),
+        (at(10, 30), at(10, 45), ['a', 'b', 'c']),
+        (at(10, 45), at(11), ['a', 'b']),
+    ]
+
+
+def test_parse_response():
+    busy, errors = parse_response({
+        'kind': 'calendar#freeBusy',
+        'calendars': {
+            'a@example.com': {'busy': [{'start': '2019-01-08T09:00:00Z',
+                                        'end': '2019-01-08T10:00:00Z'}]},
+            'b@example.com': {'errors': [{'domain': 'global',
+                                          'reason': 'notFound'}]},
+            'c@example.com': {'busy': []},
+        },
+    })
+    assert busy == {
+        'a@example.com': [(datetime(2019, 1, 8, 9, tzinfo=tzutc()),
+                           datetime(2019, 1, 8, 10, tzinfo=tzutc()))],
+        'c@example.com': [],
+    }
+    assert errors == {'b@example.com': ['notFound']}
+
+
+def test_query_windows_cover_range():
+    end = at(9) + timedelta(days=2 * FREEBUSY_MAX_DAYS + 1)
+    windows = list(query_windows(at(9), end))
+    assert len(windows) == 3
+    assert windows[0][0] == at(9) and windows[-1][1] == end
+    assert all(a[1] == b[0] for a, b in zip(windows, windows[1:]))
@@ -3,11 +3,17 @@ from __future__ import absolute_import
 import io
 import os
 import re
-from datetime import datetime
-from json import load
+from datetime import datetime, timedelta
+from json import dumps, load, loads
+from types import SimpleNamespace
 
+import httplib2
 import pytest
+from dateutil.tz import tzlocal
+from googleapiclient.errors import HttpError
 
+import gcalcli.gcal
+from gcalcli import ics
 from gcalcli.argparsers import (
     get_cal_query_parser,
     get_color_parser,
@@ -19,7 +25,9 @@ from gcalcli.argparsers import (
 )
 from gcalcli.cli import parse_cal_names
 from gcalcli.utils import parse_reminder
-from tests._utils import CallMatcher, create_ics_content
+from tests._utils import (CallMatcher, create_ics_content, MockApiRequest,
+                          MockListResource)
+from tests.conftest import mock_event
 
 TEST_DATA_DIR = os.path.dirname(os.path.abspath(__file__)) + '/data'
 
@@ -53,6 +61,22 @@ def test_agenda(PatchedGCalI):
     assert PatchedGCalI().AgendaQuery(start=opts.start, end=opts.end) == 0
 
 
+def test_agenda_requests_only_displayed_fields(PatchedGCalI):
+    def requested_fields(**options):
+        gcal = PatchedGCalI(
+            cal_names=parse_cal_names(['jcrowgey@uw.edu'], None), **options)
+        gcal.AgendaQuery()
+        return [kwargs['fields'] for _, kwargs in gcal.api_tracker.calls]
+
+    assert requested_fields() == [
+        'nextPageToken,items(colorId,end,id,start,status,summary)']
+    assert requested_fields(
+        details={'description': True, 'url': True}, ignore_declined=True
+    ) == [
+        'nextPageToken,items(attendees(email,self,responseStatus),colorId,'
+        'description,end,hangoutLink,htmlLink,id,start,status,summary)']
+
+
 def test_updates(PatchedGCalI):
     since = datetime(2019, 7, 10)
     assert PatchedGCalI().UpdatesQuery(since) == 0
@@ -65,6 +89,395 @@ def test_updates(PatchedGCalI):
             end=opts.end) == 0
 
 
+def test_updates_filters_on_server(
+        capsys, default_options, PatchedGCalI, tmp_path):
+    start = datetime.now(tzlocal()) + timedelta(hours=1)
+    items = [
+        {
+            'id': 'changed',
+            'summary': 'Changed event',
+            'start': {'dateTime': start.isoformat()},
+            'end': {'dateTime': (start + timedelta(hours=1)).isoformat()},
+        },
+        {
+            'id': 'deleted',
+            'status': 'cancelled',
+            'originalStartTime': {
+                'dateTime': (start + timedelta(hours=2)).isoformat()},
+        },
+    ]
+    events = MockListResource(lambda **kwargs: {'items': items})
+    list_calls = events.calls
+    cal_names = parse_cal_names(['jcrowgey@uw.edu'], None)
+
+    def run_updates(**kwargs):
+        gcal = PatchedGCalI(
+            cal_names=cal_names, data_path=tmp_path, **default_options)
+        gcal.get_events = lambda: events
+        gcal.UpdatesQuery(**kwargs)
+        return capsys.readouterr().out
+
+    since = datetime(2019, 7, 10)
+    out = run_updates(last_updated_datetime=since)
+    assert 'Changed event' in out
+    assert '(deleted) (No title)' in out
+    assert list_calls[-1]['updatedMin'] == since.replace(
+        tzinfo=tzlocal()).isoformat()
+    assert list_calls[-1]['showDeleted'] is True
+
+    before_first_run = datetime.now(tzlocal())
+    run_updates(since_last_run=True)
+    first_watermark = datetime.fromisoformat(list_calls[-1]['updatedMin'])
+    assert first_watermark >= before_first_run
+
+    run_updates(since_last_run=True)
+    assert datetime.fromisoformat(
+        list_calls[-1]['updatedMin']) == first_watermark
+    run_updates(since_last_run=True)
+    assert datetime.fromisoformat(
+        list_calls[-1]['updatedMin']) > first_watermark
+
+
+def test_updates_too_long_ago_filters_locally(
+        capsys, default_options, PatchedGCalI, tmp_path):
+    start = datetime.now(tzlocal()) + timedelta(hours=1)
+
+    def item(event_id, updated):
+        return {'id': event_id, 'summary': event_id, 'updated': updated,
+                'start': {'dateTime': start.isoformat()},
+                'end': {'dateTime': (start + timedelta(hours=1)).isoformat()}}
+
+    def respond(updatedMin=None, **kwargs):
+        if updatedMin:
+            return HttpError(
+                httplib2.Response({'status': 410}),
+                b'{"error": {"code": 410, "errors": '
+                b'[{"reason": "updatedMinTooLongAgo"}]}}')
+        return {'items': [
+            item('Old edit', '2019-01-01T00:00:00.000Z'),
+            item('New edit', '2019-08-01T00:00:00.000Z')]}
+
+    events = MockListResource(respond)
+    list_calls = events.calls
+    cal_names = parse_cal_names(['jcrowgey@uw.edu'], None)
+
+    def run_updates(**kwargs):
+        gcal = PatchedGCalI(
+            cal_names=cal_names, data_path=tmp_path, **default_options)
+        gcal.get_events = lambda: events
+        gcal.UpdatesQuery(**kwargs)
+        return capsys.readouterr().out
+
+    out = run_updates(last_updated_datetime=datetime(2019, 7, 10))
+    assert 'New edit' in out
+    assert 'Old edit' not in out
+    assert [call['updatedMin'] is None for call in list_calls] == [
+        False, True]
+    assert list_calls[-1]['showDeleted'] is True
+
+    # A watermark that's too old is replaced once the run succeeds.
+    gcal = PatchedGCalI(
+        cal_names=cal_names, data_path=tmp_path, **default_options)
+    watermarks = gcal._updates_watermarks()
+    for cal in gcal.cals:
+        watermarks.put(f"since:{cal['id']}", '2019-07-10T00:00:00+00:00',
+                       float('inf'))
+    watermarks.save()
+    run_updates(since_last_run=True)
+    list_calls.clear()
+    run_updates(since_last_run=True)
+    assert datetime.fromisoformat(
+        list_calls[0]['updatedMin']).year > 2019
+
+
+def test_agenda_with_sync(capsys, default_options, PatchedGCalI, tmp_path):
+    start = datetime.now() + timedelta(hours=1)
+    event = {
+        'id': 'event1',
+        'status': 'confirmed',
+        'summary': 'Synced event',
+        'start': {'dateTime': start.isoformat()},
+        'end': {'dateTime': (start + timedelta(hours=1)).isoformat()},
+    }
+    pages_by_token = {
+        None: {'items': [event], 'nextSyncToken': 'token1'},
+        'token1': {
+            'items': [dict(event, summary='Renamed event')],
+            'nextSyncToken': 'token2',
+        },
+        'token2': {
+            'items': [dict(event, status='cancelled')],
+            'nextSyncToken': 'token3',
+        },
+    }
+    events = MockListResource.from_pages(pages_by_token)
+    list_calls = events.calls
+    cal_names = parse_cal_names(['jcrowgey@uw.edu'], None)
+
+    def run_agenda():
+        gcal = PatchedGCalI(
+            cal_names=cal_names, sync_events=True, data_path=tmp_path,
+            **default_options)
+        gcal.get_events = lambda: events
+        gcal.AgendaQuery()
+        return capsys.readouterr().out
+
+    assert 'Synced event' in run_agenda()
+    assert 'Renamed event' in run_agenda()
+    assert 'Renamed event' not in run_agenda()
+    assert [c['syncToken'] for c in list_calls] == [None, 'token1', 'token2']
+    assert all('timeMin' not in c for c in list_calls)
+
+
+def test_sync_restarts_on_expired_token(
+        capsys, default_options, PatchedGCalI, tmp_path):
+    start = datetime.now() + timedelta(hours=1)
+    event = {
+        'id': 'event1',
+        'summary': 'Resynced event',
+        'start': {'dateTime': start.isoformat()},
+        'end': {'dateTime': (start + timedelta(hours=1)).isoformat()},
+    }
+    pages_by_token = {
+        None: {'items': [event], 'nextSyncToken': 'token2'},
+        'stale': HttpError(
+            httplib2.Response({'status': 410}),
+            b'{"error": {"code": 410, "message": "Gone"}}'),
+    }
+    events = MockListResource.from_pages(pages_by_token)
+    list_calls = events.calls
+    cal_names = parse_cal_names(['jcrowgey@uw.edu'], None)
+    gcal = PatchedGCalI(
+        cal_names=cal_names, sync_events=True, data_path=tmp_path,
+        **default_options)
+    gcal.get_events = lambda: events
+    gcal._get_event_store().apply(gcal.cals[0]['id'], [], 'stale')
+
+    gcal.AgendaQuery()
+
+    assert 'Resynced event' in capsys.readouterr().out
+    assert [c['syncToken'] for c in list_calls] == ['stale', None]
+    assert gcal.event_store.sync_token(gcal.cals[0]['id']) == 'token2'
+
+
+def test_offline_and_max_staleness_use_event_store(
+        capsys, default_options, PatchedGCalI, tmp_path, monkeypatch):
+    start = datetime.now() + timedelta(hours=1)
+    event = {
+        'id': 'event1',
+        'summary': 'Stored event',
+        'description': 'Quarterly planning',
+        'start': {'dateTime': start.isoformat()},
+        'end': {'dateTime': (start + timedelta(hours=1)).isoformat()},
+    }
+    pages_by_token = {
+        None: {'items': [event], 'nextSyncToken': 'token1'},
+        'token1': {'items': [], 'nextSyncToken': 'token2'},
+    }
+    events = MockListResource.from_pages(pages_by_token)
+    list_calls = events.calls
+    cal_names = parse_cal_names(['jcrowgey@uw.edu'], None)
+    gcal = PatchedGCalI(
+        cal_names=cal_names, data_path=tmp_path, **default_options)
+    gcal.get_events = lambda: events
+
+    gcal.options['offline'] = True
+    with pytest.raises(gcalcli.gcal.GcalcliError):
+        gcal.AgendaQuery()
+
+    gcal.options.update(offline=False, max_staleness=60)
+    gcal.AgendaQuery()
+    gcal.AgendaQuery()
+    assert 'Stored event' in capsys.readouterr().out
+    assert [c['syncToken'] for c in list_calls] == [None]
+
+    gcal.options['max_staleness'] = 0
+    monkeypatch.setattr(gcalcli.gcal.time, 'time', lambda: 2 ** 40)
+    gcal.AgendaQuery()
+    assert [c['syncToken'] for c in list_calls] == [None, 'token1']
+
+    gcal.options.update(offline=True, max_staleness=None)
+    gcal.TextQuery('quarterly')
+    assert 'Stored event' in capsys.readouterr().out
+    gcal.TextQuery('unrelated')
+    assert 'Stored event' not in capsys.readouterr().out
+    assert len(list_calls) == 2
+
+
+def test_search_rank_uses_event_store(
+        capsys, default_options, PatchedGCalI, tmp_path):
+    start = datetime.now() + timedelta(hours=1)
+
+    def event(event_id, hours, **fields):
+        return {
+            'id': event_id,
+            'start': {'dateTime': (start + timedelta(hours=hours)).isoformat()},
+            'end': {'dateTime': (
+                start + timedelta(hours=hours + 1)).isoformat()},
+            **fields,
+        }
+
+    pages_by_token = {None: {'items': [
+        event('a', 0, summary='Planning', description='after the review'),
+        event('b', 1, summary='Design review'),
+    ], 'nextSyncToken': 'token1'}}
+    events = MockListResource.from_pages(pages_by_token)
+    list_calls = events.calls
+    cal_names = parse_cal_names(['jcrowgey@uw.edu'], None)
+    default_options.update(ndjson=True, rank=True)
+    gcal = PatchedGCalI(
+        cal_names=cal_names, data_path=tmp_path, **default_options)
+    gcal.get_events = lambda: events
+
+    gcal.TextQuery('review')
+
+    titles = [loads(line)['title']
+              for line in capsys.readouterr().out.splitlines()]
+    assert titles == ['Design review', 'Planning']
+    assert [c.get('syncToken') for c in list_calls] == [None]
+
+    gcal.options['regex'] = True
+    with pytest.raises(gcalcli.gcal.GcalcliError):
+        gcal.TextQuery('review')
+
+
+def test_discovery_document_cached_by_version(
+        PatchedGCalI, tmp_path, monkeypatch):
+    gcal = PatchedGCalI(data_path=tmp_path)
+
+    document = gcal._get_discovery_document()
+    assert document['name'] == 'calendar'
+    assert tmp_path.joinpath('discovery').exists()
+
+    def fail_get_static_doc(*args):
+        raise AssertionError('should have loaded cached document')
+    monkeypatch.setattr(gcalcli.gcal, 'get_static_doc', fail_get_static_doc)
+    assert gcal._get_discovery_document() == document
+
+    # A document cached by a different library version is replaced.
+    monkeypatch.setattr(gcalcli.gcal, 'googleapiclient_version', 'other')
+    monkeypatch.setattr(
+        gcalcli.gcal, 'get_static_doc', lambda *args: '{"name": "new"}')
+    assert gcal._get_discovery_document() == {'name': 'new'}
+    monkeypatch.setattr(gcalcli.gcal, 'get_static_doc', fail_get_static_doc)
+    assert gcal._get_discovery_document() == {'name': 'new'}
+
+
+def test_connection_stats_only_reported_when_debugging(
+        PatchedGCalI, monkeypatch):
+    registered = []
+    monkeypatch.setattr(gcalcli.gcal.atexit, 'register', registered.append)
+    monkeypatch.setattr(gcalcli.gcal.transport, 'SessionHttp',
+                        lambda credentials: object())
+    monkeypatch.delenv('GCALCLI_DEBUG', raising=False)
+    gcal = PatchedGCalI()
+    gcal._google_auth = lambda: None
+
+    gcal._get_http()
+    assert registered == []
+
+    monkeypatch.setenv('GCALCLI_DEBUG', '1')
+    gcal.http = None
+    gcal._get_http()
+    assert registered == [gcal._report_connection_stats]
+
+
+@pytest.mark.parametrize('max_concurrency', [1, 4])
+def test_search_for_events_merges_calendars(PatchedGCalI, max_concurrency):
+    base = datetime(2019, 1, 8, 9, 0)
+
+    def respond(calendarId, **kwargs):
+        # Unsorted per calendar, interleaved across calendars.
+        offsets = [3, 1, 2] if calendarId.startswith('j') else [2.5, 0]
+        return {'items': [
+            {
+                'id': f'{calendarId}-{offset}',
+                'start': {
+                    'dateTime': (base + timedelta(hours=offset)).isoformat()},
+                'end': {
+                    'dateTime':
+                        (base + timedelta(hours=offset + 1)).isoformat()},
+            }
+            for offset in offsets
+        ]}
+
+    gcal = PatchedGCalI(max_concurrency=max_concurrency)
+    gcal.get_events = lambda: MockListResource(respond)
+    events = gcal._search_for_events(None, None, None)
+
+    assert len(events) == sum(
+        3 if c['id'].startswith('j') else 2 for c in gcal.cals)
+    assert [e['s'] for e in events] == sorted(e['s'] for e in events)
+
+
+def test_agenda_ndjson_streams_pages(
+        capsys, default_options, PatchedGCalI):
+    base = datetime(2019, 1, 8, 9, 0, tzinfo=tzlocal())
+
+    def respond(calendarId, orderBy=None, pageToken=None, **kwargs):
+        assert orderBy == 'startTime'
+        page = int(pageToken or 0)
+        # Sorted per calendar, interleaved across calendars and pages.
+        offset = page * 2 + (0.5 if calendarId.startswith('j') else 0)
+        response = {'items': [
+            {
+                'id': f'{calendarId}-{offset + i}',
+                'summary': f'{calendarId} {offset + i}',
+                'start': {'dateTime': (
+                    base + timedelta(hours=offset + i)).isoformat()},
+                'end': {'dateTime': (
+                    base + timedelta(hours=offset + i + 1)).isoformat()},
+            }
+            for i in range(2)
+        ]}
+        if page < 2:
+            response['nextPageToken'] = str(page + 1)
+        return response
+
+    resource = MockListResource(respond)
+    default_options['ndjson'] = True
+    gcal = PatchedGCalI(**default_options)
+    gcal.get_events = lambda: resource
+
+    events = gcal._stream_events(None, None, None)
+    next(events)
+    assert {call.get('pageToken') for call in resource.calls} == {None}
+
+    resource.calls.clear()
+    gcal.AgendaQuery(start=base, end=base + timedelta(days=1))
+    rows = [loads(line) for line in capsys.readouterr().out.splitlines()]
+
+    assert len(rows) == len(resource.calls) * 2 == len(gcal.cals) * 6
+    starts = [(row['time']['start_date'], row['time']['start_time'])
+              for row in rows]
+    assert starts == sorted(starts)
+
+
+def test_tsv(capsys, default_options, PatchedGCalI, monkeypatch):
+    monkeypatch.setattr(gcalcli.gcal, 'TSV_WRITE_ROWS', 2)
+    day = datetime(2019, 1, 8, tzinfo=tzlocal())
+    events = [
+        dict(mock_event[0], id='all-day', summary='All day',
+             s=day, e=day + timedelta(days=1)),
+        dict(mock_event[0], id='timed', summary='Two\nlines',
+             s=day.replace(hour=9, minute=5), e=day.replace(hour=10)),
+        dict(mock_event[0], id='late', summary=' Late ',
+             s=day.replace(hour=23), e=day.replace(hour=23, minute=30)),
+    ]
+    default_options['details'] = {'id': True, 'length': True}
+    gcal = PatchedGCalI(**default_options)
+
+    gcal._tsv(day, events)
+
+    assert capsys.readouterr().out.splitlines() == [
+        'id\tstart_date\tstart_time\tend_date\tend_time\tlength\ttitle',
+        'all-day\t2019-01-08\t\t2019-01-09\t\t1 day, 0:00:00\tAll day',
+        'timed\t2019-01-08\t09:05\t2019-01-08\t10:00\t0:55:00\t'
+        'Two\\nlines',
+        'late\t2019-01-08\t23:00\t2019-01-08\t23:30\t0:30:00\tLate',
+    ]
+
+
 def test_conflicts(PatchedGCalI):
     assert PatchedGCalI().ConflictsQuery() == 0
 
@@ -76,6 +489,84 @@ def test_conflicts(PatchedGCalI):
             end=opts.end) == 0
 
 
+def test_conflicts_json(capsys, default_options, PatchedGCalI, monkeypatch):
+    events = []
+    for i, (start, end) in enumerate([(9, 11), (10, 12), (13, 14)]):
+        event = dict(mock_event[0], id=f'event{i}', summary=f'Event {i}')
+        event['s'] = datetime(2019, 1, 8, start, tzinfo=tzlocal())
+        event['e'] = datetime(2019, 1, 8, end, tzinfo=tzlocal())
+        events.append(event)
+    monkeypatch.setattr(
+        gcalcli.gcal.GoogleCalendarInterface, '_search_for_events',
+        lambda self, start, end, search_text, fields=None: events)
+
+    default_options['json'] = True
+    gcal = PatchedGCalI(**default_options)
+    gcal.ConflictsQuery(start=datetime(2019, 1, 8, tzinfo=tzlocal()))
+
+    report = loads(capsys.readouterr().out)
+    assert len(report) == 1
+    assert [e['title'] for e in report[0]['events']] == ['Event 0', 'Event 1']
+    assert report[0]['pairs'] == [[0, 1]]
+    assert report[0]['start'] == events[0]['s'].isoformat()
+    assert report[0]['end'] == events[1]['e'].isoformat()
+
+
+def _freebusy_resource(busy_by_cal, queries):
+    """Mock freebusy resource answering with fixed busy intervals."""
+    def respond(body):
+        queries.append(body)
+        return {'calendars': {
+            item['id']: {'busy': [
+                {'start': start.isoformat(), 'end': end.isoformat()}
+                for start, end in busy_by_cal.get(item['id'], [])]}
+            for item in body['items']}}
+
+    return SimpleNamespace(
+        query=lambda body: MockApiRequest(lambda: respond(body)))
+
+
+def test_freebusy(capsys, default_options, PatchedGCalI):
+    day = datetime(2019, 1, 8, 9, tzinfo=tzlocal())
+    busy_by_cal = {
+        'a': [(day, day + timedelta(hours=1))],
+        'b': [(day + timedelta(minutes=30), day + timedelta(hours=2))],
+    }
+    queries = []
+    default_options['json'] = True
+    gcal = PatchedGCalI(**default_options)
+    gcal.cals = [{'id': 'a', 'summary': 'A'}, {'id': 'b', 'summary': 'B'}]
+    gcal.get_freebusy = lambda: _freebusy_resource(busy_by_cal, queries)
+    end = day + timedelta(hours=8)
+
+    def report(**kwargs):
+        gcal.FreeBusyQuery(start=day, end=end, **kwargs)
+        return [(row['start'], row['end'])
+                for row in loads(capsys.readouterr().out)]
+
+    assert report() == [
+        (day.isoformat(), (day + timedelta(hours=2)).isoformat())]
+    assert report(free=True) == [
+        ((day + timedelta(hours=2)).isoformat(), end.isoformat())]
+    assert report(slot=45) == [
+        ((day + timedelta(hours=2)).isoformat(),
+         (day + timedelta(hours=2, minutes=45)).isoformat())]
+    # One request covers both calendars, without fetching any events.
+    assert [[item['id'] for item in body['items']] for body in queries] == [
+        ['a', 'b']] * 3
+    assert gcal.api_tracker.calls == []
+
+    with pytest.raises(gcalcli.gcal.GcalcliError):
+        gcal.FreeBusyQuery(start=day, end=day + timedelta(hours=2), slot=30)
+
+    gcal.ConflictsQuery(start=day, end=end, use_freebusy=True)
+    assert loads(capsys.readouterr().out) == [{
+        'start': (day + timedelta(minutes=30)).isoformat(),
+        'end': (day + timedelta(hours=1)).isoformat(),
+        'calendars': ['A', 'B'],
+    }]
+
+
 def test_cal_query(capsys, PatchedGCalI):
     opts = vars(get_cal_query_parser().parse_args([]))
     opts.update(vars(get_output_parser().parse_args([])))
@@ -95,6 +586,39 @@ def test_cal_query(capsys, PatchedGCalI):
     assert captured.out.startswith(expect_top)
 
 
+def test_cal_query_buckets_events_by_week(capsys, PatchedGCalI, monkeypatch):
+    opts = vars(get_cal_query_parser().parse_args([]))
+    opts.update(vars(get_output_parser().parse_args([])))
+    opts.update(vars(get_color_parser().parse_args([])))
+    gcal = PatchedGCalI(**opts)
+    gcal.now = datetime(2024, 5, 15, 10, tzinfo=tzlocal())
+    cal = gcal.cals[0]
+
+    def event(title, start, end):
+        return {'summary': title, 's': start, 'e': end, 'gcalcli_cal': cal}
+
+    week_start = datetime(2024, 5, 12, tzinfo=tzlocal())
+    events = [
+        event('Before', week_start - timedelta(days=2, hours=-9),
+              week_start - timedelta(days=2, hours=-10)),
+        event('Trip', week_start + timedelta(days=5),
+              week_start + timedelta(days=10)),
+        event('Dentist', week_start + timedelta(days=8, hours=9),
+              week_start + timedelta(days=8, hours=10)),
+    ]
+    monkeypatch.setattr(
+        gcalcli.gcal.GoogleCalendarInterface, '_search_for_events',
+        lambda self, start, end, search_text, fields=None: events)
+
+    gcal.CalQuery('calw', start_text='2024-05-15', count=2)
+    out = capsys.readouterr().out
+
+    assert 'Before' not in out
+    # Fri and Sat of the first week, Sun to Tue of the second.
+    assert out.count('Trip') == 5
+    assert out.count('Dentist') == 1
+
+
 def test_add_event(PatchedGCalI):
     cal_names = parse_cal_names(['jcrowgey@uw.edu'], printer=None)
     gcal = PatchedGCalI(
@@ -284,6 +808,36 @@ def test_modify_event(PatchedGCalI):
             gcal._edit_event, opts.text, opts.start, opts.end) == 0
 
 
+def test_agenda_update(capsys, PatchedGCalI):
+    cal_names = parse_cal_names(['jcrowgey@uw.edu'], None)
+    gcal = PatchedGCalI(cal_names=cal_names)
+    tsv = io.StringIO(
+        'id\taction\ttitle\n'
+        'event1\tpatch\tRenamed\n'
+        '\tinsert\tNew event\n'
+        'event3\tdelete\t\n'
+        'event4\tignore\t\n'
+    )
+
+    gcal.AgendaUpdate(tsv)
+
+    gcal.api_tracker.verify_all_mutating_calls([
+        CallMatcher('patch', body_fields={'summary': 'Renamed'}),
+        CallMatcher('insert', body_fields={'summary': 'New event'}),
+        CallMatcher('delete'),
+    ])
+    assert 'Applied 3 of 3 changes' in capsys.readouterr().out
+
+
+def test_delete_expert_batches_deletes(
+        capsys, default_options, PatchedGCalIForEvents):
+    gcal = PatchedGCalIForEvents(**default_options)
+    assert gcal.ModifyEvents(gcal._delete_event, 'test', expert=True) == 1
+
+    gcal.api_tracker.verify_all_mutating_calls([CallMatcher('delete')])
+    assert 'Deleted "Test Event"!' in capsys.readouterr().out
+
+
 def test_import(PatchedGCalI):
     cal_names = parse_cal_names(['jcrowgey@uw.edu'], None)
     gcal = PatchedGCalI(cal_names=cal_names,
@@ -333,6 +887,51 @@ def test_legacy_import(PatchedGCalI):
     ])
 
 
+@pytest.mark.parametrize('max_concurrency', [1, 4])
+def test_import_reports_duplicates_and_dumps_failures(
+        PatchedGCalI, capsys, monkeypatch, max_concurrency):
+    cal_names = parse_cal_names(['jcrowgey@uw.edu'], None)
+    gcal = PatchedGCalI(cal_names=cal_names, default_reminders=True,
+                        max_concurrency=max_concurrency)
+    events_resource = gcal.get_events()
+
+    def failing_request(status, reason):
+        content = dumps({'error': {
+            'code': status, 'message': reason,
+            'errors': [{'reason': reason}]}}).encode()
+        return MockApiRequest(
+            lambda: HttpError(httplib2.Response({'status': status}), content))
+
+    def import_(**kwargs):
+        summary = kwargs['body']['summary']
+        if summary == 'Dupe':
+            return failing_request(409, 'duplicate')
+        if summary == 'Broken':
+            return failing_request(400, 'invalid')
+        return events_resource.import_(**kwargs)
+
+    gcal.get_events = lambda: SimpleNamespace(import_=import_)
+    dumped = []
+    monkeypatch.setattr(
+        ics, 'dump_partial_ical',
+        lambda events, raw_components: dumped.extend(events) or 'dump.ics')
+    ics_file = create_ics_content([
+        {'summary': summary, 'has_self_attendee': True,
+         'attendee_email': 'jcrowgey@uw.edu'}
+        for summary in ('First', 'Dupe', 'Broken', 'Last')
+    ])
+
+    assert gcal.ImportICS(icsFile=ics_file)
+
+    assert [call[1]['body']['summary'] for call in gcal.api_tracker.calls] \
+        == ['First', 'Last']
+    assert sorted(e.body['summary'] for e in dumped) == ['Broken', 'Dupe']
+    captured = capsys.readouterr()
+    assert 'Skipped duplicate event' in captured.out
+    assert 'Failed to import event' in captured.out
+    assert 'Added 2 events' in captured.out
+
+
 @pytest.mark.parametrize("reminder,expected_time,expected_method", [
     ('5m email', 5, 'email'),
     ('2h sms', 120, 'sms'),
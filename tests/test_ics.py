@@ -0,0 +1,128 @@
+import io
+
+import pytest
+
+from gcalcli import ics
+from gcalcli.printer import Printer
+
+vobject = pytest.importorskip('vobject')
+
+ICS_TEXT = '\r\n'.join([
+    'BEGIN:VCALENDAR',
+    'VERSION:2.0',
+    'PRODID:-//Test//Test Events//EN',
+    'BEGIN:VTIMEZONE',
+    'TZID:Test Standard Time',
+    'BEGIN:STANDARD',
+    'DTSTART:19700101T000000',
+    'TZOFFSETFROM:-0500',
+    'TZOFFSETTO:-0500',
+    'END:STANDARD',
+    'END:VTIMEZONE',
+    'BEGIN:VEVENT',
+    'UID:event-1',
+    'DTSTART;TZID=Test Standard Time:20241001T140000',
+    'DTEND;TZID=Test Standard Time:20241001T150000',
+    'SUMMARY:First',
+    'DESCRIPTION:A long description that is folded',
+    '  onto a second line that begins with BEGIN:VEVENT',
+    'BEGIN:VALARM',
+    'ACTION:DISPLAY',
+    'TRIGGER:-PT15M',
+    'END:VALARM',
+    'END:VEVENT',
+    'BEGIN:VEVENT',
+    'UID:event-2',
+    'DTSTART;VALUE=DATE:20241002',
+    'SUMMARY:Second',
+    'END:VEVENT',
+    'END:VCALENDAR',
+    '',
+])
+
+
+def _parse_whole_file(text):
+    cal = vobject.readOne(text)
+    return [
+        ics.CreateEventFromVOBJ(
+            ve, verbose=False, default_tz='UTC', printer=Printer())
+        for ve in cal.vevent_list
+    ]
+
+
+def test_get_ics_data_streams_events():
+    ical_data = ics.get_ics_data(
+        io.StringIO(ICS_TEXT), verbose=False, default_tz='UTC',
+        printer=Printer())
+
+    first = next(ical_data.events)
+    # The VTIMEZONE preceding the first event has been read, but not the
+    # rest of the file.
+    assert [c.name for c in ical_data.raw_components] == ['VTIMEZONE']
+    assert first.body['summary'] == 'First'
+
+    rest = list(ical_data.events)
+    assert [e.body for e in [first, *rest]] == [
+        e.body for e in _parse_whole_file(ICS_TEXT)]
+    assert first.body['start']['dateTime'] == '2024-10-01T14:00:00-05:00'
+    assert first.body['description'].endswith(
+        'folded onto a second line that begins with BEGIN:VEVENT')
+
+
+def test_dump_partial_ical_from_streamed_events():
+    ical_data = ics.get_ics_data(
+        io.StringIO(ICS_TEXT), verbose=False, default_tz='UTC',
+        printer=Printer())
+    failed = [e for e in ical_data.events if e.body['summary'] == 'Second']
+
+    dump_path = ics.dump_partial_ical(failed, ical_data.raw_components)
+
+    dumped = vobject.readOne(dump_path.read_text())
+    assert [c.name for c in dumped.components()] == ['VTIMEZONE', 'VEVENT']
+    assert dumped.vevent.summary.value == 'Second'
+
+
+def test_split_calendar_components_ignores_stray_components():
+    text = 'BEGIN:VEVENT\nUID:stray\nEND:VEVENT\n' + ICS_TEXT
+    names = [name for name, _ in
+             ics._split_calendar_components(io.StringIO(text))]
+    assert names == ['VTIMEZONE', 'VEVENT', 'VEVENT']
+
+
+def test_get_ics_data_trailing_vtimezone():
+    # RFC 5545 allows VTIMEZONEs after the events referring to them.
+    text = '\r\n'.join([
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:-//Test//Test Events//EN',
+        'BEGIN:VEVENT',
+        'UID:event-1',
+        'DTSTART;TZID="Trailing/Zone":20240110T090000',
+        'DTEND;TZID="Trailing/Zone":20240110T100000',
+        'SUMMARY:Zoned',
+        'END:VEVENT',
+        'BEGIN:VEVENT',
+        'UID:event-2',
+        'DTSTART:20240111T090000Z',
+        'SUMMARY:UTC',
+        'END:VEVENT',
+        'BEGIN:VTIMEZONE',
+        'TZID:Trailing/Zone',
+        'BEGIN:STANDARD',
+        'DTSTART:19700101T000000',
+        'TZOFFSETFROM:+0530',
+        'TZOFFSETTO:+0530',
+        'END:STANDARD',
+        'END:VTIMEZONE',
+        'END:VCALENDAR',
+        '',
+    ])
+    ical_data = ics.get_ics_data(
+        io.StringIO(text), verbose=False, default_tz='UTC',
+        printer=Printer())
+
+    events = {e.body['summary']: e.body for e in ical_data.events}
+    assert events['Zoned']['start']['dateTime'] == '2024-01-10T09:00:00+05:30'
+    assert sorted(events.values(), key=lambda e: e['summary']) == sorted(
+        (e.body for e in _parse_whole_file(text)),
+        key=lambda e: e['summary'])
@@ -85,3 +85,29 @@ def test_no_color():
     cp.msg('msg', 'red', file=out)
     out.seek(0)
     assert out.read() == 'msg'
+
+
+def test_buffered_coalesces_color_runs():
+    cp = Printer()
+    out = StringIO()
+    with cp.buffered(file=out):
+        cp.msg('a', 'red', file=out)
+        cp.art_msg('vrt', 'red', file=out)
+        cp.msg('b\n', 'red', file=out)
+        cp.msg('c', 'blue', file=out)
+        assert out.getvalue() == ''
+    assert out.getvalue() == (
+        '\033[0;31ma|b\n\033[0m\033[0;34mc\033[0m')
+
+
+def test_buffered_writes_other_files_immediately():
+    cp = Printer(use_color=False)
+    out, err = StringIO(), StringIO()
+    with cp.buffered(file=out):
+        cp.msg('out', file=out)
+        with cp.buffered(file=out):
+            cp.msg(' more', file=out)
+        cp.msg('err', file=err)
+        assert err.getvalue() == 'err'
+        assert out.getvalue() == ''
+    assert out.getvalue() == 'out more'
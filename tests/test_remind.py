@@ -0,0 +1,189 @@
+from datetime import datetime, timedelta
+
+from dateutil.tz import tzlocal
+
+from gcalcli import gcal as gcal_module
+from gcalcli.remind import reminder_times, ReminderSchedule
+
+NOW = datetime(2024, 5, 15, 9, tzinfo=tzlocal())
+CAL = {'id': 'cal1'}
+
+
+def _event(event_id, minutes_from_now, overrides=None):
+    event = {
+        'id': event_id,
+        'summary': event_id,
+        's': NOW + timedelta(minutes=minutes_from_now),
+        'gcalcli_cal': CAL,
+    }
+    if overrides is not None:
+        event['reminders'] = {
+            'overrides': [{'minutes': m} for m in overrides]}
+    return event
+
+
+def test_reminder_times():
+    event = _event('a', 60, overrides=[30, 10, 30])
+    assert reminder_times(event, 10) == [event['s'] - timedelta(minutes=10)]
+    assert reminder_times(event, 5, use_reminders=True) == [
+        event['s'] - timedelta(minutes=30),
+        event['s'] - timedelta(minutes=10),
+    ]
+    event = _event('b', 60)
+    assert reminder_times(event, 5, use_reminders=True) == [
+        event['s'] - timedelta(minutes=5)]
+
+
+def test_schedule_sends_each_reminder_once():
+    schedule = ReminderSchedule(10)
+    events = [_event('soon', 5), _event('later', 30), _event('past', -5)]
+    schedule.update(events, NOW)
+
+    assert [e['id'] for e in schedule.pop_due(NOW)] == ['soon']
+    assert schedule.next_due() == NOW + timedelta(minutes=20)
+    assert schedule.pop_due(NOW + timedelta(minutes=19)) == []
+
+    # A refresh doesn't bring back reminders that were already sent.
+    later = NOW + timedelta(minutes=20)
+    schedule.update(events, later)
+    assert [e['id'] for e in schedule.pop_due(later)] == ['later']
+    schedule.update(events, later)
+    assert schedule.pop_due(later) == []
+    assert schedule.next_due() is None
+
+
+def test_schedule_follows_moved_events():
+    schedule = ReminderSchedule(10)
+    schedule.update([_event('a', 30)], NOW)
+    moved = _event('a', 60)
+    schedule.update([moved], NOW)
+
+    assert schedule.next_due() == moved['s'] - timedelta(minutes=10)
+
+
+def test_schedule_sends_reminders_days_ahead_once():
+    schedule = ReminderSchedule(10, use_reminders=True)
+    event = dict(_event('offsite', 3 * 24 * 60, overrides=[2 * 24 * 60]),
+                 e=NOW + timedelta(days=3, hours=8))
+    sent = []
+    # Refresh every 5 minutes until the event starts.
+    for step in range(3 * 24 * 12):
+        now = NOW + timedelta(minutes=5 * step)
+        schedule.update([event], now)
+        sent.extend((now, e['id']) for e in schedule.pop_due(now))
+    assert sent == [(NOW + timedelta(days=1), 'offsite')]
+
+
+def test_schedule_skips_long_overdue_reminders_at_startup():
+    schedule = ReminderSchedule(10, use_reminders=True)
+    # Reminder was due a day ago, and one in 3 minutes was due 7 ago.
+    overdue = _event('overdue', 24 * 60, overrides=[2 * 24 * 60])
+    soon = _event('soon', 3)
+    schedule.update([overdue, soon], NOW)
+    assert [e['id'] for e in schedule.pop_due(NOW)] == ['soon']
+
+    # An event added at short notice is still reminded about.
+    later = NOW + timedelta(minutes=5)
+    added = _event('added', 8)
+    schedule.update([overdue, soon, added], later)
+    assert [e['id'] for e in schedule.pop_due(later)] == ['added']
+
+
+def test_schedule_delivers_late_reminders_until_event_ends():
+    schedule = ReminderSchedule(10)
+    meeting = dict(_event('meeting', 5), e=NOW + timedelta(minutes=35))
+    short = dict(_event('short', 5), e=NOW + timedelta(minutes=15))
+    schedule.update([meeting, short], NOW - timedelta(minutes=10))
+
+    # Woken from suspend after both started, and one ended.
+    assert schedule.pop_due(NOW + timedelta(minutes=20)) == [meeting]
+    assert schedule.next_due() is None
+
+
+def test_remind_daemon(PatchedGCalI, monkeypatch):
+    gcal = PatchedGCalI(cal_names=())
+    now = datetime.now(tzlocal())
+    events = [
+        {'id': 'a', 'summary': 'Standup', 's': now + timedelta(minutes=5),
+         'gcalcli_cal': CAL},
+        {'id': 'b', 'summary': 'Lunch', 's': now + timedelta(hours=3),
+         'gcalcli_cal': CAL},
+    ]
+    searches = []
+
+    def search(start, end, search_text):
+        searches.append((start, end))
+        return events
+
+    commands = []
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        if len(sleeps) == 2:
+            raise KeyboardInterrupt
+
+    gcal._search_for_events = search
+    monkeypatch.setattr(gcal_module.subprocess, 'Popen', commands.append)
+    monkeypatch.setattr(gcal_module.time, 'sleep', sleep)
+    gcal.RemindDaemon(10, 'notify %s', refresh_minutes=5)
+
+    assert gcal.options['sync_events']
+    assert len(searches) == 1
+    assert searches[0][1] - searches[0][0] == timedelta(minutes=15)
+    assert len(commands) == 1
+    assert commands[0][0] == 'notify'
+    assert commands[0][1].endswith('  Standup\n')
+    assert sleeps[0] == gcal_module.REMIND_MAX_SLEEP_SECONDS
+
+
+def test_remind_daemon_survives_failures(PatchedGCalI, monkeypatch, capsys):
+    gcal = PatchedGCalI(cal_names=())
+    now = datetime.now(tzlocal())
+    events = [{'id': 'a', 'summary': 'Standup',
+               's': now + timedelta(minutes=5), 'gcalcli_cal': CAL}]
+    searches = []
+
+    def search(start, end, search_text):
+        searches.append(start)
+        if len(searches) == 1:
+            raise OSError('network is unreachable')
+        return events
+
+    commands = []
+
+    def popen(command):
+        commands.append(command)
+        if len(commands) == 1:
+            raise FileNotFoundError('notify')
+
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        if len(sleeps) == 3:
+            raise KeyboardInterrupt
+        if len(sleeps) == 2:
+            # Another event, after the failed command.
+            events.append(dict(events[0], id='b'))
+
+    gcal._search_for_events = search
+    monkeypatch.setattr(gcal_module.subprocess, 'Popen', popen)
+    monkeypatch.setattr(gcal_module.time, 'sleep', sleep)
+    gcal.RemindDaemon(10, 'notify %s', refresh_minutes=0)
+
+    assert len(searches) == 3
+    assert len(commands) == 2
+    assert commands[1][1].endswith('  Standup\n')
+    # The patched Printer writes error messages to stdout too.
+    out = capsys.readouterr().out
+    assert 'Failed to refresh events: network is unreachable' in out
+    assert 'Failed to run reminder command: notify' in out
+
+
+def test_remind_line_marks_late_reminders(PatchedGCalI):
+    gcal = PatchedGCalI(cal_names=(), military=True)
+    event = _event('Standup', 0)
+    assert gcal._remind_line(event) == '09:00  Standup\n'
+    assert gcal._remind_line(event, late=True) == (
+        '09:00  Standup (already started)\n')
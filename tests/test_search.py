@@ -0,0 +1,50 @@
+import pytest
+
+from gcalcli.exceptions import GcalcliError
+from gcalcli.search import (
+    fts_query,
+    has_field_filters,
+    parse_query,
+    regex_matcher,
+    Term,
+)
+
+
+def test_parse_query():
+    assert parse_query('Title:standup "stand up" foo:bar') == [
+        Term('summary', 'standup'),
+        Term(None, 'stand up'),
+        Term(None, 'foo:bar'),
+    ]
+    assert parse_query(r'attendee:^bob \d+', regex=True) == [
+        Term('attendees', '^bob'),
+        Term(None, r'\d+'),
+    ]
+    with pytest.raises(GcalcliError):
+        parse_query('"unbalanced')
+    with pytest.raises(GcalcliError):
+        parse_query('  ')
+
+
+def test_has_field_filters():
+    assert has_field_filters('review location:berlin')
+    assert not has_field_filters('review 10:30')
+    # Tokenized like parse_query, so quoted filters are seen too.
+    assert has_field_filters("'title:stand up'")
+    assert not has_field_filters('"title:unterminated')
+
+
+def test_fts_query():
+    assert fts_query(parse_query(
+        'location:room \'say "hi"\' stand* *')) == (
+        'location : "room"* AND "say ""hi"""* AND "stand"* AND "*"*')
+
+
+def test_regex_matcher():
+    # summary, description, location, attendees
+    row = ('Weekly standup', '', 'Room 12', 'bob@example.com')
+    assert regex_matcher(parse_query(r'stand.?up room\s\d+', True))(row)
+    assert regex_matcher(parse_query('attendee:^BOB@', True))(row)
+    assert not regex_matcher(parse_query('title:room', True))(row)
+    with pytest.raises(GcalcliError):
+        regex_matcher(parse_query('(', True))
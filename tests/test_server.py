@@ -0,0 +1,122 @@
+import json
+import socket
+import threading
+
+import pytest
+
+from gcalcli import cli, client
+from gcalcli.gcal import GoogleCalendarInterface
+from gcalcli.server import QueryServer, warm_calendar_interface
+
+from tests.conftest import mock_event
+
+
+@pytest.fixture
+def isolated_config(tmp_path, monkeypatch):
+    monkeypatch.setenv('GCALCLI_CONFIG', str(tmp_path))
+    monkeypatch.setenv('COLUMNS', '80')
+
+
+@pytest.fixture
+def calendar_interface(PatchedGCalIForEvents):
+    def factory(use_cache=None, **kwargs):
+        # The patched interface always disables the cache itself.
+        return PatchedGCalIForEvents(**kwargs)
+    return factory
+
+
+@pytest.fixture
+def socket_path(tmp_path, calendar_interface):
+    path = tmp_path / 's.sock'
+    server = QueryServer(path, calendar_interface)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield path
+    server.shutdown()
+    server.server_close()
+
+
+def _query(socket_path, argv):
+    """Send a query, returning (exit code, stdout, stderr).
+
+    client.run() can't be used for this in-process, since the server
+    redirects sys.stdout and sys.stderr for the whole process.
+    """
+    out, err = [], []
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(socket_path))
+        sock.sendall(json.dumps({'argv': argv}).encode() + b'\n')
+        for line in sock.makefile('rb'):
+            message = json.loads(line)
+            out.append(message.get('out', ''))
+            err.append(message.get('err', ''))
+            if 'exit' in message:
+                return message['exit'], ''.join(out), ''.join(err)
+    raise AssertionError('no exit code')
+
+
+def test_served_output_matches_direct_run(
+        isolated_config, socket_path, calendar_interface, capsys):
+    argv = ['--noincluderc', '--nocolor', 'agenda', '--tsv',
+            '2024-01-01', '2024-01-02']
+
+    cli.main(argv, calendar_interface=calendar_interface)
+    direct = capsys.readouterr()
+
+    assert _query(socket_path, argv) == (0, direct.out, direct.err)
+    assert direct.out
+
+
+def test_served_error_exit_code(isolated_config, socket_path):
+    code, out, err = _query(
+        socket_path, ['--noincluderc', 'agenda', '--nosuchflag'])
+    assert code == 2
+    assert 'unrecognized arguments' in err
+
+
+def test_unserved_command_falls_back(isolated_config, socket_path, capsys):
+    assert client.run(['--noincluderc', 'add'], socket_path) is None
+    assert capsys.readouterr().out == ''
+
+
+def test_client_raises_without_server(tmp_path):
+    with pytest.raises(OSError):
+        client.run(['agenda'], tmp_path / 'missing.sock')
+
+
+def test_warm_interface_reuses_events(
+        PatchedGCalI, default_options, monkeypatch):
+    calls = []
+
+    def counting_search(self, start, end, search_text, fields=None):
+        calls.append((start, end, search_text))
+        return mock_event
+
+    monkeypatch.setattr(
+        GoogleCalendarInterface, '_search_for_events', counting_search)
+    interface = warm_calendar_interface(max_age=60)
+
+    for _ in range(2):
+        gcal = interface(cal_names=[], **default_options)
+        assert gcal._search_for_events(
+            'start', 'end', None) == mock_event
+    assert len(calls) == 1
+
+    gcal._search_for_events('start', 'end', 'other')
+    assert len(calls) == 2
+
+    stale = warm_calendar_interface(max_age=0)
+    for _ in range(2):
+        stale(cal_names=[], **default_options)._search_for_events(
+            'start', 'end', None)
+    assert len(calls) == 4
+
+    # --refresh bypasses (and drops) events fetched by earlier commands.
+    refreshed = interface(
+        cal_names=[], **dict(default_options, refresh_cache=True))
+    refreshed._search_for_events('start', 'end', None)
+    assert len(calls) == 5
+    assert len(interface.events_cache) == 1
+    interface(cal_names=[], **default_options)._search_for_events(
+        'start', 'end', None)
+    assert len(calls) == 5
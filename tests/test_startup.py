@@ -0,0 +1,58 @@
+import re
+import subprocess
+import sys
+
+# Modules that are slow to import and only needed by some subcommands.
+HEAVY_MODULES = (
+    'babel',
+    'google_auth_httplib2',
+    'googleapiclient',
+    'httplib2',
+    'parsedatetime',
+    'pydantic',
+    'requests',
+    'truststore',
+    'vobject',
+)
+
+# Generous cumulative budget for importing gcalcli.cli, in microseconds, to
+# catch heavy imports sneaking back in without flaking on slow machines.
+IMPORT_BUDGET_US = 400_000
+
+
+def _import_times(code):
+    """Run code in a fresh interpreter and return its -X importtime data."""
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        capture_output=True,
+        text=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        match = re.match(r'import time:\s+\d+ \|\s+(\d+) \| ( *)(\S+)', line)
+        if match:
+            times[match.group(3)] = int(match.group(1))
+    return proc, times
+
+
+def _heavy_imports(times):
+    return sorted(
+        name for name in times if name.split('.')[0] in HEAVY_MODULES)
+
+
+def test_cli_import_is_light():
+    _, times = _import_times('import gcalcli.cli')
+
+    assert _heavy_imports(times) == []
+    assert times['gcalcli.cli'] < IMPORT_BUDGET_US
+
+
+def test_help_skips_heavy_imports():
+    proc, times = _import_times(
+        'import sys; sys.argv = ["gcalcli", "--help"]\n'
+        'from gcalcli.cli import main; main()'
+    )
+
+    assert proc.returncode == 0
+    assert 'usage: gcalcli' in proc.stdout
+    assert _heavy_imports(times) == []
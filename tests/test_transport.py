@@ -0,0 +1,84 @@
+from concurrent.futures import ThreadPoolExecutor
+import gzip
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+
+from google.auth.credentials import AnonymousCredentials
+from googleapiclient.errors import HttpError
+from googleapiclient.http import HttpRequest
+import pytest
+
+from gcalcli.transport import SessionHttp
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        status = 404 if self.path == '/missing' else 200
+        body = gzip.compress(json.dumps({'path': self.path}).encode())
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_port}'
+    server.shutdown()
+    server.server_close()
+
+
+def _request(http, uri):
+    return HttpRequest(http, lambda resp, content: json.loads(content), uri)
+
+
+def test_requests_share_keep_alive_connection(server_url):
+    http = SessionHttp(AnonymousCredentials())
+
+    for i in range(3):
+        assert _request(http, f'{server_url}/page{i}').execute() == {
+            'path': f'/page{i}'}
+
+    stats = http.connection_stats()
+    assert (stats.requests, stats.connections, stats.reused) == (3, 1, 2)
+
+
+def test_response_matches_httplib2(server_url):
+    http = SessionHttp(AnonymousCredentials())
+
+    resp, content = http.request(f'{server_url}/page')
+
+    assert resp.status == 200
+    assert resp['content-type'] == 'application/json'
+    assert 'content-encoding' not in resp
+    assert int(resp['content-length']) == len(content)
+    assert json.loads(content) == {'path': '/page'}
+
+    with pytest.raises(HttpError) as exc_info:
+        _request(http, f'{server_url}/missing').execute()
+    assert exc_info.value.resp.status == 404
+
+
+def test_threads_share_one_pool(server_url):
+    http = SessionHttp(AnonymousCredentials(), pool_size=4)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(
+            lambda i: _request(http, f'{server_url}/{i}').execute(),
+            range(20)))
+
+    assert [r['path'] for r in results] == [f'/{i}' for i in range(20)]
+    stats = http.connection_stats()
+    assert stats.requests == 20
+    assert stats.connections <= 4
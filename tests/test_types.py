@@ -0,0 +1,69 @@
+from datetime import datetime
+
+import pytest
+
+from gcalcli._types import Event
+
+CAL = {'id': 'cal1', 'summary': 'Calendar', 'accessRole': 'owner'}
+
+
+def _event():
+    item = {
+        'id': 'event1',
+        'summary': 'Lunch',
+        'start': {'dateTime': '2024-01-01T12:00:00Z'},
+        'end': {'dateTime': '2024-01-01T13:00:00Z'},
+        'description': 'Bring ñ snacks',
+        'attendees': [{'email': 'a@example.com'}],
+    }
+    return Event(item, s=datetime(2024, 1, 1, 12), e=datetime(2024, 1, 1, 13),
+                 gcalcli_cal=CAL)
+
+
+def test_eager_fields_available_without_decoding():
+    event = _event()
+
+    assert event['summary'] == 'Lunch'
+    assert event['gcalcli_cal'] is CAL
+    assert event['s'] == datetime(2024, 1, 1, 12)
+    assert 'colorId' not in event
+    assert event.get('colorId') is None
+    assert event._fields is None
+
+
+def test_other_fields_decoded_on_first_access():
+    event = _event()
+
+    assert 'attendees' in event
+    assert event['description'] == 'Bring ñ snacks'
+    assert event._raw is None
+    with pytest.raises(KeyError):
+        event['location']
+    assert dict(event) == {
+        's': datetime(2024, 1, 1, 12),
+        'e': datetime(2024, 1, 1, 13),
+        'gcalcli_cal': CAL,
+        'id': 'event1',
+        'summary': 'Lunch',
+        'start': {'dateTime': '2024-01-01T12:00:00Z'},
+        'end': {'dateTime': '2024-01-01T13:00:00Z'},
+        'description': 'Bring ñ snacks',
+        'attendees': [{'email': 'a@example.com'}],
+    }
+
+
+def test_mutation():
+    event = _event()
+
+    event['summary'] = 'Dinner'
+    event['colorId'] = '2'
+    event['location'] = 'Home'
+    del event['attendees']
+
+    assert event['summary'] == 'Dinner'
+    assert event['colorId'] == '2'
+    assert event['location'] == 'Home'
+    assert 'attendees' not in event
+    assert len(event) == 10
+    with pytest.raises(KeyError):
+        del event['status']
@@ -81,3 +81,22 @@ def test_localize_datetime(PatchedGCalI):
     dt = datetime.now(tzutc())
     dt = utils.localize_datetime(dt)
     assert dt.tzinfo is not None
+
+
+@pytest.mark.parametrize('value', [
+    '2024-03-10T09:30:00-05:00',
+    '2024-03-10T14:30:00Z',
+    '2024-03-10T14:30:00.250Z',
+    '2024-03-10',
+    'March 10 2024 2:30pm',
+])
+def test_parse_api_time_matches_dateutil(value):
+    expected = utils.localize_datetime(utils.dateutil_parse(value))
+    dt = utils.parse_api_time(value)
+    assert dt == expected
+    assert dt.tzinfo is utils.local_tz()
+
+
+def test_display_widths():
+    assert utils.display_widths('') == (0,)
+    assert utils.display_widths('a樹b') == (0, 1, 3, 4)